@@ -13,6 +13,7 @@ const usePage = (
 ): [MutableRefObject<number>, Get<number>] => {
   const handleError = useErrorHandler();
   const next = useRef(0);
+  const cursors = useRef(new Map<number, string>());
   return [
     next,
     useRecoilCallback(
@@ -22,15 +23,24 @@ const usePage = (
             const { zoom, ...params } = await snapshot.getPromise(
               pageParameters(modal)
             );
-            const { results, more } = await getFetchFunction()(
+            if (page === 1) {
+              cursors.current.clear();
+            }
+
+            const { results, more, after } = await getFetchFunction()(
               "POST",
               "/samples",
               {
                 ...params,
                 page,
+                after: cursors.current.get(page) ?? null,
               }
             );
 
+            if (more && after) {
+              cursors.current.set(page + 1, after);
+            }
+
             const itemData: SampleData[] = results.map((result) => {
               const data: SampleData = {
                 sample: result.sample,
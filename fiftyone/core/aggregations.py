@@ -9,15 +9,21 @@ from collections import defaultdict, OrderedDict
 from copy import deepcopy
 from datetime import date, datetime
 import inspect
+import itertools
 import logging
+import math
 import reprlib
+import threading
 import uuid
 
+from bson import json_util
+import cachetools
 import numpy as np
 from mongoengine.base import get_document
 
 import eta.core.utils as etau
 
+import fiftyone as fo
 import fiftyone.core.expressions as foe
 from fiftyone.core.expressions import VALUE
 from fiftyone.core.expressions import ViewExpression as E
@@ -27,6 +33,8 @@ import fiftyone.core.labels as fol
 import fiftyone.core.media as fom
 import fiftyone.core.utils as fou
 
+pa = fou.lazy_import("pyarrow", callback=lambda: fou.ensure_import("pyarrow"))
+
 
 logger = logging.getLogger(__name__)
 
@@ -129,6 +137,15 @@ class Aggregation(object):
         """
         return False
 
+    @property
+    def _is_mergeable(self):
+        """Whether the aggregation supports sharded execution, i.e., whether
+        its result can be computed by running :meth:`_to_mongo_shard` on
+        disjoint subsets of a collection and then combining the per-shard
+        results via :meth:`_merge_shard_results`.
+        """
+        return False
+
     def to_mongo(self, sample_collection, context=None):
         """Returns the MongoDB aggregation pipeline for this aggregation.
 
@@ -166,6 +183,36 @@ class Aggregation(object):
         """
         raise NotImplementedError("subclasses must implement default_result()")
 
+    def _to_mongo_shard(self, sample_collection, context=None):
+        """Returns the MongoDB aggregation pipeline to run on each shard of
+        the collection when :meth:`_is_mergeable` is True.
+
+        Args:
+            sample_collection: the
+                :class:`fiftyone.core.collections.SampleCollection` to which
+                the aggregation is being applied
+            context (None): a path context from which to resolve
+
+        Returns:
+            a MongoDB aggregation pipeline (list of dicts)
+        """
+        return self.to_mongo(sample_collection, context=context)
+
+    def _merge_shard_results(self, results):
+        """Merges the outputs of :meth:`_to_mongo_shard` on disjoint shards of
+        a collection into a result dict that can be passed to
+        :meth:`parse_result`.
+
+        Args:
+            results: a non-empty list of per-shard result dicts
+
+        Returns:
+            the merged result dict
+        """
+        raise NotImplementedError(
+            "subclasses must implement _merge_shard_results()"
+        )
+
     def _needs_frames(self, sample_collection):
         """Whether the aggregation requires frame labels of video samples to be
         attached.
@@ -270,6 +317,112 @@ class AggregationError(Exception):
     """An error raised during the execution of an :class:`Aggregation`."""
 
 
+class AggregationCache(object):
+    """An in-memory LRU cache of aggregation results for a dataset.
+
+    Results are keyed by their MongoDB pipeline, which encodes the view stages
+    and aggregation that generated them. The cache is invalidated whenever the
+    dataset's modification counter is bumped via :meth:`mark_modified`.
+
+    Caching is opt-in: results are only cached when
+    ``fo.config.aggregation_cache_size`` is positive.
+
+    Note that modifications made by other processes cannot be detected, so
+    this cache should only be enabled when the current process is the only
+    writer of the dataset.
+    """
+
+    def __init__(self):
+        self.modification_count = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._cache = cachetools.LRUCache(1)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """Whether caching is currently enabled."""
+        return fo.config.aggregation_cache_size > 0
+
+    def get(self, pipeline):
+        """Retrieves the cached result for the given pipeline, if any.
+
+        Args:
+            pipeline: a MongoDB aggregation pipeline
+
+        Returns:
+            a ``(key, result)`` tuple, where ``key`` should be passed to
+            :meth:`put` and ``result`` is None if the pipeline is not cached
+        """
+        try:
+            key = (self.modification_count, json_util.dumps(pipeline))
+        except TypeError:
+            # Pipeline is not serializable, so it cannot be cached
+            return None, None
+
+        with self._lock:
+            result = self._cache.get(key, None)
+            if result is None:
+                self.misses += 1
+                return key, None
+
+            self.hits += 1
+
+        return key, deepcopy(result)
+
+    def put(self, key, result):
+        """Caches the result for the given key returned by :meth:`get`.
+
+        The result is discarded if the dataset has been modified since the
+        key was generated.
+
+        Args:
+            key: a key returned by :meth:`get`
+            result: the aggregation result
+        """
+        max_size = fo.config.aggregation_cache_size
+
+        with self._lock:
+            if key is None or key[0] != self.modification_count:
+                return
+
+            if self._cache.maxsize != max_size:
+                self._cache = cachetools.LRUCache(max_size)
+
+            self._cache[key] = deepcopy(result)
+
+    def mark_modified(self):
+        """Bumps the modification counter and clears the cache."""
+        with self._lock:
+            self.modification_count += 1
+            self._cache.clear()
+
+    def clear(self):
+        """Clears the cache and resets its statistics."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Returns statistics about the cache.
+
+        Returns:
+            a dict containing the number of ``hits``, ``misses``, the current
+            ``size`` and ``max_size`` of the cache, and the dataset's
+            ``modification_count``
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._cache),
+                "max_size": fo.config.aggregation_cache_size,
+                "modification_count": self.modification_count,
+            }
+
+
 class Bounds(Aggregation):
     """Computes the bounds of a numeric field of a collection.
 
@@ -398,6 +551,25 @@ class Bounds(Aggregation):
 
         return bounds
 
+    @property
+    def _is_mergeable(self):
+        return True
+
+    def _merge_shard_results(self, results):
+        mins = [d["min"] for d in results if d["min"] is not None]
+        maxs = [d["max"] for d in results if d["max"] is not None]
+
+        d = {
+            "min": min(mins) if mins else None,
+            "max": max(maxs) if maxs else None,
+        }
+
+        if self._count_nonfinites:
+            for key in ("inf", "-inf", "nan"):
+                d[key] = sum(di[key] for di in results)
+
+        return d
+
     def to_mongo(self, sample_collection, context=None):
         path, pipeline, _, id_to_str, field_type = _parse_field_and_expr(
             sample_collection,
@@ -564,6 +736,13 @@ class Count(Aggregation):
         """
         return d["count"]
 
+    @property
+    def _is_mergeable(self):
+        return True
+
+    def _merge_shard_results(self, results):
+        return {"count": sum(d["count"] for d in results)}
+
     def to_mongo(self, sample_collection, context=None):
         if self._field_name is None and self._expr is None:
             return [{"$count": "count"}]
@@ -746,6 +925,23 @@ class CountValues(Aggregation):
 
         return {p(i["k"]): i["count"] for i in d["result"]}
 
+    @property
+    def _is_mergeable(self):
+        # Top-k results cannot be merged
+        return self._first is None
+
+    def _merge_shard_results(self, results):
+        counts = {}
+        for d in results:
+            for i in d["result"]:
+                key = json_util.dumps(i["k"])
+                if key in counts:
+                    counts[key]["count"] += i["count"]
+                else:
+                    counts[key] = dict(i)
+
+        return {"result": list(counts.values())}
+
     def to_mongo(self, sample_collection, context=None):
         path, pipeline, _, id_to_str, field_type = _parse_field_and_expr(
             sample_collection,
@@ -949,6 +1145,25 @@ class Distinct(Aggregation):
 
         return values
 
+    @property
+    def _is_mergeable(self):
+        return True
+
+    def _merge_shard_results(self, results):
+        values = {}
+        for d in results:
+            for v in d["values"]:
+                values.setdefault(json_util.dumps(v), v)
+
+        values = list(values.values())
+
+        try:
+            values = sorted(values)
+        except TypeError:
+            pass
+
+        return {"values": values}
+
     def to_mongo(self, sample_collection, context=None):
         path, pipeline, _, id_to_str, field_type = _parse_field_and_expr(
             sample_collection,
@@ -1340,6 +1555,23 @@ class HistogramValues(Aggregation):
 
         return self._parse_result_edges(d)
 
+    @property
+    def _is_mergeable(self):
+        # Automatic bins are data-dependent and thus cannot be merged
+        return not self._auto
+
+    def _merge_shard_results(self, results):
+        bins = {}
+        for d in results:
+            for di in d["bins"]:
+                key = json_util.dumps(di["_id"])
+                if key in bins:
+                    bins[key]["count"] += di["count"]
+                else:
+                    bins[key] = dict(di)
+
+        return {"bins": list(bins.values())}
+
     def to_mongo(self, sample_collection, context=None):
         path, pipeline, _, id_to_str, field_type = _parse_field_and_expr(
             sample_collection,
@@ -1575,6 +1807,23 @@ class Mean(Aggregation):
         """
         return d["mean"]
 
+    @property
+    def _is_mergeable(self):
+        return True
+
+    def _to_mongo_shard(self, sample_collection, context=None):
+        pipeline = self.to_mongo(sample_collection, context=context)
+        value = pipeline[-1]["$group"]["mean"]["$avg"]
+        pipeline[-1] = {"$group": _get_moments_group(value, 1)}
+        return pipeline
+
+    def _merge_shard_results(self, results):
+        count, moments = _merge_moments(results, 1)
+        if count == 0:
+            return {"mean": None}
+
+        return {"mean": moments[0] / count}
+
     def to_mongo(self, sample_collection, context=None):
         path, pipeline, _, id_to_str, _ = _parse_field_and_expr(
             sample_collection,
@@ -2302,6 +2551,25 @@ class Std(Aggregation):
         """
         return d["std"]
 
+    @property
+    def _is_mergeable(self):
+        return True
+
+    def _to_mongo_shard(self, sample_collection, context=None):
+        pipeline = self.to_mongo(sample_collection, context=context)
+        op = "$stdDevSamp" if self._sample else "$stdDevPop"
+        value = pipeline[-1]["$group"]["std"][op]
+        pipeline[-1] = {"$group": _get_central_moments_group(value)}
+        return pipeline
+
+    def _merge_shard_results(self, results):
+        count, _, m2 = _merge_central_moments(results)
+        dof = count - 1 if self._sample else count
+        if dof <= 0:
+            return {"std": None}
+
+        return {"std": math.sqrt(max(m2, 0) / dof)}
+
     def to_mongo(self, sample_collection, context=None):
         path, pipeline, _, id_to_str, _ = _parse_field_and_expr(
             sample_collection,
@@ -2415,6 +2683,13 @@ class Sum(Aggregation):
         """
         return d["sum"]
 
+    @property
+    def _is_mergeable(self):
+        return True
+
+    def _merge_shard_results(self, results):
+        return {"sum": sum(d["sum"] for d in results)}
+
     def to_mongo(self, sample_collection, context=None):
         path, pipeline, _, id_to_str, _ = _parse_field_and_expr(
             sample_collection,
@@ -2541,6 +2816,21 @@ class Values(Aggregation):
         unwind (False): whether to automatically unwind all recognized list
             fields (True) or unwind all list fields except the top-level sample
             field (-1)
+        format ("python"): the format in which to return the values. The
+            supported values are:
+
+            -   ``"python"``: a (potentially nested) list of values
+            -   ``"numpy"``: a flat ``numpy.ndarray`` of leaf values. If the
+                values contain list fields, a ``(values, offsets)`` tuple is
+                returned, where ``offsets`` is an int64 array of length
+                ``num_samples + 1`` whose consecutive entries delimit the
+                values of each sample, or a list of such arrays, outermost
+                first, when there are multiple nested list fields
+            -   ``"arrow"``: a ``pyarrow.Array``, which is a ``ListArray``
+                when the values contain list fields. Requires ``pyarrow``
+
+            In the columnar formats, ``None``-valued list fields are
+            represented as empty lists
     """
 
     def __init__(
@@ -2549,14 +2839,22 @@ class Values(Aggregation):
         expr=None,
         missing_value=None,
         unwind=False,
+        format="python",
         _allow_missing=False,
         _big_result=True,
         _raw=False,
         _field=None,
     ):
+        if format not in _VALUES_FORMATS:
+            raise ValueError(
+                "Unsupported format '%s'; supported values are %s"
+                % (format, _VALUES_FORMATS)
+            )
+
         super().__init__(field_or_expr, expr=expr)
         self._missing_value = missing_value
         self._unwind = unwind
+        self._format = format
         self._allow_missing = _allow_missing
         self._big_result = _big_result
         self._raw = _raw
@@ -2572,6 +2870,7 @@ class Values(Aggregation):
             ["expr", self._expr],
             ["missing_value", self._missing_value],
             ["unwind", self._unwind],
+            ["format", self._format],
             ["_allow_missing", self._allow_missing],
             ["_big_result", self._big_result],
             ["_raw", self._raw],
@@ -2606,13 +2905,20 @@ class Values(Aggregation):
             d: the result dict
 
         Returns:
-            the list of field values
+            the list of field values, or a columnar representation of them if
+            a non-default ``format`` was requested
         """
         if self._big_result:
             values = [di[self._big_field] for di in d]
         else:
             values = d["values"]
 
+        if self._format != "python":
+            field = self._field if not self._raw else None
+            return _to_columnar_values(
+                values, field, self._num_list_fields, self._format
+            )
+
         if self._raw:
             return values
 
@@ -2687,6 +2993,109 @@ _MONGO_TO_FIFTYONE_TYPES = {
 }
 
 
+_VALUES_FORMATS = ("python", "numpy", "arrow")
+
+
+def _to_columnar_values(values, field, num_list_fields, format):
+    values, offsets = _flatten_values(values, num_list_fields)
+
+    # Terminal list fields are not declared by the pipeline, so we unwrap them
+    # here so that their elements become the leaf values
+    while isinstance(field, fof.ListField):
+        values, _offsets = _flatten_values(values, 1)
+        offsets.extend(_offsets)
+        field = field.field
+
+    if field is None:
+        while any(isinstance(v, (list, tuple)) for v in values):
+            values, _offsets = _flatten_values(values, 1)
+            offsets.extend(_offsets)
+    elif not isinstance(field, fof._PRIMITIVE_FIELDS):
+        if format == "arrow" and isinstance(field, fof.EmbeddedDocumentField):
+            raise ValueError(
+                "The 'arrow' format does not support embedded document "
+                "fields; found %s" % field
+            )
+
+        fcn = field.to_python
+        values = [fcn(v) for v in values]
+
+    if format == "arrow":
+        return _to_arrow_array(values, offsets)
+
+    values = _to_numpy_array(values)
+
+    if not offsets:
+        return values
+
+    if len(offsets) == 1:
+        return values, offsets[0]
+
+    return values, offsets
+
+
+def _flatten_values(values, num_levels):
+    offsets = []
+    for _ in range(num_levels):
+        lengths = np.fromiter(
+            (len(v) if v else 0 for v in values),
+            dtype=np.int64,
+            count=len(values),
+        )
+        offsets.append(np.concatenate(([0], np.cumsum(lengths))))
+        values = list(itertools.chain.from_iterable(v for v in values if v))
+
+    return values, offsets
+
+
+def _to_numpy_array(values):
+    types = set(map(type, values))
+    has_none = type(None) in types
+    types.discard(type(None))
+
+    try:
+        if not types:
+            return np.full(len(values), np.nan)
+
+        if types <= {int, float}:
+            if has_none or float in types:
+                return np.array(values, dtype=float)
+
+            return np.array(values, dtype=np.int64)
+
+        if types == {datetime}:
+            return np.array(values, dtype="datetime64[ms]")
+
+        if types == {date}:
+            return np.array(values, dtype="datetime64[D]")
+
+        if not has_none:
+            if types == {bool}:
+                return np.array(values, dtype=bool)
+
+            if types == {str}:
+                return np.array(values, dtype=str)
+
+            if types == {np.ndarray}:
+                return np.stack(values)
+    except (TypeError, ValueError):
+        pass
+
+    array = np.empty(len(values), dtype=object)
+    for idx, value in enumerate(values):
+        array[idx] = value
+
+    return array
+
+
+def _to_arrow_array(values, offsets):
+    array = pa.array(values)
+    for _offsets in reversed(offsets):
+        array = pa.ListArray.from_arrays(pa.array(_offsets), array)
+
+    return array
+
+
 def _transform_values(values, fcn, level=1):
     if values is None:
         return None
@@ -2898,6 +3307,59 @@ def _to_safe_expr(expr, field_type):
     return expr.apply(to_finite)
 
 
+def _get_moments_group(value, order):
+    # Mirrors `$avg` and `$stdDev*`, which ignore non-numeric values
+    is_number = {"$isNumber": value}
+    group = {"_id": None, "count": {"$sum": {"$cond": [is_number, 1, 0]}}}
+
+    power = value
+    for k in range(1, order + 1):
+        if k > 1:
+            power = {"$multiply": [power, value]}
+
+        group["sum%d" % k] = {"$sum": {"$cond": [is_number, power, None]}}
+
+    return group
+
+
+def _merge_moments(results, order):
+    count = sum(d["count"] for d in results)
+    moments = [
+        sum(d["sum%d" % k] for d in results) for k in range(1, order + 1)
+    ]
+    return count, moments
+
+
+def _get_central_moments_group(value):
+    # `$stdDevPop` is computed stably by the server, so each shard reports its
+    # count, mean, and sum of squared deviations from the mean (M2)
+    is_number = {"$isNumber": value}
+    return {
+        "_id": None,
+        "count": {"$sum": {"$cond": [is_number, 1, 0]}},
+        "mean": {"$avg": value},
+        "std": {"$stdDevPop": value},
+    }
+
+
+def _merge_central_moments(results):
+    # Chan et al.'s pairwise update, which avoids the catastrophic
+    # cancellation of computing the variance from raw power sums
+    count, mean, m2 = 0, 0.0, 0.0
+    for d in results:
+        n = d["count"]
+        if not n:
+            continue
+
+        delta = d["mean"] - mean
+        total = count + n
+        mean += delta * n / total
+        m2 += d["std"] ** 2 * n + delta * delta * count * n / total
+        count = total
+
+    return count, mean, m2
+
+
 def _handle_reduce_unwinds(path, unwind_list_fields, other_list_fields):
     pipeline = []
 
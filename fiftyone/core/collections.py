@@ -10,6 +10,7 @@ from copy import copy
 import fnmatch
 import itertools
 import logging
+from multiprocessing.pool import ThreadPool
 import numbers
 import os
 import random
@@ -80,14 +81,29 @@ class SaveContext(object):
         batch_size (None): the batching strategy to use. Can either be an
             integer specifying the number of samples to save in a batch, or a
             float number of seconds between batched saves
+        async_writes (False): whether to write each batch to the database in a
+            background thread, so that writes overlap with the work that
+            produces the next batch. At most one batch is written at a time
+        skip_failures (False): whether to log a warning rather than raise an
+            error when a batch fails to be written. When ``async_writes`` is
+            True, write errors are raised when the context exits rather than
+            by a call to :meth:`save` for an unrelated sample
     """
 
-    def __init__(self, sample_collection, batch_size=None):
+    def __init__(
+        self,
+        sample_collection,
+        batch_size=None,
+        async_writes=False,
+        skip_failures=False,
+    ):
         if batch_size is None:
             batch_size = 0.2
 
         self.sample_collection = sample_collection
         self.batch_size = batch_size
+        self.async_writes = async_writes
+        self.skip_failures = skip_failures
 
         self._dataset = sample_collection._dataset
         self._sample_coll = sample_collection._dataset._sample_collection
@@ -95,21 +111,44 @@ class SaveContext(object):
 
         self._sample_ops = []
         self._frame_ops = []
+        self._sample_ids = []
         self._reload_parents = []
 
         self._curr_batch_size = None
         self._dynamic_batches = not isinstance(batch_size, numbers.Integral)
         self._last_time = None
 
+        self._writer = None
+        self._pending_write = None
+        self._write_error = None
+
     def __enter__(self):
         if self._dynamic_batches:
             self._last_time = timeit.default_timer()
 
+        if self.async_writes:
+            self._writer = ThreadPool(processes=1)
+
         self._curr_batch_size = 0
         return self
 
     def __exit__(self, *args):
-        self._save_batch()
+        try:
+            self._save_batch()
+            self._wait_for_write()
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer.join()
+                self._writer = None
+                self._pending_write = None
+
+        error = self._write_error
+        self._write_error = None
+
+        # Don't mask an exception that is already being raised
+        if error is not None and args[0] is None:
+            raise error
 
     def save(self, sample):
         """Registers the sample for saving in the next batch.
@@ -135,6 +174,9 @@ class SaveContext(object):
         if frame_ops:
             self._frame_ops.extend(frame_ops)
 
+        if updated:
+            self._sample_ids.append(sample.id)
+
         if updated and isinstance(sample, fosa.SampleView):
             self._reload_parents.append(sample)
 
@@ -148,19 +190,84 @@ class SaveContext(object):
     def _save_batch(self):
         self._curr_batch_size = 0
 
-        if self._sample_ops:
-            foo.bulk_write(self._sample_ops, self._sample_coll, ordered=False)
-            self._sample_ops.clear()
+        sample_ops = self._sample_ops
+        frame_ops = self._frame_ops
+        sample_ids = self._sample_ids
+        reload_parents = self._reload_parents
+
+        self._sample_ops = []
+        self._frame_ops = []
+        self._sample_ids = []
+        self._reload_parents = []
+
+        if self._writer is None:
+            failure = self._write_batch(sample_ops, frame_ops, sample_ids)
+            self._handle_failure(failure)
+            self._reload_batch(reload_parents)
+            return
+
+        # Only one batch is written at a time, which preserves write order
+        self._wait_for_write()
+
+        if sample_ops or frame_ops:
+            result = self._writer.apply_async(
+                self._write_batch, (sample_ops, frame_ops, sample_ids)
+            )
+            self._pending_write = (result, reload_parents)
+        else:
+            self._reload_batch(reload_parents)
+
+    def _wait_for_write(self):
+        if self._pending_write is None:
+            return
+
+        result, reload_parents = self._pending_write
+        self._pending_write = None
+
+        failure = result.get()
+        self._handle_failure(failure)
+        self._reload_batch(reload_parents)
+
+    def _write_batch(self, sample_ops, frame_ops, sample_ids):
+        # Errors are returned rather than raised so that they can be reported
+        # against the samples in this batch, which may have been registered
+        # long before the batch is written
+        try:
+            if sample_ops:
+                foo.bulk_write(sample_ops, self._sample_coll, ordered=False)
+
+            if frame_ops:
+                foo.bulk_write(frame_ops, self._frame_coll, ordered=False)
+        except Exception as e:
+            return sample_ids, e
+        finally:
+            if sample_ops or frame_ops:
+                self._dataset._mark_modified()
+
+        return None
+
+    def _handle_failure(self, failure):
+        if failure is None:
+            return
 
-        if self._frame_ops:
-            foo.bulk_write(self._frame_ops, self._frame_coll, ordered=False)
-            self._frame_ops.clear()
+        sample_ids, error = failure
 
-        if self._reload_parents:
-            for sample in self._reload_parents:
-                sample._reload_parents()
+        if self.skip_failures:
+            logger.warning(
+                "Failed to save %d samples: %s\nError: %s\n",
+                len(sample_ids),
+                sample_ids,
+                error,
+            )
+        elif self._writer is None:
+            raise error
+        elif self._write_error is None:
+            # Raised when the context exits
+            self._write_error = error
 
-            self._reload_parents.clear()
+    def _reload_batch(self, reload_parents):
+        for sample in reload_parents:
+            sample._reload_parents()
 
 
 class SampleCollection(object):
@@ -820,7 +927,14 @@ class SampleCollection(object):
         """
         raise NotImplementedError("Subclass must implement view()")
 
-    def iter_samples(self, progress=False, autosave=False, batch_size=None):
+    def iter_samples(
+        self,
+        progress=False,
+        autosave=False,
+        batch_size=None,
+        prefetch=None,
+        frames=None,
+    ):
         """Returns an iterator over the samples in the collection.
 
         Args:
@@ -831,6 +945,17 @@ class SampleCollection(object):
             batch_size (None): a batch size to use when autosaving samples. Can
                 either be an integer specifying the number of samples to save
                 in a batch, or a float number of seconds between batched saves
+            prefetch (None): an optional number of samples to load on a
+                background thread ahead of the sample currently being
+                processed, which overlaps database reads with the work done
+                in your loop
+            frames (None): an optional strategy for loading the frames of
+                video samples. Supported values are:
+
+                -   ``None``: each sample's frames are loaded from the
+                    database when they are first accessed
+                -   ``"batched"``: the frames of batches of samples are loaded
+                    via a single database query as the samples are loaded
 
         Returns:
             an iterator over :class:`fiftyone.core.sample.Sample` or
@@ -844,6 +969,7 @@ class SampleCollection(object):
         progress=False,
         autosave=False,
         batch_size=None,
+        prefetch=None,
     ):
         """Returns an iterator over the groups in the collection.
 
@@ -856,6 +982,10 @@ class SampleCollection(object):
             batch_size (None): a batch size to use when autosaving samples. Can
                 either be an integer specifying the number of samples to save
                 in a batch, or a float number of seconds between batched saves
+            prefetch (None): an optional number of groups to load on a
+                background thread ahead of the group currently being
+                processed, which overlaps database reads with the work done
+                in your loop
 
         Returns:
             an iterator that emits dicts mapping group slice names to
@@ -880,7 +1010,9 @@ class SampleCollection(object):
         """
         raise NotImplementedError("Subclass must implement get_group()")
 
-    def save_context(self, batch_size=None):
+    def save_context(
+        self, batch_size=None, async_writes=False, skip_failures=False
+    ):
         """Returns a context that can be used to save samples from this
         collection according to a configurable batching strategy.
 
@@ -918,11 +1050,20 @@ class SampleCollection(object):
             batch_size (None): the batching strategy to use. Can either be an
                 integer specifying the number of samples to save in a batch, or
                 a float number of seconds between batched saves
+            async_writes (False): whether to write batches to the database in
+                a background thread so that they overlap with subsequent work
+            skip_failures (False): whether to log a warning rather than raise
+                an error when a batch fails to be written
 
         Returns:
             a :class:`SaveContext`
         """
-        return SaveContext(self, batch_size=batch_size)
+        return SaveContext(
+            self,
+            batch_size=batch_size,
+            async_writes=async_writes,
+            skip_failures=skip_failures,
+        )
 
     def _get_default_sample_fields(
         self,
@@ -2680,9 +2821,12 @@ class SampleCollection(object):
                 has logits, ``model.has_logits == True``
             batch_size (None): an optional batch size to use, if the model
                 supports batching
-            num_workers (None): the number of workers for the
-                :class:`torch:torch.utils.data.DataLoader` to use. Only
-                applicable for Torch-based models
+            num_workers (None): the number of workers to use when loading
+                images. Only applicable to image collections. Torch-based
+                models use a :class:`torch:torch.utils.data.DataLoader` with
+                this many workers, and other models decode the images of
+                upcoming batches in this many background threads (up to 4 by
+                default, or none if ``num_workers=0``)
             skip_failures (True): whether to gracefully continue without
                 raising an error if predictions cannot be generated for a
                 sample. Only applicable to :class:`fiftyone.core.models.Model`
@@ -2722,6 +2866,7 @@ class SampleCollection(object):
         batch_size=None,
         num_workers=None,
         skip_failures=True,
+        embeddings_store=None,
         **kwargs,
     ):
         """Computes embeddings for the samples in the collection using the
@@ -2744,7 +2889,9 @@ class SampleCollection(object):
         :meth:`fiftyone.core.models.Model.has_embeddings` must return ``True``.
 
         If an ``embeddings_field`` is provided, the embeddings are saved to the
-        samples; otherwise, the embeddings are returned in-memory.
+        samples. If an ``embeddings_store`` is provided, the embeddings are
+        streamed to a :class:`fiftyone.core.models.EmbeddingsStore` on disk.
+        Otherwise, the embeddings are returned in-memory.
 
         Args:
             model: a :class:`fiftyone.core.models.Model` or
@@ -2754,13 +2901,20 @@ class SampleCollection(object):
                 "frames." prefix is optional
             batch_size (None): an optional batch size to use, if the model
                 supports batching
-            num_workers (None): the number of workers for the
-                :class:`torch:torch.utils.data.DataLoader` to use. Only
-                applicable for Torch-based models
+            num_workers (None): the number of workers to use when loading
+                images. Only applicable to image collections. Torch-based
+                models use a :class:`torch:torch.utils.data.DataLoader` with
+                this many workers, and other models decode the images of
+                upcoming batches in this many background threads (up to 4 by
+                default, or none if ``num_workers=0``)
             skip_failures (True): whether to gracefully continue without
                 raising an error if embeddings cannot be generated for a
                 sample. Only applicable to :class:`fiftyone.core.models.Model`
                 instances
+            embeddings_store (None): the path to a directory in which to write
+                a :class:`fiftyone.core.models.EmbeddingsStore` of the
+                embeddings. Not applicable when computing frame embeddings or
+                using Lightning Flash models
             **kwargs: optional model-specific keyword arguments passed through
                 to the underlying inference implementation
 
@@ -2768,6 +2922,8 @@ class SampleCollection(object):
             one of the following:
 
             -   ``None``, if an ``embeddings_field`` is provided
+            -   a :class:`fiftyone.core.models.EmbeddingsStore`, if an
+                ``embeddings_store`` is provided
             -   a ``num_samples x num_dim`` array of embeddings, when computing
                 embeddings for image/video collections with image/video models,
                 respectively, and no ``embeddings_field`` is provided. If
@@ -2790,6 +2946,7 @@ class SampleCollection(object):
             batch_size=batch_size,
             num_workers=num_workers,
             skip_failures=skip_failures,
+            embeddings_store=embeddings_store,
             **kwargs,
         )
 
@@ -2804,6 +2961,7 @@ class SampleCollection(object):
         batch_size=None,
         num_workers=None,
         skip_failures=True,
+        embeddings_store=None,
     ):
         """Computes embeddings for the image patches defined by
         ``patches_field`` of the samples in the collection using the given
@@ -2820,7 +2978,9 @@ class SampleCollection(object):
         :meth:`fiftyone.core.models.Model.has_embeddings` must return ``True``.
 
         If an ``embeddings_field`` is provided, the embeddings are saved to the
-        samples; otherwise, the embeddings are returned in-memory.
+        samples. If an ``embeddings_store`` is provided, the embeddings are
+        streamed to a :class:`fiftyone.core.models.EmbeddingsStore` on disk.
+        Otherwise, the embeddings are returned in-memory.
 
         Args:
             model: a :class:`fiftyone.core.models.Model`
@@ -2855,11 +3015,18 @@ class SampleCollection(object):
                 applicable for Torch-based models
             skip_failures (True): whether to gracefully continue without
                 raising an error if embeddings cannot be generated for a sample
+            embeddings_store (None): the path to a directory in which to write
+                a :class:`fiftyone.core.models.EmbeddingsStore` of the
+                embeddings, whose rows are keyed by label ID. Patches generated
+                via ``handle_missing="image"`` are keyed by sample ID. Only
+                applicable to image collections
 
         Returns:
             one of the following:
 
             -   ``None``, if an ``embeddings_field`` is provided
+            -   a :class:`fiftyone.core.models.EmbeddingsStore`, if an
+                ``embeddings_store`` is provided
             -   a dict mapping sample IDs to ``num_patches x num_dim`` arrays
                 of patch embeddings, when computing patch embeddings for image
                 collections and no ``embeddings_field`` is provided. If
@@ -2885,6 +3052,7 @@ class SampleCollection(object):
             alpha=alpha,
             handle_missing=handle_missing,
             skip_failures=skip_failures,
+            embeddings_store=embeddings_store,
         )
 
     def evaluate_regressions(
@@ -2954,6 +3122,7 @@ class SampleCollection(object):
         classes=None,
         missing=None,
         method="simple",
+        incremental=False,
         **kwargs,
     ):
         """Evaluates the classification predictions in this collection with
@@ -2998,6 +3167,14 @@ class SampleCollection(object):
                 are given this label for results purposes
             method ("simple"): a string specifying the evaluation method to use.
                 Supported values are ``("simple", "binary", "top-k")``
+            incremental (False): whether to incrementally update an existing
+                evaluation with key ``eval_key`` by only re-evaluating samples
+                whose ``pred_field`` or ``gt_field`` contents have changed
+                since the last evaluation that was run with
+                ``incremental=True``. A full evaluation is performed if no such
+                evaluation exists or if it was performed with a different
+                config or view. Note that detecting changes requires reading
+                the ``pred_field`` and ``gt_field`` contents of every sample
             **kwargs: optional keyword arguments for the constructor of the
                 :class:`fiftyone.utils.eval.classification.ClassificationEvaluationConfig`
                 being used
@@ -3013,6 +3190,7 @@ class SampleCollection(object):
             classes=classes,
             missing=missing,
             method=method,
+            incremental=incremental,
             **kwargs,
         )
 
@@ -3029,6 +3207,8 @@ class SampleCollection(object):
         use_boxes=False,
         classwise=True,
         dynamic=True,
+        num_workers=None,
+        incremental=False,
         **kwargs,
     ):
         """Evaluates the specified predicted detections in this collection with
@@ -3121,6 +3301,20 @@ class SampleCollection(object):
                 label (True) or allow matches between classes (False)
             dynamic (True): whether to declare the dynamic object-level
                 attributes that are populated on the dataset's schema
+            num_workers (None): the number of processes to use to match
+                objects. By default, matching is performed in the main process.
+                Only applicable when the evaluation method does not require
+                fields besides ``pred_field`` and ``gt_field``
+            incremental (False): whether to incrementally update an existing
+                evaluation with key ``eval_key`` by only re-evaluating samples
+                whose ``pred_field`` or ``gt_field`` contents have changed
+                since the last evaluation that was run with
+                ``incremental=True``. A full evaluation is performed if no such
+                evaluation exists or if it was performed with a different
+                config or view. Any IoU sweeps required to compute mAP are
+                always performed on all samples. Note that detecting changes
+                requires reading the ``pred_field`` and ``gt_field`` contents
+                of every sample
             **kwargs: optional keyword arguments for the constructor of the
                 :class:`fiftyone.utils.eval.detection.DetectionEvaluationConfig`
                 being used
@@ -3141,6 +3335,8 @@ class SampleCollection(object):
             use_boxes=use_boxes,
             classwise=classwise,
             dynamic=dynamic,
+            num_workers=num_workers,
+            incremental=incremental,
             **kwargs,
         )
 
@@ -3151,6 +3347,7 @@ class SampleCollection(object):
         eval_key=None,
         mask_targets=None,
         method="simple",
+        num_workers=None,
         **kwargs,
     ):
         """Evaluates the specified semantic segmentation masks in this
@@ -3201,6 +3398,9 @@ class SampleCollection(object):
                 labels
             method ("simple"): a string specifying the evaluation method to
                 use. Supported values are ``("simple")``
+            num_workers (None): the number of processes to use to load masks
+                and compute their confusion matrices. By default, all work is
+                performed in the main process
             **kwargs: optional keyword arguments for the constructor of the
                 :class:`fiftyone.utils.eval.segmentation.SegmentationEvaluationConfig`
                 being used
@@ -3215,6 +3415,7 @@ class SampleCollection(object):
             eval_key=eval_key,
             mask_targets=mask_targets,
             method=method,
+            num_workers=num_workers,
             **kwargs,
         )
 
@@ -7669,6 +7870,7 @@ class SampleCollection(object):
         expr=None,
         missing_value=None,
         unwind=False,
+        format="python",
         _allow_missing=False,
         _big_result=True,
         _raw=False,
@@ -7759,6 +7961,18 @@ class SampleCollection(object):
             # list of lists of detection labels
             labels = dataset.values("ground_truth.detections.label")
 
+            #
+            # Get values in columnar format
+            #
+
+            # flat array of confidences and per-sample offsets into it
+            confs, offsets = dataset.values(
+                "predictions.detections.confidence", format="numpy"
+            )
+
+            # confidences of the first sample
+            print(confs[offsets[0] : offsets[1]])
+
         Args:
             field_or_expr: a field name, ``embedded.field.name``,
                 :class:`fiftyone.core.expressions.ViewExpression`, or
@@ -7776,15 +7990,34 @@ class SampleCollection(object):
             unwind (False): whether to automatically unwind all recognized list
                 fields (True) or unwind all list fields except the top-level
                 sample field (-1)
+            format ("python"): the format in which to return the values. The
+                supported values are:
+
+                -   ``"python"``: a (potentially nested) list of values
+                -   ``"numpy"``: a flat ``numpy.ndarray`` of leaf values. If
+                    the values contain list fields, a ``(values, offsets)``
+                    tuple is returned, where ``offsets`` is an int64 array of
+                    length ``num_samples + 1`` whose consecutive entries
+                    delimit the values of each sample, or a list of such
+                    arrays, outermost first, when there are multiple nested
+                    list fields
+                -   ``"arrow"``: a ``pyarrow.Array``, which is a
+                    ``ListArray`` when the values contain list fields.
+                    Requires ``pyarrow``
+
+                In the columnar formats, ``None``-valued list fields are
+                represented as empty lists
 
         Returns:
-            the list of values
+            the list of values, or a columnar representation of them if a
+            non-default ``format`` was requested
         """
         make = lambda field_or_expr: foa.Values(
             field_or_expr,
             expr=expr,
             missing_value=missing_value,
             unwind=unwind,
+            format=format,
             _allow_missing=_allow_missing,
             _big_result=_big_result,
             _raw=_raw,
@@ -8865,7 +9098,7 @@ class SampleCollection(object):
         """
         raise NotImplementedError("Subclass must implement _add_view_stage()")
 
-    def aggregate(self, aggregations):
+    def aggregate(self, aggregations, num_shards=None):
         """Aggregates one or more
         :class:`fiftyone.core.aggregations.Aggregation` instances.
 
@@ -8873,10 +9106,37 @@ class SampleCollection(object):
         to :meth:`aggregate`, as this will be more efficient than performing
         multiple aggregations in series.
 
+        When ``num_shards`` is provided, aggregations whose results can be
+        merged (:class:`fiftyone.core.aggregations.Count`,
+        :class:`fiftyone.core.aggregations.Sum`,
+        :class:`fiftyone.core.aggregations.Bounds`,
+        :class:`fiftyone.core.aggregations.CountValues`,
+        :class:`fiftyone.core.aggregations.HistogramValues`,
+        :class:`fiftyone.core.aggregations.Distinct`,
+        :class:`fiftyone.core.aggregations.Mean`, and
+        :class:`fiftyone.core.aggregations.Std`) are executed concurrently on
+        disjoint ``_id`` ranges of the collection and their per-shard results
+        are merged. This can speed up aggregations on very large collections.
+        Sharding is only applied when every stage of the view processes each
+        sample independently; otherwise, all aggregations run unsharded.
+
+        Examples::
+
+            import fiftyone as fo
+            import fiftyone.zoo as foz
+
+            dataset = foz.load_zoo_dataset("quickstart")
+
+            counts = dataset.aggregate(
+                fo.CountValues("predictions.detections.label"), num_shards=4
+            )
+
         Args:
             aggregations: an :class:`fiftyone.core.aggregations.Aggregation` or
                 iterable of :class:`fiftyone.core.aggregations.Aggregation`
                 instances
+            num_shards (None): an optional number of ``_id`` ranges into which
+                to split the collection when executing mergeable aggregations
 
         Returns:
             an aggregation result or list of aggregation results corresponding
@@ -8890,6 +9150,10 @@ class SampleCollection(object):
         if scalar_result:
             aggregations = [aggregations]
 
+        if num_shards is not None and num_shards > 1:
+            results = self._aggregate_sharded(aggregations, num_shards)
+            return results[0] if scalar_result else results
+
         # Partition aggregations by type
         big_aggs, batch_aggs, facet_aggs = self._parse_aggregations(
             aggregations, allow_big=True
@@ -8919,7 +9183,9 @@ class SampleCollection(object):
             pipelines.append(pipeline)
 
         # Run all aggregations
-        _results = foo.aggregate(self._dataset._sample_collection, pipelines)
+        num_pipelines = len(pipelines)
+        cacheable = range(num_pipelines - len(facet_pipelines), num_pipelines)
+        _results = self._run_aggregations(pipelines, cacheable=cacheable)
 
         # Parse batch results
         if batch_aggs:
@@ -8947,6 +9213,129 @@ class SampleCollection(object):
 
         return results[0] if scalar_result else results
 
+    def _aggregate_sharded(self, aggregations, num_shards):
+        can_shard = self._can_shard()
+
+        sharded_aggs = {}
+        other_aggs = {}
+        for idx, aggregation in enumerate(aggregations):
+            if can_shard and aggregation._is_mergeable:
+                sharded_aggs[idx] = aggregation
+            else:
+                other_aggs[idx] = aggregation
+
+        # Placeholder to store results
+        results = [None] * len(aggregations)
+
+        if other_aggs:
+            _results = self.aggregate(list(other_aggs.values()))
+            for idx, result in zip(other_aggs.keys(), _results):
+                results[idx] = result
+
+        if not sharded_aggs:
+            return results
+
+        shards = self._get_id_shards(num_shards)
+
+        pipelines = []
+        for aggregation in sharded_aggs.values():
+            pipeline = self._pipeline(
+                pipeline=aggregation._to_mongo_shard(self),
+                attach_frames=aggregation._needs_frames(self),
+                group_slices=aggregation._needs_group_slices(self),
+            )
+            for shard in shards:
+                pipelines.append([{"$match": shard}] + pipeline)
+
+        # Run all shards concurrently
+        _results = foo.aggregate(self._dataset._sample_collection, pipelines)
+        _results = [list(r) for r in _results]
+
+        num_shards = len(shards)
+        for i, (idx, aggregation) in enumerate(sharded_aggs.items()):
+            shard_results = _results[i * num_shards : (i + 1) * num_shards]
+            shard_results = [r[0] for r in shard_results if r]
+            if shard_results:
+                d = aggregation._merge_shard_results(shard_results)
+                results[idx] = aggregation.parse_result(d)
+            else:
+                results[idx] = aggregation.default_result()
+
+        return results
+
+    def _can_shard(self):
+        # Shards are defined by `_id` ranges that are applied before the
+        # view's stages, so every stage must process samples independently
+        if not isinstance(self, fov.DatasetView):
+            return True
+
+        sample_local_stages = (
+            fos.Exclude,
+            fos.ExcludeBy,
+            fos.ExcludeFields,
+            fos.ExcludeFrames,
+            fos.ExcludeLabels,
+            fos.Exists,
+            fos.FilterField,
+            fos.FilterKeypoints,
+            fos.FilterLabels,
+            fos.GeoWithin,
+            fos.LimitLabels,
+            fos.MapLabels,
+            fos.Match,
+            fos.MatchFrames,
+            fos.MatchLabels,
+            fos.MatchTags,
+            fos.Select,
+            fos.SelectBy,
+            fos.SelectFields,
+            fos.SelectFrames,
+            fos.SelectLabels,
+            fos.SetField,
+            fos.SortBy,
+        )
+
+        return all(
+            isinstance(stage, sample_local_stages) for stage in self._stages
+        )
+
+    def _get_id_shards(self, num_shards):
+        # Estimates `_id` quantiles from a random sample of the collection
+        coll = self._dataset._sample_collection
+        num_samples = coll.estimated_document_count()
+        sample_size = min(num_samples, 100 * num_shards)
+        if sample_size == 0:
+            return [{}]
+
+        ids = sorted(
+            d["_id"]
+            for d in coll.aggregate(
+                [
+                    {"$sample": {"size": sample_size}},
+                    {"$project": {"_id": True}},
+                ]
+            )
+        )
+
+        splits = sorted(
+            set(
+                ids[(i * len(ids)) // num_shards] for i in range(1, num_shards)
+            )
+        )
+
+        shards = []
+        for lower, upper in zip([None] + splits, splits + [None]):
+            query = {}
+            if lower is not None:
+                query["$gte"] = lower
+
+            if upper is not None:
+                query["$lt"] = upper
+
+            shards.append({"_id": query} if query else {})
+
+        return shards
+
     async def _async_aggregate(self, aggregations):
         if not aggregations:
             return []
@@ -8976,9 +9365,7 @@ class SampleCollection(object):
                 pipelines.append(pipeline)
 
             # Run all aggregations
-            coll_name = self._dataset._sample_collection_name
-            collection = foo.get_async_db_conn()[coll_name]
-            _results = await foo.aggregate(collection, pipelines)
+            _results = await self._async_run_aggregations(pipelines)
 
             # Parse facet-able results
             for idx, aggregation in compiled_facet_aggs.items():
@@ -8995,6 +9382,43 @@ class SampleCollection(object):
 
         return results[0] if scalar_result else results
 
+    def _run_aggregations(self, pipelines, cacheable=None):
+        # Only the pipelines whose indexes are in `cacheable` may be cached
+        collection = self._dataset._sample_collection
+        cache = self._dataset._aggregation_cache
+        if not cacheable or not cache.enabled:
+            return foo.aggregate(collection, pipelines)
+
+        results, keys = _get_cached_results(cache, pipelines, cacheable)
+
+        uncached = [i for i, r in enumerate(results) if r is None]
+        if uncached:
+            _results = foo.aggregate(
+                collection, [pipelines[i] for i in uncached]
+            )
+            _set_cached_results(cache, results, keys, uncached, _results)
+
+        return results
+
+    async def _async_run_aggregations(self, pipelines):
+        coll_name = self._dataset._sample_collection_name
+        collection = foo.get_async_db_conn()[coll_name]
+        cache = self._dataset._aggregation_cache
+        if not cache.enabled:
+            return await foo.aggregate(collection, pipelines)
+
+        cacheable = range(len(pipelines))
+        results, keys = _get_cached_results(cache, pipelines, cacheable)
+
+        uncached = [i for i, r in enumerate(results) if r is None]
+        if uncached:
+            _results = await foo.aggregate(
+                collection, [pipelines[i] for i in uncached]
+            )
+            _set_cached_results(cache, results, keys, uncached, _results)
+
+        return results
+
     def _parse_aggregations(self, aggregations, allow_big=True):
         big_aggs = {}
         batch_aggs = {}
@@ -10319,6 +10743,23 @@ def _handle_id_field(schema, field_name, include_private=False):
     return field_name
 
 
+def _get_cached_results(cache, pipelines, cacheable):
+    results = [None] * len(pipelines)
+    keys = [None] * len(pipelines)
+    for idx in cacheable:
+        keys[idx], results[idx] = cache.get(pipelines[idx])
+
+    return results, keys
+
+
+def _set_cached_results(cache, results, keys, indexes, _results):
+    for idx, result in zip(indexes, _results):
+        result = list(result)
+        results[idx] = result
+        if keys[idx] is not None:
+            cache.put(keys[idx], result)
+
+
 def _handle_id_fields(sample_collection, field_name):
     if not field_name:
         return field_name, False, False
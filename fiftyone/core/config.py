@@ -212,6 +212,24 @@ class FiftyOneConfig(EnvConfig):
         self.timezone = self.parse_string(
             d, "timezone", env_var="FIFTYONE_TIMEZONE", default=None
         )
+        self.aggregation_cache_size = self.parse_int(
+            d,
+            "aggregation_cache_size",
+            env_var="FIFTYONE_AGGREGATION_CACHE_SIZE",
+            default=0,
+        )
+        self.thumbnail_cache_dir = self.parse_path(
+            d,
+            "thumbnail_cache_dir",
+            env_var="FIFTYONE_THUMBNAIL_CACHE_DIR",
+            default=None,
+        )
+        self.thumbnail_cache_size = self.parse_int(
+            d,
+            "thumbnail_cache_size",
+            env_var="FIFTYONE_THUMBNAIL_CACHE_SIZE",
+            default=1073741824,
+        )
 
         self._init()
 
@@ -246,6 +264,11 @@ class FiftyOneConfig(EnvConfig):
                 self.default_dataset_dir, "__models__"
             )
 
+        if self.thumbnail_cache_dir is None:
+            self.thumbnail_cache_dir = os.path.join(
+                foc.FIFTYONE_CONFIG_DIR, "var", "thumbnails"
+            )
+
         if self.default_ml_backend is None:
             installed_packages = _get_installed_packages()
 
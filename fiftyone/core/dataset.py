@@ -5,16 +5,18 @@ FiftyOne datasets.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
-from collections import defaultdict
+from collections import defaultdict, deque
 import contextlib
 from datetime import datetime
 import fnmatch
 import itertools
 import logging
+from multiprocessing.pool import ThreadPool
 import numbers
 import os
 import random
 import string
+import threading
 
 from bson import json_util, ObjectId, DBRef
 import cachetools
@@ -28,6 +30,7 @@ import eta.core.utils as etau
 
 import fiftyone as fo
 import fiftyone.constants as focn
+import fiftyone.core.aggregations as foa
 import fiftyone.core.collections as foc
 import fiftyone.core.expressions as foe
 import fiftyone.core.fields as fof
@@ -281,6 +284,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         self._annotation_cache = cachetools.LRUCache(5)
         self._brain_cache = cachetools.LRUCache(5)
         self._evaluation_cache = cachetools.LRUCache(5)
+        self._aggregation_cache = foa.AggregationCache()
 
         self._deleted = False
 
@@ -1659,6 +1663,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             fos.Sample._purge_fields(self._sample_collection_name, fields)
 
         fos.Sample._reload_docs(self._sample_collection_name)
+        self._mark_modified()
         self._reload()
 
     def _rename_frame_fields(self, field_mapping, view=None):
@@ -1677,6 +1682,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             fofr.Frame._purge_fields(self._frame_collection_name, fields)
 
         fofr.Frame._reload_docs(self._frame_collection_name)
+        self._mark_modified()
         self._reload()
 
     def clone_sample_field(self, field_name, new_field_name):
@@ -1738,6 +1744,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         self._sample_doc_cls._clone_fields(sample_collection, paths, new_paths)
 
         fos.Sample._reload_docs(self._sample_collection_name)
+        self._mark_modified()
         self._reload()
 
     def _clone_frame_fields(self, field_mapping, view=None):
@@ -1751,6 +1758,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         self._frame_doc_cls._clone_fields(sample_collection, paths, new_paths)
 
         fofr.Frame._reload_docs(self._frame_collection_name)
+        self._mark_modified()
         self._reload()
 
     def clear_sample_field(self, field_name):
@@ -1822,6 +1830,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         self._sample_doc_cls._clear_fields(sample_collection, field_names)
 
         fos.Sample._reload_docs(self._sample_collection_name)
+        self._mark_modified()
 
     def _clear_frame_fields(self, field_names, view=None):
         sample_collection = self if view is None else view
@@ -1834,6 +1843,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         self._frame_doc_cls._clear_fields(sample_collection, field_names)
 
         fofr.Frame._reload_docs(self._frame_collection_name)
+        self._mark_modified()
 
     def delete_sample_field(self, field_name, error_level=0):
         """Deletes the field from all samples in the dataset.
@@ -1978,6 +1988,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         if embedded_fields:
             fos.Sample._reload_docs(self._sample_collection_name)
 
+        self._mark_modified()
         self._reload()
 
     def _remove_dynamic_sample_fields(self, field_names, error_level):
@@ -2011,6 +2022,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         if embedded_fields:
             fofr.Frame._reload_docs(self._frame_collection_name)
 
+        self._mark_modified()
         self._reload()
 
     def _remove_dynamic_frame_fields(self, field_names, error_level):
@@ -2123,7 +2135,14 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
 
         self.save()
 
-    def iter_samples(self, progress=False, autosave=False, batch_size=None):
+    def iter_samples(
+        self,
+        progress=False,
+        autosave=False,
+        batch_size=None,
+        prefetch=None,
+        frames=None,
+    ):
         """Returns an iterator over the samples in the dataset.
 
         Examples::
@@ -2164,12 +2183,32 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             batch_size (None): a batch size to use when autosaving samples. Can
                 either be an integer specifying the number of samples to save
                 in a batch, or a float number of seconds between batched saves
+            prefetch (None): an optional number of samples to load on a
+                background thread ahead of the sample currently being
+                processed, which overlaps database reads with the work done
+                in your loop
+            frames (None): an optional strategy for loading the frames of
+                video samples. Supported values are:
+
+                -   ``None``: each sample's frames are loaded from the
+                    database when they are first accessed
+                -   ``"batched"``: the frames of batches of samples are loaded
+                    via a single database query as the samples are loaded
 
         Returns:
             an iterator over :class:`fiftyone.core.sample.Sample` instances
         """
+        samples = self._iter_samples()
+
+        if frames == "batched":
+            if self._contains_videos():
+                samples = fofr._iter_samples_with_frames(samples)
+        elif frames is not None:
+            raise ValueError("Unsupported frames strategy '%s'" % frames)
+
         with contextlib.ExitStack() as exit_context:
-            samples = self._iter_samples()
+            samples = fou.iter_prefetch(samples, prefetch)
+            exit_context.callback(samples.close)
 
             if progress:
                 pb = fou.ProgressBar(total=len(self))
@@ -2220,6 +2259,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         progress=False,
         autosave=False,
         batch_size=None,
+        prefetch=None,
     ):
         """Returns an iterator over the groups in the dataset.
 
@@ -2265,6 +2305,10 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             batch_size (None): a batch size to use when autosaving samples. Can
                 either be an integer specifying the number of samples to save
                 in a batch, or a float number of seconds between batched saves
+            prefetch (None): an optional number of groups to load on a
+                background thread ahead of the group currently being
+                processed, which overlaps database reads with the work done
+                in your loop
 
         Returns:
             an iterator that emits dicts mapping group slice names to
@@ -2274,7 +2318,10 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             raise ValueError("%s does not contain groups" % type(self))
 
         with contextlib.ExitStack() as exit_context:
-            groups = self._iter_groups(group_slices=group_slices)
+            groups = fou.iter_prefetch(
+                self._iter_groups(group_slices=group_slices), prefetch
+            )
+            exit_context.callback(groups.close)
 
             if progress:
                 pb = fou.ProgressBar(total=len(self))
@@ -2434,6 +2481,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         dynamic=False,
         validate=True,
         num_samples=None,
+        num_workers=None,
     ):
         """Adds the given samples to the dataset.
 
@@ -2455,6 +2503,10 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             num_samples (None): the number of samples in ``samples``. If not
                 provided, this is computed via ``len(samples)``, if possible.
                 This value is optional and is used only for progress tracking
+            num_workers (None): an optional number of worker threads to use to
+                validate and serialize batches of samples while previous
+                batches are being inserted into the database. By default, all
+                work is performed serially in the calling thread
 
         Returns:
             a list of IDs of the samples in the dataset
@@ -2476,6 +2528,11 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             total=num_samples,
         )
 
+        if num_workers is not None and num_workers > 0:
+            return self._add_samples_pipelined(
+                batcher, expand_schema, dynamic, validate, num_workers
+            )
+
         sample_ids = []
         with batcher:
             for batch in batcher:
@@ -2534,6 +2591,74 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         return self.skip(num_samples).values("id")
 
     def _add_samples_batch(self, samples, expand_schema, dynamic, validate):
+        samples = self._prepare_samples_batch(samples, expand_schema, dynamic)
+        dicts = self._serialize_samples_batch(samples, validate)
+        self._insert_sample_dicts(dicts)
+        return self._finalize_samples_batch(samples, dicts)
+
+    def _add_samples_pipelined(
+        self, batcher, expand_schema, dynamic, validate, num_workers
+    ):
+        # Schema expansion must happen serially in this thread, in order. Each
+        # batch is then validated against a snapshot of the schema and
+        # serialized by the worker pool, and the resulting dicts are inserted
+        # by a single writer thread, in order, so that insertion order matches
+        # the serial implementation
+        abort = threading.Event()
+        max_pending = 2 * num_workers
+
+        def _insert(result):
+            if abort.is_set():
+                return None
+
+            try:
+                dicts = result.get()
+                self._insert_sample_dicts(dicts)
+            except:
+                abort.set()
+                raise
+
+            return dicts
+
+        sample_ids = []
+        pending = deque()
+
+        def _finalize():
+            samples, result = pending.popleft()
+            dicts = result.get()
+            sample_ids.extend(self._finalize_samples_batch(samples, dicts))
+
+        with ThreadPool(processes=num_workers) as pool:
+            with ThreadPool(processes=1) as writer:
+                try:
+                    with batcher:
+                        for batch in batcher:
+                            samples = self._prepare_samples_batch(
+                                batch, expand_schema, dynamic
+                            )
+                            schema = self.get_field_schema(
+                                include_private=True
+                            )
+                            result = pool.apply_async(
+                                self._serialize_samples_batch,
+                                (samples, validate),
+                                dict(schema=schema),
+                            )
+                            result = writer.apply_async(_insert, (result,))
+                            pending.append((samples, result))
+
+                            while len(pending) > max_pending:
+                                _finalize()
+
+                        while pending:
+                            _finalize()
+                except:
+                    abort.set()
+                    raise
+
+        return sample_ids
+
+    def _prepare_samples_batch(self, samples, expand_schema, dynamic):
         samples = [s.copy() if s._in_db else s for s in samples]
 
         if self.media_type is None and samples:
@@ -2542,18 +2667,25 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         if expand_schema:
             self._expand_schema(samples, dynamic)
 
+        return samples
+
+    def _serialize_samples_batch(self, samples, validate, schema=None):
         if validate:
-            self._validate_samples(samples)
+            self._validate_samples(samples, schema=schema)
 
-        dicts = [self._make_dict(sample) for sample in samples]
+        return [self._make_dict(sample) for sample in samples]
 
+    def _insert_sample_dicts(self, dicts):
         try:
             # adds `_id` to each dict
             self._sample_collection.insert_many(dicts)
         except BulkWriteError as bwe:
             msg = bwe.details["writeErrors"][0]["errmsg"]
             raise ValueError(msg) from bwe
+        finally:
+            self._mark_modified()
 
+    def _finalize_samples_batch(self, samples, dicts):
         for sample, d in zip(samples, dicts):
             doc = self._sample_dict_to_doc(d)
             sample._set_backing_doc(doc, dataset=self)
@@ -2615,6 +2747,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
                 ops.append(InsertOne(d))  # adds `_id` to dict
 
         foo.bulk_write(ops, self._sample_collection, ordered=False)
+        self._mark_modified()
 
         for sample, d in zip(samples, dicts):
             doc = self._sample_dict_to_doc(d)
@@ -2642,6 +2775,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             coll = self._sample_collection
 
         foo.bulk_write(ops, coll, ordered=ordered)
+        self._mark_modified()
 
         if frames:
             fofr.Frame._reload_docs(self._frame_collection_name)
@@ -3089,6 +3223,8 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             foo.bulk_write(frame_ops, self._frame_collection)
             fofr.Frame._reload_docs(self._frame_collection_name)
 
+        self._mark_modified()
+
     def _delete_labels(self, labels, fields=None):
         if etau.is_str(fields):
             fields = [fields]
@@ -3215,6 +3351,9 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
                 self._frame_collection_name, sample_ids=sample_ids
             )
 
+        if sample_ops or frame_ops:
+            self._mark_modified()
+
     @deprecated(reason="Use delete_samples() instead")
     def remove_sample(self, sample_or_id):
         """Removes the given sample from the dataset.
@@ -3616,6 +3755,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         fos.Sample._reset_docs(
             self._sample_collection_name, sample_ids=sample_ids
         )
+        self._mark_modified()
 
         if contains_videos:
             self._clear_frames(sample_ids=sample_ids)
@@ -3705,6 +3845,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             fofr.Frame._reset_docs_by_frame_id(
                 self._frame_collection_name, frame_ids
             )
+            self._mark_modified()
             return
 
         if view is not None:
@@ -3722,6 +3863,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         fofr.Frame._reset_docs(
             self._frame_collection_name, sample_ids=sample_ids
         )
+        self._mark_modified()
 
     def _keep_frames(self, view=None, frame_ids=None):
         sample_collection = view if view is not None else self
@@ -3746,6 +3888,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             fofr.Frame._reset_docs_by_frame_id(
                 self._frame_collection_name, frame_ids, keep=True
             )
+            self._mark_modified()
             return
 
         if view is None:
@@ -3776,6 +3919,8 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
                 self._frame_collection_name, sample_id, fns, keep=True
             )
 
+        self._mark_modified()
+
     def ensure_frames(self):
         """Ensures that the video dataset contains frame instances for every
         frame of each sample's source video.
@@ -3826,6 +3971,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
                 },
             ]
         )
+        self._mark_modified()
 
     def delete(self):
         """Deletes the dataset.
@@ -6217,8 +6363,9 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
 
             return self._frame_doc_cls.from_dict(d, extended=False)
 
-    def _validate_samples(self, samples):
-        schema = self.get_field_schema(include_private=True)
+    def _validate_samples(self, samples, schema=None):
+        if schema is None:
+            schema = self.get_field_schema(include_private=True)
 
         for sample in samples:
             if (
@@ -6305,8 +6452,41 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         self._annotation_cache.clear()
         self._brain_cache.clear()
         self._evaluation_cache.clear()
+        self._aggregation_cache.clear()
+
+    def get_aggregation_cache_stats(self):
+        """Returns statistics about the dataset's aggregation cache.
+
+        Aggregation results are only cached when
+        ``fo.config.aggregation_cache_size`` is positive.
+
+        Examples::
+
+            import fiftyone as fo
+            import fiftyone.zoo as foz
+
+            fo.config.aggregation_cache_size = 128
+
+            dataset = foz.load_zoo_dataset("quickstart")
+
+            dataset.count_values("ground_truth.detections.label")
+            dataset.count_values("ground_truth.detections.label")
+
+            print(dataset.get_aggregation_cache_stats())
+
+        Returns:
+            a dict containing the number of cache ``hits`` and ``misses``, the
+            current ``size`` and ``max_size`` of the cache, and the dataset's
+            ``modification_count``
+        """
+        return self._aggregation_cache.stats()
+
+    def _mark_modified(self):
+        self._aggregation_cache.mark_modified()
 
     def _reload(self, hard=False):
+        self._mark_modified()
+
         if not hard:
             self._doc.reload()
             return
@@ -6887,6 +7067,8 @@ def _save_view(view, fields=None):
     # Reload in-memory documents
     #
 
+    dataset._mark_modified()
+
     if save_samples:
         fos.Sample._reload_docs(
             dataset._sample_collection_name, sample_ids=sample_ids
@@ -7229,6 +7411,7 @@ def _add_collection_with_new_ids(
                 },
             ],
         )
+        dataset._mark_modified()
 
         return
 
@@ -7741,6 +7924,7 @@ def _merge_samples_pipeline(
             dst_dataset._frame_collection.update_many({}, cleanup_op)
 
     # Reload docs
+    dst_dataset._mark_modified()
     fos.Sample._reload_docs(dst_dataset._sample_collection_name)
     if contains_videos:
         fofr.Frame._reload_docs(dst_dataset._frame_collection_name)
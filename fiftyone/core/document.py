@@ -435,7 +435,12 @@ class _Document(object):
                 "Cannot save a document that has not been added to a dataset"
             )
 
-        return self._doc._save(deferred=deferred)
+        ops = self._doc._save(deferred=deferred)
+
+        if not deferred:
+            self._dataset._mark_modified()
+
+        return ops
 
     def _parse_fields(self, fields=None, omit_fields=None):
         if fields is None:
@@ -826,11 +831,16 @@ class DocumentView(_Document):
         self._reload_parents()
 
     def _save(self, deferred=False):
-        return self._doc._save(
+        ops = self._doc._save(
             deferred=deferred,
             filtered_fields=self._filtered_fields,
         )
 
+        if not deferred:
+            self._dataset._mark_modified()
+
+        return ops
+
     def _reload_parents(self):
         if issubclass(type(self._DOCUMENT_CLS), DocumentSingleton):
             self._DOCUMENT_CLS._reload_instance(self)
@@ -7,6 +7,8 @@ Video frames.
 """
 import itertools
 
+from collections import defaultdict
+
 from bson import ObjectId
 from pymongo import ReplaceOne, UpdateOne, DeleteOne, DeleteMany
 
@@ -19,6 +21,11 @@ import fiftyone.core.utils as fou
 fov = fou.lazy_import("fiftyone.core.view")
 
 
+# The number of samples whose frames are loaded per batch by
+# :func:`_iter_samples_with_frames`
+_FRAMES_BATCH_SIZE = 20
+
+
 def get_default_frame_fields(include_private=False, use_db_fields=False):
     """Returns the default fields present on all frames.
 
@@ -60,6 +67,7 @@ class Frames(object):
         self._replacements = {}
         self._delete_frames = set()
         self._delete_all = False
+        self._frames_db = None
 
     def __str__(self):
         return "<%s: %s>" % (self.__class__.__name__, fou.pformat(dict(self)))
@@ -90,7 +98,7 @@ class Frames(object):
         if self._delete_all or frame_number in self._delete_frames:
             d = None
         else:
-            d = self._get_frame_db(frame_number)
+            d = self._get_cached_frame_db(frame_number)
 
         if d is None:
             # Empty frame
@@ -475,8 +483,14 @@ class Frames(object):
                 "a dataset"
             )
 
+        self._frames_db = None
+
         delete_ops = self._save_deletions(deferred=deferred)
         replace_ops = self._save_replacements(deferred=deferred)
+
+        if not deferred:
+            self._dataset._mark_modified()
+
         return delete_ops + replace_ops
 
     def reload(self, hard=False):
@@ -490,6 +504,7 @@ class Frames(object):
         self._delete_all = False
         self._delete_frames.clear()
         self._replacements.clear()
+        self._frames_db = None
 
         Frame._sync_docs_for_sample(
             self._frame_collection_name,
@@ -504,7 +519,7 @@ class Frames(object):
         if not self._in_db or self._delete_all:
             return frame_numbers
 
-        frame_numbers |= self._get_frame_numbers_db()
+        frame_numbers |= self._get_cached_frame_numbers_db()
         frame_numbers -= self._delete_frames
 
         return frame_numbers
@@ -531,6 +546,32 @@ class Frames(object):
 
         return {"$match": {"_sample_id": self._sample_id}}
 
+    def _get_cached_frame_numbers_db(self):
+        if self._frames_db is not None:
+            return set(self._frames_db.keys())
+
+        return self._get_frame_numbers_db()
+
+    def _get_cached_frame_db(self, frame_number):
+        if self._frames_db is not None:
+            return self._frames_db.get(frame_number, None)
+
+        return self._get_frame_db(frame_number)
+
+    def _iter_cached_frames_db(self):
+        if self._frames_db is not None:
+            return iter(self._frames_db.values())
+
+        return self._iter_frames_db()
+
+    def _set_frames_db(self, docs):
+        if self._dataset._is_clips:
+            first, last = self._sample.support
+            docs = [d for d in docs if first <= d["frame_number"] <= last]
+
+        docs = sorted(docs, key=lambda d: d["frame_number"])
+        self._frames_db = {d["frame_number"]: d for d in docs}
+
     def _get_frame_numbers_db(self):
         pipeline = [
             self._get_frames_match_stage(),
@@ -574,33 +615,29 @@ class Frames(object):
 
             return
 
-        if self._replacements:
-            max_repl_fn = max(self._replacements.keys())
-            repl_done = False
-        else:
-            max_repl_fn = -1
-            repl_done = True
-
-        results = self._iter_frames_db()
+        # Merge the sorted in-memory and database frame numbers so that the
+        # cost is proportional to the number of frames, not the frame range
+        repl_fns = sorted(self._replacements.keys())
+        num_repl = len(repl_fns)
+        repl_idx = 0
 
-        try:
-            d = next(results)
-            db_done = False
-        except StopIteration:
-            d = None
-            db_done = True
+        results = self._iter_cached_frames_db()
+        d = next(results, None)
 
-        frame_number = 1
-        while True:
-            if repl_done and db_done:
-                break
+        while repl_idx < num_repl or d is not None:
+            if d is None or (
+                repl_idx < num_repl and repl_fns[repl_idx] <= d["frame_number"]
+            ):
+                frame_number = repl_fns[repl_idx]
+            else:
+                frame_number = d["frame_number"]
 
             if frame_number >= offset:
-                if not repl_done and frame_number in self._replacements:
+                if frame_number in self._replacements:
                     yield self._replacements[frame_number]
 
                 elif (
-                    not db_done
+                    d is not None
                     and frame_number == d["frame_number"]
                     and frame_number not in self._delete_frames
                 ):
@@ -609,18 +646,11 @@ class Frames(object):
 
                     yield frame
 
-            frame_number += 1
-
-            if not repl_done:
-                repl_done = max_repl_fn < frame_number
+            while repl_idx < num_repl and repl_fns[repl_idx] <= frame_number:
+                repl_idx += 1
 
-            if not db_done:
-                while d["frame_number"] < frame_number:
-                    try:
-                        d = next(results)
-                    except StopIteration:
-                        db_done = True
-                        break
+            while d is not None and d["frame_number"] <= frame_number:
+                d = next(results, None)
 
     def _iter_frames_db(self):
         pipeline = [
@@ -908,6 +938,7 @@ class FramesView(Frames):
         self._delete_all = False
         self._delete_frames.clear()
         self._replacements.clear()
+        self._frames_db = None
 
     def _get_frame_numbers_db(self):
         if not self._needs_frames:
@@ -1029,6 +1060,61 @@ class FramesView(Frames):
         )
 
 
+def _iter_samples_with_frames(samples, batch_size=None):
+    """Wraps the given iterator of video samples so that the frames of each
+    batch of samples are loaded from the database via a single query, rather
+    than a separate query per sample.
+
+    Args:
+        samples: an iterator of :class:`fiftyone.core.sample.Sample` or
+            :class:`fiftyone.core.sample.SampleView` instances from the same
+            collection
+        batch_size (None): the number of samples whose frames to load at a
+            time. By default, ``_FRAMES_BATCH_SIZE`` is used
+
+    Returns:
+        a generator that emits the samples
+    """
+    if batch_size is None:
+        batch_size = _FRAMES_BATCH_SIZE
+
+    for batch in fou.iter_batches(samples, batch_size):
+        _load_frames(batch)
+        for sample in batch:
+            yield sample
+
+
+def _load_frames(samples):
+    frames_list = [
+        sample._frames
+        for sample in samples
+        if sample._frames is not None and sample._in_db
+    ]
+
+    if not frames_list:
+        return
+
+    frames = frames_list[0]
+
+    if isinstance(frames, FramesView) and frames._needs_frames:
+        sample_ids = [f._sample.id for f in frames_list]
+        view = fov.make_optimized_select_view(frames._view, sample_ids)
+        pipeline = view._pipeline(frames_only=True)
+        coll = frames._sample_collection
+    else:
+        sample_ids = list(set(f._sample_id for f in frames_list))
+        pipeline = [{"$match": {"_sample_id": {"$in": sample_ids}}}]
+        coll = frames._frame_collection
+
+    docs_map = defaultdict(dict)
+    for d in foo.aggregate(coll, pipeline):
+        # Clips may share frames with other clips of the same video
+        docs_map[d["_sample_id"]][d["frame_number"]] = d
+
+    for f in frames_list:
+        f._set_frames_db(docs_map[f._sample_id].values())
+
+
 class Frame(Document, metaclass=FrameSingleton):
     """A frame in a video :class:`fiftyone.core.sample.Sample`.
 
@@ -0,0 +1,226 @@
+"""
+Caching of datasets generated from sample collections.
+
+| Copyright 2017-2023, Voxel51, Inc.
+| `voxel51.com <https://voxel51.com/>`_
+|
+"""
+import logging
+import os
+
+from bson import json_util, ObjectId
+
+import fiftyone.core.dataset as fod
+import fiftyone.core.utils as fou
+
+
+logger = logging.getLogger(__name__)
+
+
+class GeneratedDatasetCache(object):
+    """An in-memory cache of datasets generated from sample collections, such
+    as patches and frames datasets.
+
+    Cached datasets are keyed by their source collection, generation
+    parameters, and name. When a cached dataset is reused, the source samples
+    that have changed since it was last synced are detected via per-sample
+    fingerprints so that only their contents need to be regenerated.
+
+    The fingerprint scan is skipped entirely if the source datasets have not
+    been modified by the current process since the last sync. Note that
+    modifications made by other processes are therefore only detected once
+    the current process has also modified the source datasets.
+
+    Args:
+        batch_size: the maximum number of changed samples to regenerate at a
+            time
+    """
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self._entries = {}
+
+    def get_key(self, sample_collection, schema, name=None, **kwargs):
+        """Returns the cache key for a dataset generated from the given
+        collection.
+
+        Args:
+            sample_collection: the source
+                :class:`fiftyone.core.collections.SampleCollection`
+            schema: the source field schema on which the generated dataset
+                depends
+            name (None): the name of the generated dataset, if any
+            **kwargs: the parameters used to generate the dataset
+
+        Returns:
+            a cache key
+        """
+        key = {
+            "dataset": sample_collection._root_dataset.name,
+            "stages": sample_collection.view()._serialize(include_uuids=False),
+            "schema": sorted(schema.keys()),
+            "name": name,
+        }
+        key.update(kwargs)
+
+        return json_util.dumps(key, sort_keys=True)
+
+    def load(self, key):
+        """Loads the cached dataset with the given key, if possible.
+
+        Args:
+            key: a key returned by :meth:`get_key`
+
+        Returns:
+            a ``(dataset, entry)`` tuple, or ``(None, None)`` if no reusable
+            dataset is cached
+        """
+        entry = self._entries.get(key, None)
+        if entry is None:
+            return None, None
+
+        if not fod.dataset_exists(entry["name"]):
+            self._entries.pop(key)
+            return None, None
+
+        dataset = fod.load_dataset(entry["name"])
+
+        # The dataset's schema was modified directly, so we can't reuse it
+        if set(dataset.get_field_schema().keys()) != entry["schema"]:
+            self._entries.pop(key)
+            return None, None
+
+        return dataset, entry
+
+    def add(self, key, dataset, sample_collection, fingerprint_fcn, **kwargs):
+        """Adds a freshly generated dataset to the cache.
+
+        Args:
+            key: a key returned by :meth:`get_key`
+            dataset: the generated :class:`fiftyone.core.dataset.Dataset`
+            sample_collection: the source
+                :class:`fiftyone.core.collections.SampleCollection`
+            fingerprint_fcn: a function that accepts a sample collection and
+                returns a dict mapping source IDs to fingerprints of the
+                contents on which the generated dataset depends
+            **kwargs: additional information to store in the cache entry
+
+        Returns:
+            the cache entry
+        """
+        entry = {
+            "name": dataset.name,
+            "schema": set(dataset.get_field_schema().keys()),
+            "fingerprint_fcn": fingerprint_fcn,
+            "fingerprints": fingerprint_fcn(sample_collection),
+            "state": _get_modification_state(sample_collection),
+        }
+        entry.update(kwargs)
+
+        self._entries[key] = entry
+
+        return entry
+
+    def iter_changed_samples(
+        self, dataset, sample_collection, entry, id_path, src_id_path="_id"
+    ):
+        """Deletes the contents of the cached dataset that were generated from
+        source samples that have changed or been deleted, and yields batches
+        of changed source samples whose contents must be regenerated.
+
+        Args:
+            dataset: the cached :class:`fiftyone.core.dataset.Dataset`
+            sample_collection: the source
+                :class:`fiftyone.core.collections.SampleCollection`
+            entry: the cache entry returned by :meth:`load`
+            id_path: the path in ``dataset`` that stores source IDs
+            src_id_path ("_id"): the path in ``sample_collection`` by which
+                fingerprints are keyed
+
+        Returns:
+            a generator that emits views into ``sample_collection``
+        """
+        if _get_modification_state(sample_collection) == entry["state"]:
+            return
+
+        fingerprint_fcn = entry["fingerprint_fcn"]
+        prev_fingerprints = entry["fingerprints"]
+        fingerprints = fingerprint_fcn(sample_collection)
+
+        changed_ids = [
+            _id
+            for _id, fingerprint in fingerprints.items()
+            if prev_fingerprints.get(_id, None) != fingerprint
+        ]
+        deleted_ids = [
+            _id for _id in prev_fingerprints if _id not in fingerprints
+        ]
+
+        logger.debug(
+            "Updating dataset '%s' for %d changed and %d deleted samples",
+            dataset.name,
+            len(changed_ids),
+            len(deleted_ids),
+        )
+
+        for batch_ids in fou.iter_batches(deleted_ids, self.batch_size):
+            _delete_samples(dataset, id_path, batch_ids)
+
+        for batch_ids in fou.iter_batches(changed_ids, self.batch_size):
+            _delete_samples(dataset, id_path, batch_ids)
+
+            oids = [ObjectId(_id) for _id in batch_ids]
+            samples = sample_collection.mongo(
+                [{"$match": {src_id_path: {"$in": oids}}}]
+            )
+
+            state = _get_modification_state(sample_collection)
+
+            yield samples
+
+            # Regenerating may have written to the source samples
+            if _get_modification_state(sample_collection) != state:
+                fingerprints.update(fingerprint_fcn(samples))
+
+        entry["fingerprints"] = fingerprints
+        entry["state"] = _get_modification_state(sample_collection)
+
+
+def use_cache(cache):
+    """Returns whether a generated dataset should be cached.
+
+    Caching is never used by the App server, since the source datasets of its
+    views are typically modified by other processes, whose modifications the
+    cache cannot detect.
+
+    Args:
+        cache: whether caching was requested
+
+    Returns:
+        True/False
+    """
+    if os.environ.get("FIFTYONE_SERVER", None):
+        return False
+
+    return bool(cache)
+
+
+def _get_modification_state(sample_collection):
+    # Generated datasets such as clips share their frames with the root
+    # dataset, so modifications to either may affect the collection
+    datasets = [sample_collection._dataset]
+    if sample_collection._root_dataset is not datasets[0]:
+        datasets.append(sample_collection._root_dataset)
+
+    state = []
+    for dataset in datasets:
+        cache = dataset._aggregation_cache
+        state.append((cache, cache.modification_count))
+
+    return state
+
+
+def _delete_samples(dataset, id_path, ids):
+    oids = [ObjectId(_id) for _id in ids]
+    view = dataset.mongo([{"$match": {id_path: {"$in": oids}}}])
+    dataset._clear(view=view)
@@ -11,7 +11,9 @@ import multiprocessing
 import os
 import requests
 
+from bson import ObjectId
 from PIL import Image
+from pymongo import UpdateOne
 
 import eta.core.utils as etau
 import eta.core.video as etav
@@ -19,8 +21,11 @@ import eta.core.video as etav
 from fiftyone.core.odm import DynamicEmbeddedDocument
 import fiftyone.core.fields as fof
 import fiftyone.core.media as fom
+import fiftyone.core.odm as foo
 import fiftyone.core.utils as fou
 
+fos = fou.lazy_import("fiftyone.core.sample")
+
 
 logger = logging.getLogger(__name__)
 
@@ -290,20 +295,40 @@ def get_image_info(f):
 
 
 def _compute_metadata(sample_collection, overwrite=False):
-    if not overwrite:
-        sample_collection = sample_collection.exists("metadata", False)
+    inputs = _get_metadata_inputs(sample_collection, overwrite=overwrite)
+    num_samples = len(inputs)
 
-    num_samples = len(sample_collection)
     if num_samples == 0:
         return
 
     logger.info("Computing metadata...")
     with fou.ProgressBar(total=num_samples) as pb:
-        for sample in pb(sample_collection.select_fields()):
-            compute_sample_metadata(sample, skip_failures=True)
+        with _MetadataWriter(sample_collection) as writer:
+            for args in pb(inputs):
+                sample_id, metadata = _do_compute_metadata(args)
+                writer.write(sample_id, metadata)
 
 
 def _compute_metadata_multi(sample_collection, num_workers, overwrite=False):
+    inputs = _get_metadata_inputs(sample_collection, overwrite=overwrite)
+    num_samples = len(inputs)
+
+    if num_samples == 0:
+        return
+
+    logger.info("Computing metadata...")
+    with fou.ProgressBar(total=num_samples) as pb:
+        with _MetadataWriter(sample_collection) as writer:
+            with fou.get_multiprocessing_context().Pool(
+                processes=num_workers
+            ) as pool:
+                for sample_id, metadata in pb(
+                    pool.imap_unordered(_do_compute_metadata, inputs)
+                ):
+                    writer.write(sample_id, metadata)
+
+
+def _get_metadata_inputs(sample_collection, overwrite=False):
     if not overwrite:
         sample_collection = sample_collection.exists("metadata", False)
 
@@ -312,25 +337,81 @@ def _compute_metadata_multi(sample_collection, num_workers, overwrite=False):
         _allow_missing=True,
     )
 
-    inputs = list(zip(ids, filepaths, media_types))
-    num_samples = len(inputs)
+    return list(zip(ids, filepaths, media_types))
 
-    if num_samples == 0:
-        return
 
-    logger.info("Computing metadata...")
+class _MetadataWriter(object):
+    """Context that writes computed metadata to the database in batched
+    ``bulk_write()`` calls rather than saving each sample individually.
 
-    view = sample_collection.select_fields()
-    with fou.ProgressBar(total=num_samples) as pb:
-        with fou.get_multiprocessing_context().Pool(
-            processes=num_workers
-        ) as pool:
-            for sample_id, metadata in pb(
-                pool.imap_unordered(_do_compute_metadata, inputs)
-            ):
-                sample = view[sample_id]
-                sample.metadata = metadata
-                sample.save()
+    Generated collections (patches, frames, clips) must sync their edits back
+    to their source collection, so their samples are saved individually.
+
+    Args:
+        sample_collection: a
+            :class:`fiftyone.core.collections.SampleCollection`
+        batch_size (1000): the number of updates to write per batch
+    """
+
+    def __init__(self, sample_collection, batch_size=1000):
+        self._dataset = sample_collection._dataset
+        self.batch_size = batch_size
+
+        if sample_collection._is_generated:
+            self._view = sample_collection.select_fields()
+        else:
+            self._view = None
+
+        self._ops = []
+        self._ids = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self._write_batch()
+
+    def write(self, sample_id, metadata):
+        """Registers the metadata for the given sample for writing in the next
+        batch.
+
+        Args:
+            sample_id: the sample ID
+            metadata: a :class:`Metadata` instance, or None
+        """
+        if self._view is not None:
+            sample = self._view[sample_id]
+            sample.metadata = metadata
+            sample.save()
+            return
+
+        if metadata is not None:
+            metadata = metadata.to_dict()
+
+        self._ops.append(
+            UpdateOne(
+                {"_id": ObjectId(sample_id)}, {"$set": {"metadata": metadata}}
+            )
+        )
+        self._ids.append(sample_id)
+
+        if len(self._ops) >= self.batch_size:
+            self._write_batch()
+
+    def _write_batch(self):
+        if not self._ops:
+            return
+
+        foo.bulk_write(
+            self._ops, self._dataset._sample_collection, ordered=False
+        )
+        self._dataset._mark_modified()
+        fos.Sample._reload_docs(
+            self._dataset._sample_collection_name, sample_ids=self._ids
+        )
+
+        self._ops.clear()
+        self._ids.clear()
 
 
 def _do_compute_metadata(args):
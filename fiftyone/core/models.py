@@ -5,9 +5,13 @@ FiftyOne models.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+from collections import deque
 import contextlib
 import inspect
 import logging
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+import os
 
 import numpy as np
 
@@ -15,6 +19,7 @@ import eta.core.image as etai
 import eta.core.frameutils as etaf
 import eta.core.learning as etal
 import eta.core.models as etam
+import eta.core.serial as etas
 import eta.core.utils as etau
 import eta.core.video as etav
 import eta.core.web as etaw
@@ -43,6 +48,8 @@ _ALLOWED_PATCH_TYPES = (
     fol.Polyline,
     fol.Polylines,
 )
+_NUM_IMAGE_WORKERS = 4
+_IMAGE_PREFETCH_BATCHES = 2
 
 
 def apply_model(
@@ -84,7 +91,10 @@ def apply_model(
         batch_size (None): an optional batch size to use, if the model supports
             batching
         num_workers (None): the number of workers to use when loading images.
-            Only applicable for Torch-based models
+            Only applicable to image collections. Torch-based models use a
+            DataLoader with this many workers, and other models decode the
+            images of upcoming batches in this many background threads
+            (up to 4 by default, or none if ``num_workers=0``)
         skip_failures (True): whether to gracefully continue without raising an
             error if predictions cannot be generated for a sample. Only
             applicable to :class:`Model` instances
@@ -152,9 +162,10 @@ def apply_model(
         isinstance(model, TorchModelMixin) and samples.media_type == fom.IMAGE
     )
 
-    if num_workers is not None and not use_data_loader:
+    if num_workers is not None and samples.media_type != fom.IMAGE:
         logger.warning(
-            "Ignoring `num_workers` parameter; only supported for Torch models"
+            "Ignoring `num_workers` parameter; only supported for image "
+            "collections"
         )
 
     if output_dir is not None:
@@ -243,10 +254,17 @@ def apply_model(
                 label_field,
                 confidence_thresh,
                 batch_size,
+                num_workers,
                 skip_failures,
                 filename_maker,
             )
 
+        if num_workers is not None:
+            logger.warning(
+                "Ignoring `num_workers` parameter; only supported when "
+                "batching"
+            )
+
         return _apply_image_model_single(
             samples,
             model,
@@ -277,8 +295,11 @@ def _apply_image_model_single(
     filename_maker,
 ):
     samples = samples.select_fields()
+    context = samples.save_context(
+        async_writes=True, skip_failures=skip_failures
+    )
 
-    with fou.ProgressBar() as pb:
+    with fou.ProgressBar() as pb, context:
         for sample in pb(samples):
             try:
                 img = etai.read(sample.filepath)
@@ -292,7 +313,7 @@ def _apply_image_model_single(
                     label_field=label_field,
                     confidence_thresh=confidence_thresh,
                 )
-                sample.save()
+                context.save(sample)
             except Exception as e:
                 if not skip_failures:
                     raise e
@@ -306,16 +327,24 @@ def _apply_image_model_batch(
     label_field,
     confidence_thresh,
     batch_size,
+    num_workers,
     skip_failures,
     filename_maker,
 ):
     samples = samples.select_fields()
     samples_loader = fou.iter_batches(samples, batch_size)
+    images_loader = _iter_image_batches(samples_loader, num_workers)
 
-    with fou.ProgressBar(samples) as pb:
-        for sample_batch in samples_loader:
+    context = samples.save_context(
+        async_writes=True, skip_failures=skip_failures
+    )
+
+    with fou.ProgressBar(samples) as pb, context:
+        for sample_batch, imgs in images_loader:
             try:
-                imgs = [etai.read(sample.filepath) for sample in sample_batch]
+                if isinstance(imgs, Exception):
+                    raise imgs
+
                 labels_batch = model.predict_all(imgs)
 
                 for sample, labels in zip(sample_batch, labels_batch):
@@ -327,7 +356,7 @@ def _apply_image_model_batch(
                         label_field=label_field,
                         confidence_thresh=confidence_thresh,
                     )
-                    sample.save()
+                    context.save(sample)
 
             except Exception as e:
                 if not skip_failures:
@@ -359,7 +388,11 @@ def _apply_image_model_data_loader(
         samples, model, batch_size, num_workers, skip_failures
     )
 
-    with fou.ProgressBar(samples) as pb:
+    context = samples.save_context(
+        async_writes=True, skip_failures=skip_failures
+    )
+
+    with fou.ProgressBar(samples) as pb, context:
         for sample_batch, imgs in zip(samples_loader, data_loader):
             try:
                 if isinstance(imgs, Exception):
@@ -376,7 +409,7 @@ def _apply_image_model_data_loader(
                         label_field=label_field,
                         confidence_thresh=confidence_thresh,
                     )
-                    sample.save()
+                    context.save(sample)
 
             except Exception as e:
                 if not skip_failures:
@@ -587,6 +620,52 @@ def _iter_batches(video_reader, batch_size):
         yield frame_numbers, imgs
 
 
+def _iter_image_batches(samples_loader, num_workers):
+    # Framework-agnostic analogue of `_make_data_loader()`: decodes the images
+    # of the next `_IMAGE_PREFETCH_BATCHES` batches in a thread pool while the
+    # current batch is being processed. Emits `(sample_batch, imgs)` tuples,
+    # where `imgs` is the exception that occurred if a batch failed to load
+    if num_workers is None:
+        num_workers = min(_NUM_IMAGE_WORKERS, multiprocessing.cpu_count())
+
+    if num_workers <= 0:
+        for sample_batch in samples_loader:
+            yield sample_batch, _load_image_batch(sample_batch)
+
+        return
+
+    pending = deque()
+    with ThreadPool(processes=num_workers) as pool:
+        for sample_batch in samples_loader:
+            results = [
+                pool.apply_async(etai.read, (sample.filepath,))
+                for sample in sample_batch
+            ]
+            pending.append((sample_batch, results))
+
+            if len(pending) > _IMAGE_PREFETCH_BATCHES:
+                sample_batch, results = pending.popleft()
+                yield sample_batch, _get_image_batch(results)
+
+        while pending:
+            sample_batch, results = pending.popleft()
+            yield sample_batch, _get_image_batch(results)
+
+
+def _get_image_batch(results):
+    try:
+        return [result.get() for result in results]
+    except Exception as e:
+        return e
+
+
+def _load_image_batch(sample_batch):
+    try:
+        return [etai.read(sample.filepath) for sample in sample_batch]
+    except Exception as e:
+        return e
+
+
 def _make_data_loader(samples, model, batch_size, num_workers, skip_failures):
     # This function supports DataLoaders that emit numpy arrays that can
     # therefore be used for non-Torch models; but we do not currenly use this
@@ -672,6 +751,7 @@ def compute_embeddings(
     batch_size=None,
     num_workers=None,
     skip_failures=True,
+    embeddings_store=None,
     **kwargs,
 ):
     """Computes embeddings for the samples in the collection using the given
@@ -693,7 +773,9 @@ def compute_embeddings(
     embeddings, i.e., :meth:`Model.has_embeddings` must return ``True``.
 
     If an ``embeddings_field`` is provided, the embeddings are saved to the
-    samples; otherwise, the embeddings are returned in-memory.
+    samples. If an ``embeddings_store`` is provided, the embeddings are
+    streamed to an :class:`EmbeddingsStore` on disk. Otherwise, the embeddings
+    are returned in-memory.
 
     Args:
         samples: a :class:`fiftyone.core.collections.SampleCollection`
@@ -704,10 +786,16 @@ def compute_embeddings(
         batch_size (None): an optional batch size to use, if the model supports
             batching
         num_workers (None): the number of workers to use when loading images.
-            Only applicable for Torch-based models
+            Only applicable to image collections. Torch-based models use a
+            DataLoader with this many workers, and other models decode the
+            images of upcoming batches in this many background threads
+            (up to 4 by default, or none if ``num_workers=0``)
         skip_failures (True): whether to gracefully continue without raising an
             error if embeddings cannot be generated for a sample. Only
             applicable to :class:`Model` instances
+        embeddings_store (None): the path to a directory in which to write an
+            :class:`EmbeddingsStore` of the embeddings. Not applicable when
+            computing frame embeddings or using Lightning Flash models
         **kwargs: optional model-specific keyword arguments passed through
             to the underlying inference implementation
 
@@ -715,6 +803,7 @@ def compute_embeddings(
         one of the following:
 
         -   ``None``, if an ``embeddings_field`` is provided
+        -   an :class:`EmbeddingsStore`, if an ``embeddings_store`` is provided
         -   a ``num_samples x num_dim`` array of embeddings, when computing
             embeddings for image/video collections with image/video models,
             respectively, and no ``embeddings_field`` is provided. If
@@ -729,7 +818,19 @@ def compute_embeddings(
             contain arrays of embeddings for all frames 1, 2, ... until the
             error occurred, or ``None`` if no embeddings were computed at all
     """
+    if embeddings_field is not None and embeddings_store is not None:
+        raise ValueError(
+            "Only one of `embeddings_field` and `embeddings_store` may be "
+            "provided"
+        )
+
     if _is_flash_model(model):
+        if embeddings_store is not None:
+            raise ValueError(
+                "`embeddings_store` is not supported for Lightning Flash "
+                "models"
+            )
+
         return fouf.compute_flash_embeddings(
             samples,
             model,
@@ -775,9 +876,10 @@ def compute_embeddings(
         isinstance(model, TorchModelMixin) and samples.media_type == fom.IMAGE
     )
 
-    if num_workers is not None and not use_data_loader:
+    if num_workers is not None and samples.media_type != fom.IMAGE:
         logger.warning(
-            "Ignoring `num_workers` parameter; only supported for Torch models"
+            "Ignoring `num_workers` parameter; only supported for image "
+            "collections"
         )
 
     if embeddings_field is not None:
@@ -800,6 +902,16 @@ def compute_embeddings(
             if not dataset.has_sample_field(embeddings_field):
                 dataset.add_sample_field(embeddings_field, fof.VectorField)
 
+    if (
+        embeddings_store is not None
+        and samples.media_type == fom.VIDEO
+        and model.media_type == "image"
+    ):
+        raise ValueError(
+            "`embeddings_store` is not supported when computing frame "
+            "embeddings"
+        )
+
     with contextlib.ExitStack() as context:
         if use_data_loader:
             # pylint: disable=no-member
@@ -808,9 +920,18 @@ def compute_embeddings(
         # pylint: disable=no-member
         context.enter_context(model)
 
+        if embeddings_store is not None:
+            embeddings_store = context.enter_context(
+                _EmbeddingsStoreWriter(embeddings_store)
+            )
+
         if samples.media_type == fom.VIDEO and model.media_type == "video":
             return _compute_video_embeddings(
-                samples, model, embeddings_field, skip_failures
+                samples,
+                model,
+                embeddings_field,
+                embeddings_store,
+                skip_failures,
             )
 
         batch_size = _parse_batch_size(batch_size, model, use_data_loader)
@@ -830,6 +951,7 @@ def compute_embeddings(
                 samples,
                 model,
                 embeddings_field,
+                embeddings_store,
                 batch_size,
                 num_workers,
                 skip_failures,
@@ -837,16 +959,28 @@ def compute_embeddings(
 
         if batch_size is not None:
             return _compute_image_embeddings_batch(
-                samples, model, embeddings_field, batch_size, skip_failures
+                samples,
+                model,
+                embeddings_field,
+                embeddings_store,
+                batch_size,
+                num_workers,
+                skip_failures,
+            )
+
+        if num_workers is not None:
+            logger.warning(
+                "Ignoring `num_workers` parameter; only supported when "
+                "batching"
             )
 
         return _compute_image_embeddings_single(
-            samples, model, embeddings_field, skip_failures
+            samples, model, embeddings_field, embeddings_store, skip_failures
         )
 
 
 def _compute_image_embeddings_single(
-    samples, model, embeddings_field, skip_failures
+    samples, model, embeddings_field, embeddings_store, skip_failures
 ):
     samples = samples.select_fields()
     embeddings = []
@@ -870,12 +1004,18 @@ def _compute_image_embeddings_single(
             if embeddings_field is not None:
                 sample[embeddings_field] = embedding
                 sample.save()
+            elif embeddings_store is not None:
+                if embedding is not None:
+                    embeddings_store.add(sample.id, embedding)
             else:
                 embeddings.append(embedding)
 
     if embeddings_field is not None:
         return None
 
+    if embeddings_store is not None:
+        return embeddings_store.close()
+
     if errors:
         return embeddings  # may contain None, must return as list
 
@@ -883,20 +1023,29 @@ def _compute_image_embeddings_single(
 
 
 def _compute_image_embeddings_batch(
-    samples, model, embeddings_field, batch_size, skip_failures
+    samples,
+    model,
+    embeddings_field,
+    embeddings_store,
+    batch_size,
+    num_workers,
+    skip_failures,
 ):
     samples = samples.select_fields()
     samples_loader = fou.iter_batches(samples, batch_size)
+    images_loader = _iter_image_batches(samples_loader, num_workers)
 
     embeddings = []
     errors = False
 
     with fou.ProgressBar(samples) as pb:
-        for sample_batch in samples_loader:
+        for sample_batch, imgs in images_loader:
             embeddings_batch = [None] * len(sample_batch)
 
             try:
-                imgs = [etai.read(sample.filepath) for sample in sample_batch]
+                if isinstance(imgs, Exception):
+                    raise imgs
+
                 embeddings_batch = list(model.embed_all(imgs))  # list of 1D
             except Exception as e:
                 if not skip_failures:
@@ -914,6 +1063,12 @@ def _compute_image_embeddings_batch(
                 for sample, embedding in zip(sample_batch, embeddings_batch):
                     sample[embeddings_field] = embedding
                     sample.save()
+            elif embeddings_store is not None:
+                if embeddings_batch[0] is not None:
+                    embeddings_store.add_all(
+                        [sample.id for sample in sample_batch],
+                        embeddings_batch,
+                    )
             else:
                 embeddings.extend(embeddings_batch)
 
@@ -922,6 +1077,9 @@ def _compute_image_embeddings_batch(
     if embeddings_field is not None:
         return None
 
+    if embeddings_store is not None:
+        return embeddings_store.close()
+
     if errors:
         return embeddings  # may contain None, must return as list
 
@@ -929,7 +1087,13 @@ def _compute_image_embeddings_batch(
 
 
 def _compute_image_embeddings_data_loader(
-    samples, model, embeddings_field, batch_size, num_workers, skip_failures
+    samples,
+    model,
+    embeddings_field,
+    embeddings_store,
+    batch_size,
+    num_workers,
+    skip_failures,
 ):
     samples = samples.select_fields()
     samples_loader = fou.iter_batches(samples, batch_size)
@@ -965,6 +1129,12 @@ def _compute_image_embeddings_data_loader(
                 for sample, embedding in zip(sample_batch, embeddings_batch):
                     sample[embeddings_field] = embedding
                     sample.save()
+            elif embeddings_store is not None:
+                if embeddings_batch[0] is not None:
+                    embeddings_store.add_all(
+                        [sample.id for sample in sample_batch],
+                        embeddings_batch,
+                    )
             else:
                 embeddings.extend(embeddings_batch)
 
@@ -973,6 +1143,9 @@ def _compute_image_embeddings_data_loader(
     if embeddings_field is not None:
         return None
 
+    if embeddings_store is not None:
+        return embeddings_store.close()
+
     if errors:
         return embeddings  # may contain None, must return as list
 
@@ -1102,7 +1275,9 @@ def _compute_frame_embeddings_batch(
     return embeddings_dict
 
 
-def _compute_video_embeddings(samples, model, embeddings_field, skip_failures):
+def _compute_video_embeddings(
+    samples, model, embeddings_field, embeddings_store, skip_failures
+):
     samples = samples.select_fields()
     is_clips = samples._dataset._is_clips
 
@@ -1111,6 +1286,8 @@ def _compute_video_embeddings(samples, model, embeddings_field, skip_failures):
 
     with fou.ProgressBar() as pb:
         for sample in pb(samples):
+            embedding = None
+
             if is_clips:
                 frames = etaf.FrameRange(*sample.support)
             else:
@@ -1132,12 +1309,18 @@ def _compute_video_embeddings(samples, model, embeddings_field, skip_failures):
             if embeddings_field is not None:
                 sample[embeddings_field] = embedding
                 sample.save()
+            elif embeddings_store is not None:
+                if embedding is not None:
+                    embeddings_store.add(sample.id, embedding)
             else:
                 embeddings.append(embedding)
 
     if embeddings_field is not None:
         return None
 
+    if embeddings_store is not None:
+        return embeddings_store.close()
+
     if errors:
         return embeddings  # may contain None, must return as list
 
@@ -1155,6 +1338,7 @@ def compute_patch_embeddings(
     batch_size=None,
     num_workers=None,
     skip_failures=True,
+    embeddings_store=None,
 ):
     """Computes embeddings for the image patches defined by ``patches_field``
     of the samples in the collection using the given :class:`Model`.
@@ -1170,7 +1354,9 @@ def compute_patch_embeddings(
     must return ``True``.
 
     If an ``embeddings_field`` is provided, the embeddings are saved to the
-    samples; otherwise, the embeddings are returned in-memory.
+    samples. If an ``embeddings_store`` is provided, the embeddings are
+    streamed to an :class:`EmbeddingsStore` on disk. Otherwise, the embeddings
+    are returned in-memory.
 
     Args:
         samples: a :class:`fiftyone.core.collections.SampleCollection`
@@ -1205,11 +1391,16 @@ def compute_patch_embeddings(
             Only applicable for Torch models
         skip_failures (True): whether to gracefully continue without raising an
             error if embeddings cannot be generated for a sample
+        embeddings_store (None): the path to a directory in which to write an
+            :class:`EmbeddingsStore` of the embeddings, whose rows are keyed
+            by label ID. Patches generated via ``handle_missing="image"`` are
+            keyed by sample ID. Only applicable to image collections
 
     Returns:
         one of the following:
 
         -   ``None``, if an ``embeddings_field`` is provided
+        -   an :class:`EmbeddingsStore`, if an ``embeddings_store`` is provided
         -   a dict mapping sample IDs to ``num_patches x num_dim`` arrays of
             patch embeddings, when computing patch embeddings for image
             collections and no ``embeddings_field`` is provided. If
@@ -1228,6 +1419,17 @@ def compute_patch_embeddings(
             "Model must be a %s instance; found %s" % (Model, type(model))
         )
 
+    if embeddings_field is not None and embeddings_store is not None:
+        raise ValueError(
+            "Only one of `embeddings_field` and `embeddings_store` may be "
+            "provided"
+        )
+
+    if embeddings_store is not None and samples.media_type != fom.IMAGE:
+        raise ValueError(
+            "`embeddings_store` is only supported for image collections"
+        )
+
     if not model.has_embeddings:
         raise ValueError(
             "Model must expose embeddings; found model.has_embeddings = %s"
@@ -1307,6 +1509,11 @@ def compute_patch_embeddings(
 
         batch_size = _parse_batch_size(batch_size, model, use_data_loader)
 
+        if embeddings_store is not None:
+            embeddings_store = context.enter_context(
+                _EmbeddingsStoreWriter(embeddings_store, has_sample_ids=True)
+            )
+
         if samples.media_type == fom.VIDEO:
             return _embed_frame_patches(
                 samples,
@@ -1326,6 +1533,7 @@ def compute_patch_embeddings(
                 model,
                 patches_field,
                 embeddings_field,
+                embeddings_store,
                 force_square,
                 alpha,
                 handle_missing,
@@ -1339,6 +1547,7 @@ def compute_patch_embeddings(
             model,
             patches_field,
             embeddings_field,
+            embeddings_store,
             force_square,
             alpha,
             handle_missing,
@@ -1352,6 +1561,7 @@ def _embed_patches(
     model,
     patches_field,
     embeddings_field,
+    embeddings_store,
     force_square,
     alpha,
     handle_missing,
@@ -1360,7 +1570,7 @@ def _embed_patches(
 ):
     samples = samples.select_fields(patches_field)
 
-    if embeddings_field is not None:
+    if embeddings_field is not None or embeddings_store is not None:
         label_parser = _make_label_parser(samples, patches_field)
     else:
         embeddings_dict = {}
@@ -1404,15 +1614,37 @@ def _embed_patches(
                         label[embeddings_field] = embedding
 
                     sample.save()
+            elif embeddings_store is not None:
+                if embeddings is not None:
+                    ids, sample_ids = _get_patch_ids(
+                        sample, label_parser, embeddings
+                    )
+                    embeddings_store.add_all(
+                        ids, embeddings, sample_ids=sample_ids
+                    )
             else:
                 embeddings_dict[sample.id] = embeddings
 
     if embeddings_field is not None:
         return None
 
+    if embeddings_store is not None:
+        return embeddings_store.close()
+
     return embeddings_dict
 
 
+def _get_patch_ids(sample, label_parser, embeddings):
+    labels = label_parser(sample)
+    if len(labels) == len(embeddings):
+        ids = [label.id for label in labels]
+    else:
+        # The whole image was used as a patch
+        ids = [sample.id] * len(embeddings)
+
+    return ids, [sample.id] * len(embeddings)
+
+
 def _embed_patches_single(model, img, detections, force_square, alpha):
     embeddings = []
     for detection in detections.detections:
@@ -1447,6 +1679,7 @@ def _embed_patches_data_loader(
     model,
     patches_field,
     embeddings_field,
+    embeddings_store,
     force_square,
     alpha,
     handle_missing,
@@ -1467,7 +1700,7 @@ def _embed_patches_data_loader(
         skip_failures,
     )
 
-    if embeddings_field is not None:
+    if embeddings_field is not None or embeddings_store is not None:
         label_parser = _make_label_parser(samples, patches_field)
     else:
         embeddings_dict = {}
@@ -1501,12 +1734,23 @@ def _embed_patches_data_loader(
                         label[embeddings_field] = embedding
 
                     sample.save()
+            elif embeddings_store is not None:
+                if embeddings is not None:
+                    ids, sample_ids = _get_patch_ids(
+                        sample, label_parser, embeddings
+                    )
+                    embeddings_store.add_all(
+                        ids, embeddings, sample_ids=sample_ids
+                    )
             else:
                 embeddings_dict[sample.id] = embeddings
 
     if embeddings_field is not None:
         return None
 
+    if embeddings_store is not None:
+        return embeddings_store.close()
+
     return embeddings_dict
 
 
@@ -1674,6 +1918,312 @@ def _make_label_parser(samples, patches_field):
     return parse_list_labels
 
 
+class EmbeddingsStore(object):
+    """An on-disk store of embedding vectors that are lazily loaded as a
+    memory-mapped array.
+
+    Stores are created by passing the ``embeddings_store`` parameter to
+    :func:`compute_embeddings` or :func:`compute_patch_embeddings`, and they
+    can be reloaded at any time by passing their path to this class.
+
+    Each row of :attr:`embeddings` corresponds to the sample (or label, for
+    patch embeddings) with the ID in the same position of :attr:`ids`. Samples
+    whose embeddings could not be computed are omitted.
+
+    Args:
+        path: the directory containing the store
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+        self._info = None
+        self._embeddings = None
+        self._raw_ids = None
+        self._raw_sample_ids = None
+        self._sorted_ids = None
+        self._sorted_inds = None
+
+    def __len__(self):
+        return self.info["count"]
+
+    def __repr__(self):
+        return "<%s: path='%s', shape=%s>" % (
+            self.__class__.__name__,
+            self.path,
+            self.shape,
+        )
+
+    @property
+    def info(self):
+        """A dict of information about the store."""
+        if self._info is None:
+            self._info = etas.read_json(
+                os.path.join(self.path, _EMBEDDINGS_STORE_INFO)
+            )
+
+        return self._info
+
+    @property
+    def shape(self):
+        """The ``(num_embeddings, num_dims)`` shape of the store."""
+        return (self.info["count"], self.info["num_dims"])
+
+    @property
+    def embeddings(self):
+        """A read-only ``num_embeddings x num_dims`` memory-mapped array of
+        embeddings.
+        """
+        if self._embeddings is None:
+            self._embeddings = self._load_array(
+                _EMBEDDINGS_STORE_EMBEDDINGS,
+                self.info["dtype"],
+                shape=self.shape,
+            )
+
+        return self._embeddings
+
+    @property
+    def ids(self):
+        """A read-only memory-mapped array of the IDs of the rows of
+        :attr:`embeddings`, as ``S24`` bytes. Use ``ids.astype(str)`` to
+        convert them to strings.
+        """
+        if self._raw_ids is None:
+            self._raw_ids = self._load_array(
+                _EMBEDDINGS_STORE_IDS, _EMBEDDINGS_STORE_ID_DTYPE
+            )
+
+        return self._raw_ids
+
+    @property
+    def sample_ids(self):
+        """A read-only memory-mapped array of the sample IDs of the rows of
+        :attr:`embeddings`, as ``S24`` bytes, for patch embeddings, or else
+        the same as :attr:`ids`.
+        """
+        if not self.info["has_sample_ids"]:
+            return self.ids
+
+        if self._raw_sample_ids is None:
+            self._raw_sample_ids = self._load_array(
+                _EMBEDDINGS_STORE_SAMPLE_IDS, _EMBEDDINGS_STORE_ID_DTYPE
+            )
+
+        return self._raw_sample_ids
+
+    def get_embeddings(self, ids):
+        """Returns the embeddings for the given IDs.
+
+        Args:
+            ids: an iterable of IDs
+
+        Returns:
+            a ``len(ids) x num_dims`` array of embeddings
+
+        Raises:
+            KeyError: if any of the IDs are not in the store
+        """
+        query = np.array(list(ids), dtype=_EMBEDDINGS_STORE_ID_DTYPE)
+
+        # The sorted index is written with the store, so lookups only touch
+        # the pages of the index that the binary search visits
+        if self._sorted_ids is None:
+            self._sorted_ids = self._load_array(
+                _EMBEDDINGS_STORE_SORTED_IDS, _EMBEDDINGS_STORE_ID_DTYPE
+            )
+            self._sorted_inds = self._load_array(
+                _EMBEDDINGS_STORE_SORTED_INDS, np.int64
+            )
+
+        sorted_ids = self._sorted_ids
+        if sorted_ids.size > 0:
+            pos = np.searchsorted(sorted_ids, query)
+            np.minimum(pos, sorted_ids.size - 1, out=pos)
+            found = sorted_ids[pos] == query
+        else:
+            pos = np.zeros(query.size, dtype=int)
+            found = np.zeros(query.size, dtype=bool)
+
+        if not np.all(found):
+            missing = query[~found].astype(str).tolist()
+            raise KeyError("IDs %s are not in the store" % missing[:10])
+
+        return np.asarray(self.embeddings[self._sorted_inds[pos]])
+
+    def _load_array(self, filename, dtype, shape=None):
+        path = os.path.join(self.path, filename)
+        if not self.info["count"]:
+            return np.empty(shape or (0,), dtype=dtype)
+
+        return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+class _EmbeddingsStoreWriter(object):
+    """Streams embeddings into an :class:`EmbeddingsStore` on disk.
+
+    The store's ``info.json`` is only written when the writer is closed
+    without error, so an incomplete store can never be loaded. If an error
+    occurs while the store is open, its files are deleted.
+
+    Args:
+        path: the directory in which to write the store. Any existing store
+            in this directory is overwritten
+        has_sample_ids (False): whether each embedding has a separate sample ID
+            in addition to its ID, as is the case for patch embeddings
+    """
+
+    def __init__(self, path, has_sample_ids=False):
+        self.path = fou.normalize_path(path)
+        self.has_sample_ids = has_sample_ids
+
+        self._files = None
+        self._count = 0
+        self._num_dims = None
+        self._dtype = None
+
+    def __enter__(self):
+        etau.ensure_dir(self.path)
+        self._delete_files()
+
+        filenames = [_EMBEDDINGS_STORE_EMBEDDINGS, _EMBEDDINGS_STORE_IDS]
+        if self.has_sample_ids:
+            filenames.append(_EMBEDDINGS_STORE_SAMPLE_IDS)
+
+        self._files = [
+            open(os.path.join(self.path, f), "wb") for f in filenames
+        ]
+
+        return self
+
+    def __exit__(self, *args):
+        if args[0] is None:
+            self.close()
+        else:
+            self._abort()
+
+    def add(self, id, embedding, sample_id=None):
+        """Adds an embedding to the store.
+
+        Args:
+            id: the ID of the embedding
+            embedding: a 1D embedding vector
+            sample_id (None): the sample ID of the embedding, if applicable
+        """
+        embedding = np.asarray(embedding)
+        sample_ids = [sample_id] if self.has_sample_ids else None
+        self.add_all([id], embedding[np.newaxis], sample_ids=sample_ids)
+
+    def add_all(self, ids, embeddings, sample_ids=None):
+        """Adds a batch of embeddings to the store.
+
+        Args:
+            ids: a list of IDs
+            embeddings: a ``num_embeddings x num_dims`` array of embeddings
+            sample_ids (None): a list of sample IDs, if applicable
+        """
+        embeddings = np.asarray(embeddings)
+        if embeddings.ndim != 2:
+            embeddings = embeddings.reshape(len(ids), -1)
+
+        if self._num_dims is None:
+            self._num_dims = embeddings.shape[1]
+            self._dtype = embeddings.dtype
+        elif embeddings.shape[1] != self._num_dims:
+            raise ValueError(
+                "Expected embeddings of dimension %d; found %d"
+                % (self._num_dims, embeddings.shape[1])
+            )
+
+        embeddings = embeddings.astype(self._dtype, copy=False)
+        self._files[0].write(np.ascontiguousarray(embeddings).tobytes())
+
+        _ids = np.array(ids, dtype=_EMBEDDINGS_STORE_ID_DTYPE)
+        self._files[1].write(_ids.tobytes())
+
+        if self.has_sample_ids:
+            _ids = np.array(sample_ids, dtype=_EMBEDDINGS_STORE_ID_DTYPE)
+            self._files[2].write(_ids.tobytes())
+
+        self._count += len(ids)
+
+    def close(self):
+        """Finalizes the store.
+
+        Returns:
+            an :class:`EmbeddingsStore`
+        """
+        if self._files is not None:
+            for f in self._files:
+                f.close()
+
+            self._files = None
+
+            self._write_sorted_index()
+
+            dtype = self._dtype if self._dtype is not None else np.float32
+            info = {
+                "count": self._count,
+                "num_dims": self._num_dims or 0,
+                "dtype": np.dtype(dtype).str,
+                "has_sample_ids": self.has_sample_ids,
+            }
+            etas.write_json(
+                info, os.path.join(self.path, _EMBEDDINGS_STORE_INFO)
+            )
+
+        return EmbeddingsStore(self.path)
+
+    def _write_sorted_index(self):
+        if not self._count:
+            return
+
+        ids = np.memmap(
+            os.path.join(self.path, _EMBEDDINGS_STORE_IDS),
+            dtype=_EMBEDDINGS_STORE_ID_DTYPE,
+            mode="r",
+        )
+        inds = np.argsort(ids, kind="stable").astype(np.int64)
+
+        np.asarray(ids[inds]).tofile(
+            os.path.join(self.path, _EMBEDDINGS_STORE_SORTED_IDS)
+        )
+        inds.tofile(os.path.join(self.path, _EMBEDDINGS_STORE_SORTED_INDS))
+
+        del ids
+
+    def _abort(self):
+        if self._files is not None:
+            for f in self._files:
+                f.close()
+
+            self._files = None
+
+        self._delete_files()
+
+    def _delete_files(self):
+        for filename in (
+            _EMBEDDINGS_STORE_INFO,
+            _EMBEDDINGS_STORE_EMBEDDINGS,
+            _EMBEDDINGS_STORE_IDS,
+            _EMBEDDINGS_STORE_SAMPLE_IDS,
+            _EMBEDDINGS_STORE_SORTED_IDS,
+            _EMBEDDINGS_STORE_SORTED_INDS,
+        ):
+            path = os.path.join(self.path, filename)
+            if os.path.isfile(path):
+                os.remove(path)
+
+
+_EMBEDDINGS_STORE_INFO = "info.json"
+_EMBEDDINGS_STORE_EMBEDDINGS = "embeddings.bin"
+_EMBEDDINGS_STORE_IDS = "ids.bin"
+_EMBEDDINGS_STORE_SAMPLE_IDS = "sample_ids.bin"
+_EMBEDDINGS_STORE_SORTED_IDS = "sorted_ids.bin"
+_EMBEDDINGS_STORE_SORTED_INDS = "sorted_inds.bin"
+_EMBEDDINGS_STORE_ID_DTYPE = "S24"
+
+
 def load_model(model_config_dict, model_path=None, **kwargs):
     """Loads the model specified by the given :class:`ModelConfig` dict.
 
@@ -7,7 +7,11 @@ Patches views.
 """
 from collections import defaultdict
 from copy import deepcopy
+from functools import partial
+import hashlib
+import logging
 
+import bson
 from bson import ObjectId
 
 import eta.core.utils as etau
@@ -15,6 +19,7 @@ import eta.core.utils as etau
 import fiftyone.core.aggregations as foa
 import fiftyone.core.dataset as fod
 import fiftyone.core.fields as fof
+import fiftyone.core.generated as foge
 import fiftyone.core.labels as fol
 import fiftyone.core.media as fom
 import fiftyone.core.odm as foo
@@ -23,9 +28,14 @@ import fiftyone.core.validation as fova
 import fiftyone.core.view as fov
 
 
+logger = logging.getLogger(__name__)
+
 _PATCHES_TYPES = (fol.Detections, fol.Polylines, fol.Keypoints)
 _NO_MATCH_ID = ""
 
+# Patches datasets generated with `cache=True`
+_CACHE = foge.GeneratedDatasetCache(100000)
+
 
 class _PatchView(fos.SampleView):
     @property
@@ -533,6 +543,7 @@ def make_patches_dataset(
     other_fields=None,
     keep_label_lists=False,
     name=None,
+    cache=False,
 ):
     """Creates a dataset that contains one sample per object patch in the
     specified field of the collection.
@@ -561,6 +572,15 @@ def make_patches_dataset(
             fields of the same type as the input collection rather than using
             their single label variants
         name (None): a name for the dataset
+        cache (False): whether to reuse the dataset generated by a previous
+            call to this method with ``cache=True`` for the same collection
+            and parameters, if possible. When a cached dataset is reused, only
+            the patches of samples whose contents have changed since the
+            dataset was last generated are regenerated. Note that cached
+            datasets may be shared by multiple patches views, that source
+            changes made by other processes or by writing directly to the
+            database are only detected once the source has also been modified
+            by this process, and that the App never uses cached datasets
 
     Returns:
         a :class:`fiftyone.core.dataset.Dataset`
@@ -581,6 +601,32 @@ def make_patches_dataset(
         sample_collection, field, keep_label_lists
     )
 
+    cache = foge.use_cache(cache)
+
+    if cache:
+        cache_key = _CACHE.get_key(
+            sample_collection,
+            sample_collection.get_field_schema(),
+            name=name,
+            field=field,
+            other_fields=other_fields,
+            keep_label_lists=keep_label_lists,
+        )
+        dataset, entry = _CACHE.load(cache_key)
+        if dataset is not None:
+            for samples in _CACHE.iter_changed_samples(
+                dataset, sample_collection, entry, _get_id_path(dataset)
+            ):
+                patches_view = _make_patches_view(
+                    samples,
+                    field,
+                    other_fields=entry["other_fields"],
+                    keep_label_lists=keep_label_lists,
+                )
+                _add_samples(dataset, patches_view)
+
+            return dataset
+
     dataset = fod.Dataset(name=name, _patches=True, _frames=is_frame_patches)
     dataset.media_type = fom.IMAGE
     dataset.add_sample_field("sample_id", fof.ObjectIdField)
@@ -615,6 +661,9 @@ def make_patches_dataset(
     )
     _write_samples(dataset, patches_view)
 
+    if cache:
+        _cache_dataset(cache_key, dataset, sample_collection, other_fields)
+
     return dataset
 
 
@@ -627,7 +676,7 @@ def _get_patches_field(sample_collection, field_name, keep_label_lists):
 
 
 def make_evaluation_patches_dataset(
-    sample_collection, eval_key, other_fields=None, name=None
+    sample_collection, eval_key, other_fields=None, name=None, cache=False
 ):
     """Creates a dataset based on the results of the evaluation with the given
     key that contains one sample for each true positive, false positive, and
@@ -676,6 +725,15 @@ def make_evaluation_patches_dataset(
             -   ``True`` to include all other fields
             -   ``None``/``False`` to include no other fields
         name (None): a name for the dataset
+        cache (False): whether to reuse the dataset generated by a previous
+            call to this method with ``cache=True`` for the same collection
+            and parameters, if possible. When a cached dataset is reused, only
+            the patches of samples whose contents have changed since the
+            dataset was last generated are regenerated. Note that cached
+            datasets may be shared by multiple patches views, that source
+            changes made by other processes or by writing directly to the
+            database are only detected once the source has also been modified
+            by this process, and that the App never uses cached datasets
 
     Returns:
         a :class:`fiftyone.core.dataset.Dataset`
@@ -712,6 +770,35 @@ def make_evaluation_patches_dataset(
     _gt_field = sample_collection.get_field(gt_field)
     _pred_field = sample_collection.get_field(pred_field)
 
+    cache = foge.use_cache(cache)
+
+    if cache:
+        cache_key = _CACHE.get_key(
+            sample_collection,
+            sample_collection.get_field_schema(),
+            name=name,
+            eval_key=eval_key,
+            eval_config=eval_info.config.serialize(),
+            other_fields=other_fields,
+        )
+        dataset, entry = _CACHE.load(cache_key)
+        if dataset is not None:
+            for samples in _CACHE.iter_changed_samples(
+                dataset, sample_collection, entry, _get_id_path(dataset)
+            ):
+                _write_evaluation_patches(
+                    dataset,
+                    samples,
+                    eval_key,
+                    gt_field,
+                    pred_field,
+                    other_fields=entry["other_fields"],
+                    crowd_attr=crowd_attr,
+                    overwrite=False,
+                )
+
+            return dataset
+
     # Setup dataset with correct schema
     dataset = fod.Dataset(name=name, _patches=True, _frames=is_frame_patches)
     dataset.media_type = fom.IMAGE
@@ -746,6 +833,32 @@ def make_evaluation_patches_dataset(
 
     _make_pretty_summary(dataset, is_frame_patches=is_frame_patches)
 
+    _write_evaluation_patches(
+        dataset,
+        sample_collection,
+        eval_key,
+        gt_field,
+        pred_field,
+        other_fields=other_fields,
+        crowd_attr=crowd_attr,
+    )
+
+    if cache:
+        _cache_dataset(cache_key, dataset, sample_collection, other_fields)
+
+    return dataset
+
+
+def _write_evaluation_patches(
+    dataset,
+    sample_collection,
+    eval_key,
+    gt_field,
+    pred_field,
+    other_fields=None,
+    crowd_attr=None,
+    overwrite=True,
+):
     # Add ground truth patches
     gt_view = _make_eval_view(
         sample_collection,
@@ -754,7 +867,11 @@ def make_evaluation_patches_dataset(
         other_fields=other_fields,
         crowd_attr=crowd_attr,
     )
-    _write_samples(dataset, gt_view)
+
+    if overwrite:
+        _write_samples(dataset, gt_view)
+    else:
+        _add_samples(dataset, gt_view)
 
     # Merge matched predictions
     _merge_matched_labels(dataset, sample_collection, eval_key, pred_field)
@@ -769,7 +886,41 @@ def make_evaluation_patches_dataset(
     )
     _add_samples(dataset, unmatched_pred_view)
 
-    return dataset
+
+def _cache_dataset(cache_key, dataset, sample_collection, other_fields):
+    schema = dataset.get_field_schema()
+    src_schema = sample_collection.get_field_schema()
+    fields = [f for f in schema if f != "id" and f in src_schema]
+
+    _CACHE.add(
+        cache_key,
+        dataset,
+        sample_collection,
+        partial(_compute_fingerprints, fields=fields),
+        other_fields=other_fields,
+    )
+
+
+def _get_id_path(dataset):
+    if dataset._is_frames:
+        return "_frame_id"
+
+    return "_sample_id"
+
+
+def _compute_fingerprints(sample_collection, fields):
+    # Samples are streamed from a cursor, which fetches them in batches, so
+    # that only their fingerprints are held in memory
+    db_fields = sample_collection._handle_db_fields(fields)
+    project = {f: True for f in db_fields}
+    pipeline = [{"$project": project}]
+
+    fingerprints = {}
+    for d in sample_collection._aggregate(post_pipeline=pipeline):
+        doc = {f: d.get(db_f, None) for f, db_f in zip(fields, db_fields)}
+        fingerprints[str(d["_id"])] = hashlib.sha1(bson.encode(doc)).digest()
+
+    return fingerprints
 
 
 def _make_pretty_summary(dataset, is_frame_patches=False):
@@ -36,6 +36,7 @@ fob = fou.lazy_import("fiftyone.brain")
 focl = fou.lazy_import("fiftyone.core.clips")
 foc = fou.lazy_import("fiftyone.core.collections")
 fod = fou.lazy_import("fiftyone.core.dataset")
+foge = fou.lazy_import("fiftyone.core.generated")
 fop = fou.lazy_import("fiftyone.core.patches")
 fov = fou.lazy_import("fiftyone.core.view")
 fovi = fou.lazy_import("fiftyone.core.video")
@@ -7234,6 +7235,16 @@ class ToPatches(ViewStage):
     By default, fields other than ``field`` and the default sample fields will
     not be included in the returned view.
 
+    .. note::
+
+        If ``cache=True`` is provided, the generated patches dataset is reused
+        by later views of the same collection with the same parameters. The
+        cache only detects source modifications that are made via FiftyOne
+        methods in the current process. Writes that bypass them, such as raw
+        database updates or edits made by other processes, are not detected
+        until the source is next modified by the current process. The App never
+        uses cached datasets.
+
     Examples::
 
         import fiftyone as fo
@@ -7312,8 +7323,10 @@ class ToPatches(ViewStage):
             )
 
             # Other views may use the same generated dataset, so reuse the old
-            # name if possible
-            if name is not None and state == last_state:
+            # name if possible. Cached datasets are shared with other views
+            # under their own names, so they are never renamed
+            cache = foge.use_cache(kwargs.get("cache", False))
+            if name is not None and state == last_state and not cache:
                 patches_dataset.name = name
 
             state["name"] = patches_dataset.name
@@ -7376,6 +7389,16 @@ class ToEvaluationPatches(ViewStage):
         :meth:`load_evaluation_view() <fiftyone.core.collections.SampleCollection.load_evaluation_view>`
         to load the view and then convert to patches.
 
+    .. note::
+
+        If ``cache=True`` is provided, the generated evaluation patches dataset
+        is reused by later views of the same collection with the same
+        parameters. The cache only detects source modifications that are made
+        via FiftyOne methods in the current process. Writes that bypass them,
+        such as raw database updates or edits made by other processes, are not
+        detected until the source is next modified by the current process. The
+        App never uses cached datasets.
+
     Examples::
 
         import fiftyone as fo
@@ -7456,8 +7479,10 @@ class ToEvaluationPatches(ViewStage):
             )
 
             # Other views may use the same generated dataset, so reuse the old
-            # name if possible
-            if name is not None and state == last_state:
+            # name if possible. Cached datasets are shared with other views
+            # under their own names, so they are never renamed
+            cache = foge.use_cache(kwargs.get("cache", False))
+            if name is not None and state == last_state and not cache:
                 eval_patches_dataset.name = name
 
             state["name"] = eval_patches_dataset.name
@@ -7849,6 +7874,16 @@ class ToFrames(ViewStage):
         True, existing frames will not be resampled unless you set
         ``force_sample`` to True.
 
+    .. note::
+
+        If ``cache=True`` is provided, the generated frames dataset is reused
+        by later views of the same collection with the same parameters. The
+        cache only detects source modifications that are made via FiftyOne
+        methods in the current process. Writes that bypass them, such as raw
+        database updates or edits made by other processes, are not detected
+        until the source is next modified by the current process. The App never
+        uses cached datasets.
+
     Examples::
 
         import fiftyone as fo
@@ -7931,8 +7966,10 @@ class ToFrames(ViewStage):
             )
 
             # Other views may use the same generated dataset, so reuse the old
-            # name if possible
-            if name is not None and state == last_state:
+            # name if possible. Cached datasets are shared with other views
+            # under their own names, so they are never renamed
+            cache = foge.use_cache(kwargs.get("cache", False))
+            if name is not None and state == last_state and not cache:
                 frames_dataset.name = name
 
             state["name"] = frames_dataset.name
@@ -22,12 +22,14 @@ import ntpath
 import os
 import posixpath
 import platform
+import queue
 import re
 import signal
 import string
 import struct
 import subprocess
 import sys
+import threading
 import timeit
 import types
 from xml.parsers.expat import ExpatError
@@ -1364,6 +1366,76 @@ def iter_slices(sliceable, batch_size):
         yield chunk
 
 
+def iter_prefetch(iterable, prefetch):
+    """Iterates over the given iterable, consuming it on a background thread
+    that keeps up to ``prefetch`` elements ready in a bounded queue.
+
+    Any exception raised by the iterable is re-raised by this generator. If
+    the generator is closed before the iterable is exhausted, the background
+    thread is stopped.
+
+    Args:
+        iterable: an iterable
+        prefetch: the maximum number of elements to buffer. If this is
+            ``None`` or less than 1, the iterable is consumed directly
+
+    Returns:
+        a generator that emits the elements of the input
+    """
+    if prefetch is None or prefetch < 1:
+        yield from iterable
+        return
+
+    buffer = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def _put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    def _produce():
+        it = iter(iterable)
+        try:
+            for element in it:
+                if not _put((_PREFETCH_ELEMENT, element)):
+                    return
+        except Exception as e:
+            _put((_PREFETCH_ERROR, e))
+        else:
+            _put((_PREFETCH_DONE, None))
+        finally:
+            if hasattr(it, "close"):
+                it.close()
+
+    thread = threading.Thread(target=_produce, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            kind, value = buffer.get()
+            if kind == _PREFETCH_DONE:
+                return
+
+            if kind == _PREFETCH_ERROR:
+                raise value
+
+            yield value
+    finally:
+        stop.set()
+        thread.join()
+
+
+_PREFETCH_ELEMENT = 0
+_PREFETCH_DONE = 1
+_PREFETCH_ERROR = 2
+
+
 def call_on_exit(callback):
     """Registers the given callback function so that it will be called when the
     process exits for (almost) any reason
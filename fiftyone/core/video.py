@@ -7,9 +7,11 @@ Video frame views.
 """
 from collections import defaultdict
 from copy import deepcopy
+import hashlib
 import logging
 import os
 
+import bson
 from bson import ObjectId
 from pymongo import UpdateOne
 
@@ -18,6 +20,7 @@ import eta.core.utils as etau
 import fiftyone as fo
 import fiftyone.core.dataset as fod
 import fiftyone.core.fields as fof
+import fiftyone.core.generated as foge
 import fiftyone.core.media as fom
 import fiftyone.core.sample as fos
 import fiftyone.core.odm as foo
@@ -31,6 +34,9 @@ fouv = fou.lazy_import("fiftyone.utils.video")
 
 logger = logging.getLogger(__name__)
 
+# Frames datasets generated with `cache=True`
+_CACHE = foge.GeneratedDatasetCache(10000)
+
 
 class FrameView(fos.SampleView):
     """A frame in a :class:`FramesView`.
@@ -321,6 +327,7 @@ class FramesView(fov.DatasetView):
         }
 
         dst_dataset._frame_collection.update_one(match, {"$set": updates})
+        dst_dataset._mark_modified()
 
     def _sync_source(self, fields=None, ids=None, update=True, delete=False):
         dst_dataset = self._source_collection._root_dataset
@@ -371,6 +378,7 @@ class FramesView(fov.DatasetView):
             )
 
             self._frames_dataset._aggregate(pipeline=pipeline)
+            dst_dataset._mark_modified()
 
         if delete:
             frame_ids = self._frames_dataset.exclude(self).values("id")
@@ -462,6 +470,7 @@ def make_frames_dataset(
     skip_failures=True,
     verbose=False,
     name=None,
+    cache=False,
 ):
     """Creates a dataset that contains one sample per frame in the video
     collection.
@@ -587,6 +596,16 @@ def make_frames_dataset(
         verbose (False): whether to log information about the frames that will
             be sampled, if any
         name (None): a name for the dataset
+        cache (False): whether to reuse the dataset generated by a previous
+            call to this method with ``cache=True`` for the same collection
+            and parameters, if possible. When a cached dataset is reused, only
+            the frames of videos whose media or frames have changed in the
+            collection since the dataset was last generated are regenerated.
+            Note that changes to sampled frame images on disk are not detected,
+            that source changes made by other processes or by writing directly
+            to the database are only detected once the source has also been
+            modified by this process, that cached datasets may be shared by
+            multiple frames views, and that the App never uses cached datasets
 
     Returns:
         a :class:`fiftyone.core.dataset.Dataset`
@@ -606,6 +625,44 @@ def make_frames_dataset(
             fo.config.default_sequence_idx + fo.config.default_image_ext
         )
 
+    write_kwargs = dict(
+        sample_frames=sample_frames,
+        fps=fps,
+        max_fps=max_fps,
+        size=size,
+        min_size=min_size,
+        max_size=max_size,
+        sparse=sparse,
+        output_dir=output_dir,
+        rel_dir=rel_dir,
+        frames_patt=frames_patt,
+        force_sample=force_sample,
+        skip_failures=skip_failures,
+        verbose=verbose,
+    )
+
+    cache = foge.use_cache(cache)
+
+    if cache:
+        cache_key = _CACHE.get_key(
+            sample_collection,
+            sample_collection.get_frame_field_schema(),
+            name=name,
+            **write_kwargs,
+        )
+        dataset, entry = _CACHE.load(cache_key)
+        if dataset is not None:
+            for samples in _CACHE.iter_changed_samples(
+                dataset,
+                sample_collection,
+                entry,
+                "_sample_id",
+                src_id_path=_get_video_id_path(sample_collection),
+            ):
+                _write_frames(dataset, samples, **write_kwargs)
+
+            return dataset
+
     #
     # Create dataset with proper schema
     #
@@ -625,6 +682,43 @@ def make_frames_dataset(
 
     _make_pretty_summary(dataset)
 
+    _write_frames(dataset, sample_collection, **write_kwargs)
+
+    if cache:
+        _CACHE.add(
+            cache_key, dataset, sample_collection, _compute_fingerprints
+        )
+
+    if sample_frames == False and not dataset:
+        logger.warning(
+            "Your frames view is empty. Note that you must either "
+            "pre-populate the `filepath` field on the frames of your video "
+            "collection or pass `sample_frames=True` to this method to "
+            "perform the sampling. See "
+            "https://docs.voxel51.com/user_guide/using_views.html#frame-views "
+            "for more information."
+        )
+
+    return dataset
+
+
+def _write_frames(
+    dataset,
+    sample_collection,
+    sample_frames=False,
+    fps=None,
+    max_fps=None,
+    size=None,
+    min_size=None,
+    max_size=None,
+    sparse=False,
+    output_dir=None,
+    rel_dir=None,
+    frames_patt=None,
+    force_sample=False,
+    skip_failures=True,
+    verbose=False,
+):
     # Initialize frames dataset
     sample_view, frames_to_sample = _init_frames(
         dataset,
@@ -683,18 +777,6 @@ def make_frames_dataset(
 
     sample_collection._aggregate(frames_only=True, post_pipeline=pipeline)
 
-    if sample_frames == False and not dataset:
-        logger.warning(
-            "Your frames view is empty. Note that you must either "
-            "pre-populate the `filepath` field on the frames of your video "
-            "collection or pass `sample_frames=True` to this method to "
-            "perform the sampling. See "
-            "https://docs.voxel51.com/user_guide/using_views.html#frame-views "
-            "for more information."
-        )
-
-    return dataset
-
 
 def _make_pretty_summary(dataset):
     set_fields = ["id", "sample_id", "filepath", "frame_number"]
@@ -703,6 +785,42 @@ def _make_pretty_summary(dataset):
     dataset._sample_doc_cls._fields_ordered = tuple(pretty_fields)
 
 
+def _get_video_id_path(sample_collection):
+    # The clips of a video are grouped by the video's ID
+    if sample_collection._dataset._is_clips:
+        return "_sample_id"
+
+    return "_id"
+
+
+def _compute_fingerprints(sample_collection):
+    # Samples are streamed from a cursor, so that only one sample and its
+    # frames are held in memory at a time. Fingerprints are keyed by video, so
+    # the fingerprints of the clips of a video are combined
+    id_path = _get_video_id_path(sample_collection)
+
+    fields = ["filepath", "metadata", "tags", "frames"]
+    if sample_collection._dataset._is_clips:
+        fields.append("support")
+
+    project = {f: True for f in [id_path] + fields}
+    pipeline = [{"$project": project}]
+
+    digests = defaultdict(list)
+    for d in sample_collection._aggregate(
+        attach_frames=True, post_pipeline=pipeline
+    ):
+        doc = {f: d.get(f, None) for f in fields}
+        digests[str(d[id_path])].append(
+            hashlib.sha1(bson.encode(doc)).digest()
+        )
+
+    return {
+        _id: hashlib.sha1(b"".join(_digests)).digest()
+        for _id, _digests in digests.items()
+    }
+
+
 def _init_frames(
     dataset,
     src_collection,
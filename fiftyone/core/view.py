@@ -20,6 +20,7 @@ import fiftyone.core.aggregations as foa
 import fiftyone.core.collections as foc
 import fiftyone.core.expressions as foe
 import fiftyone.core.fields as fof
+import fiftyone.core.frame as fofr
 import fiftyone.core.media as fom
 import fiftyone.core.odm as foo
 import fiftyone.core.sample as fos
@@ -405,7 +406,14 @@ class DatasetView(foc.SampleCollection):
         """
         return copy(self)
 
-    def iter_samples(self, progress=False, autosave=False, batch_size=None):
+    def iter_samples(
+        self,
+        progress=False,
+        autosave=False,
+        batch_size=None,
+        prefetch=None,
+        frames=None,
+    ):
         """Returns an iterator over the samples in the view.
 
         Examples::
@@ -447,12 +455,32 @@ class DatasetView(foc.SampleCollection):
             batch_size (None): a batch size to use when autosaving samples. Can
                 either be an integer specifying the number of samples to save
                 in a batch, or a float number of seconds between batched saves
+            prefetch (None): an optional number of samples to load on a
+                background thread ahead of the sample currently being
+                processed, which overlaps database reads with the work done
+                in your loop
+            frames (None): an optional strategy for loading the frames of
+                video samples. Supported values are:
+
+                -   ``None``: each sample's frames are loaded from the
+                    database when they are first accessed
+                -   ``"batched"``: the frames of batches of samples are loaded
+                    via a single database query as the samples are loaded
 
         Returns:
             an iterator over :class:`fiftyone.core.sample.SampleView` instances
         """
+        samples = self._iter_samples()
+
+        if frames == "batched":
+            if self._contains_videos():
+                samples = fofr._iter_samples_with_frames(samples)
+        elif frames is not None:
+            raise ValueError("Unsupported frames strategy '%s'" % frames)
+
         with contextlib.ExitStack() as exit_context:
-            samples = self._iter_samples()
+            samples = fou.iter_prefetch(samples, prefetch)
+            exit_context.callback(samples.close)
 
             if progress:
                 pb = fou.ProgressBar(total=len(self))
@@ -517,6 +545,7 @@ class DatasetView(foc.SampleCollection):
         progress=False,
         autosave=False,
         batch_size=None,
+        prefetch=None,
     ):
         """Returns an iterator over the groups in the view.
 
@@ -563,6 +592,10 @@ class DatasetView(foc.SampleCollection):
             batch_size (None): a batch size to use when autosaving samples. Can
                 either be an integer specifying the number of samples to save
                 in a batch, or a float number of seconds between batched saves
+            prefetch (None): an optional number of groups to load on a
+                background thread ahead of the group currently being
+                processed, which overlaps database reads with the work done
+                in your loop
 
         Returns:
             an iterator that emits dicts mapping slice names to
@@ -577,7 +610,10 @@ class DatasetView(foc.SampleCollection):
             )
 
         with contextlib.ExitStack() as exit_context:
-            groups = self._iter_groups(group_slices=group_slices)
+            groups = fou.iter_prefetch(
+                self._iter_groups(group_slices=group_slices), prefetch
+            )
+            exit_context.callback(groups.close)
 
             if progress:
                 pb = fou.ProgressBar(total=len(self))
@@ -5,8 +5,10 @@ FiftyOne Server ``/embeddings`` route.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
-import itertools
+import json
 
+import cachetools
+import numpy as np
 from starlette.endpoints import HTTPEndpoint
 from starlette.requests import Request
 
@@ -26,102 +28,84 @@ COLOR_BY_TYPES = (
     fof.FloatField,
 )
 
+# Plots loaded by `OnPlotLoad`, which `EmbeddingsPoints` reuses when zooming
+_plot_cache = cachetools.TTLCache(maxsize=10, ttl=900)  # ttl in seconds
+
 
 class OnPlotLoad(HTTPEndpoint):
     @route
     async def post(self, request: Request, data: dict) -> dict:
-        """Loads an embeddings plot based on the current view."""
+        """Loads an embeddings plot based on the current view.
+
+        If ``maxPoints`` is provided, at most this many representative points
+        are returned, and :class:`EmbeddingsPoints` can be used to fetch
+        full-resolution points for a region of the plot.
+        """
         dataset_name = data["datasetName"]
         brain_key = data["brainKey"]
         stages = data["view"]
         label_field = data["labelField"]
+        max_points = data.get("maxPoints", None)
 
-        dataset = fosu.load_and_cache_dataset(dataset_name)
+        plot = _load_plot(dataset_name, brain_key, stages, label_field)
+        if "error" in plot:
+            return plot
 
-        try:
-            results = dataset.load_brain_results(brain_key)
-            assert results is not None
-        except:
-            msg = (
-                "Failed to load results for brain run with key '%s'. Try "
-                "regenerating the results"
-            ) % brain_key
-            return {"error": msg}
+        # Always reload here so that zooming serves the same points that
+        # were used to render this plot
+        key = _get_plot_key(dataset_name, brain_key, stages, label_field)
+        _plot_cache[key] = plot
 
-        view = fosv.get_view(dataset_name, stages=stages)
-        is_patches_view = view._is_patches
+        points = plot["points"]
+        inds = _get_lod_inds(points, np.arange(len(points)), max_points)
 
-        patches_field = results.config.patches_field
-        is_patches_plot = patches_field is not None
-
-        # Determines which points from `results` are in `view`, which are the
-        # only points we want to display in the embeddings plot
-        results.use_view(view, allow_missing=True)
-
-        # The total number of embeddings in `results`
-        index_size = results.total_index_size
-
-        # The number of embeddings in `results` that exist in `view`. Any
-        # operations that we do with `results` can only work with this data
-        available_count = results.index_size
+        return {
+            "traces": _make_traces(plot, inds),
+            "style": plot["style"],
+            "index_size": plot["index_size"],
+            "available_count": plot["available_count"],
+            "missing_count": plot["missing_count"],
+            "patches_field": plot["patches_field"],
+            "lod": len(inds) < len(points),
+            "bounds": _get_bounds(points),
+        }
 
-        # The number of samples/patches in `view` that `results` doesn't have
-        # embeddings for
-        missing_count = results.missing_size
 
-        points = results._curr_points
-        if is_patches_plot:
-            ids = results._curr_label_ids
-            sample_ids = results._curr_sample_ids
-        else:
-            ids = results._curr_sample_ids
-            sample_ids = itertools.repeat(None)
-
-        # Color by data
-        if label_field:
-            if is_patches_view and not is_patches_plot:
-                # Must use the root dataset in order to retrieve colors for the
-                # plot, which is linked to samples, not patches
-                view = view._root_dataset
-
-            if is_patches_view and is_patches_plot:
-                # `label_field` is always provided with respect to root
-                # dataset, so we must translate for patches views
-                _, root = dataset._get_label_field_path(patches_field)
-                leaf = label_field[len(root) + 1 :]
-                _, label_field = view._get_label_field_path(
-                    patches_field, leaf
-                )
+class EmbeddingsPoints(HTTPEndpoint):
+    @route
+    async def post(self, request: Request, data: dict) -> dict:
+        """Loads the points of an embeddings plot that lie within the given
+        bounding box, for use when zooming into a plot that was loaded with
+        ``maxPoints``.
 
-            labels = view._get_values_by_id(
-                label_field, ids, link_field=patches_field
-            )
+        If ``maxPoints`` is provided and the box contains more points than
+        this, representative points are returned instead.
+        """
+        dataset_name = data["datasetName"]
+        brain_key = data["brainKey"]
+        stages = data["view"]
+        label_field = data["labelField"]
+        bounds = data["bounds"]  # [[xmin, ymin], [xmax, ymax]]
+        max_points = data.get("maxPoints", None)
 
-            field = view.get_field(label_field)
-            if isinstance(field, fof.FloatField):
-                style = "continuous"
-            else:
-                if len(set(labels)) <= MAX_CATEGORIES:
-                    style = "categorical"
-                else:
-                    style = "continuous"
-        else:
-            labels = itertools.repeat(None)
-            style = "uncolored"
+        key = _get_plot_key(dataset_name, brain_key, stages, label_field)
+        plot = _plot_cache.get(key, None)
+        if plot is None:
+            plot = _load_plot(dataset_name, brain_key, stages, label_field)
+            if "error" in plot:
+                return plot
 
-        selected = itertools.repeat(True)
+            _plot_cache[key] = plot
 
-        traces = {}
-        for data in zip(points, ids, sample_ids, labels, selected):
-            _add_to_trace(traces, style, *data)
+        points = plot["points"]
+        box_inds = _get_box_inds(points, bounds)
+        inds = _get_lod_inds(points, box_inds, max_points)
 
         return {
-            "traces": traces,
-            "style": style,
-            "index_size": index_size,
-            "available_count": available_count,
-            "missing_count": missing_count,
-            "patches_field": patches_field,
+            "traces": _make_traces(plot, inds),
+            "style": plot["style"],
+            "lod": len(inds) < len(box_inds),
+            "bounds": bounds,
         }
 
 
@@ -267,12 +251,169 @@ class ColorByChoices(HTTPEndpoint):
 
 EmbeddingsRoutes = [
     ("/embeddings/plot", OnPlotLoad),
+    ("/embeddings/points", EmbeddingsPoints),
     ("/embeddings/selection", EmbeddingsSelection),
     ("/embeddings/extended-stage", EmbeddingsExtendedStage),
     ("/embeddings/color-by-choices", ColorByChoices),
 ]
 
 
+def _get_plot_key(dataset_name, brain_key, stages, label_field):
+    return (
+        dataset_name,
+        brain_key,
+        json.dumps(stages, sort_keys=True),
+        label_field,
+    )
+
+
+def _load_plot(dataset_name, brain_key, stages, label_field):
+    dataset = fosu.load_and_cache_dataset(dataset_name)
+
+    try:
+        results = dataset.load_brain_results(brain_key)
+        assert results is not None
+    except:
+        msg = (
+            "Failed to load results for brain run with key '%s'. Try "
+            "regenerating the results"
+        ) % brain_key
+        return {"error": msg}
+
+    view = fosv.get_view(dataset_name, stages=stages)
+    is_patches_view = view._is_patches
+
+    patches_field = results.config.patches_field
+    is_patches_plot = patches_field is not None
+
+    # Determines which points from `results` are in `view`, which are the
+    # only points we want to display in the embeddings plot
+    results.use_view(view, allow_missing=True)
+
+    # The total number of embeddings in `results`
+    index_size = results.total_index_size
+
+    # The number of embeddings in `results` that exist in `view`. Any
+    # operations that we do with `results` can only work with this data
+    available_count = results.index_size
+
+    # The number of samples/patches in `view` that `results` doesn't have
+    # embeddings for
+    missing_count = results.missing_size
+
+    points = np.asarray(results._curr_points)
+    if is_patches_plot:
+        ids = results._curr_label_ids
+        sample_ids = results._curr_sample_ids
+    else:
+        ids = results._curr_sample_ids
+        sample_ids = None
+
+    # Color by data
+    if label_field:
+        if is_patches_view and not is_patches_plot:
+            # Must use the root dataset in order to retrieve colors for the
+            # plot, which is linked to samples, not patches
+            view = view._root_dataset
+
+        if is_patches_view and is_patches_plot:
+            # `label_field` is always provided with respect to root
+            # dataset, so we must translate for patches views
+            _, root = dataset._get_label_field_path(patches_field)
+            leaf = label_field[len(root) + 1 :]
+            _, label_field = view._get_label_field_path(patches_field, leaf)
+
+        labels = view._get_values_by_id(
+            label_field, ids, link_field=patches_field
+        )
+
+        field = view.get_field(label_field)
+        if isinstance(field, fof.FloatField):
+            style = "continuous"
+        else:
+            if len(set(labels)) <= MAX_CATEGORIES:
+                style = "categorical"
+            else:
+                style = "continuous"
+    else:
+        labels = None
+        style = "uncolored"
+
+    return {
+        "points": points,
+        "ids": ids,
+        "sample_ids": sample_ids,
+        "labels": labels,
+        "style": style,
+        "index_size": index_size,
+        "available_count": available_count,
+        "missing_count": missing_count,
+        "patches_field": patches_field,
+    }
+
+
+def _make_traces(plot, inds):
+    points = plot["points"]
+    ids = plot["ids"]
+    sample_ids = plot["sample_ids"]
+    labels = plot["labels"]
+    style = plot["style"]
+
+    traces = {}
+    for idx in inds:
+        _add_to_trace(
+            traces,
+            style,
+            points[idx],
+            ids[idx],
+            sample_ids[idx] if sample_ids is not None else None,
+            labels[idx] if labels is not None else None,
+            True,
+        )
+
+    return traces
+
+
+def _get_bounds(points):
+    if points.size == 0:
+        return None
+
+    return [points.min(axis=0).tolist(), points.max(axis=0).tolist()]
+
+
+def _get_box_inds(points, bounds):
+    mins, maxs = np.asarray(bounds, dtype=float)
+    ndim = len(mins)
+    mask = np.all(
+        (points[:, :ndim] >= mins) & (points[:, :ndim] <= maxs), axis=1
+    )
+    return np.flatnonzero(mask)
+
+
+def _get_lod_inds(points, inds, max_points):
+    # Downsamples `inds` to at most `max_points` representative points by
+    # keeping one point per occupied cell of a uniform grid over the extent
+    # of the points
+    if max_points is None or len(inds) <= max_points:
+        return inds
+
+    _points = points[inds]
+    ndim = _points.shape[1]
+    grid_size = max(1, int(max_points ** (1.0 / ndim)))
+
+    mins = _points.min(axis=0)
+    extent = _points.max(axis=0) - mins
+    extent[extent == 0] = 1
+
+    cells = ((_points - mins) / extent * grid_size).astype(int)
+    np.minimum(cells, grid_size - 1, out=cells)
+    cell_ids = np.ravel_multi_index(cells.T, (grid_size,) * ndim)
+
+    _, first_inds = np.unique(cell_ids, return_index=True)
+
+    return inds[np.sort(first_inds)]
+
+
 def _add_to_trace(traces, style, points, id, sample_id, label, selected):
     key = label if style == "categorical" else "points"
     if key not in traces:
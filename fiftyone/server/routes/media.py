@@ -5,6 +5,7 @@ FiftyOne Server /media route
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+import logging
 import typing as t
 
 import aiofiles
@@ -19,6 +20,16 @@ from starlette.responses import (
     guess_type,
 )
 
+import fiftyone.server.thumbnails as fost
+
+
+logger = logging.getLogger(__name__)
+
+
+def _is_image(path: str) -> bool:
+    media_type = guess_type(path)[0]
+    return media_type is not None and media_type.startswith("image/")
+
 
 async def ranged(
     file: AsyncBufferedReader,
@@ -54,9 +65,21 @@ async def ranged(
 class Media(HTTPEndpoint):
     async def get(
         self, request: Request
-    ) -> t.Union[FileResponse, StreamingResponse]:
+    ) -> t.Union[FileResponse, Response, StreamingResponse]:
         path = request.query_params["filepath"]
 
+        try:
+            thumbnail = fost.parse_thumbnail_size(
+                request.query_params.get("thumbnail", None)
+            )
+        except ValueError as e:
+            return Response(content=str(e), status_code=400)
+
+        if thumbnail is not None and _is_image(path):
+            response = await self.thumbnail_response(path, thumbnail, request)
+            if response is not None:
+                return response
+
         response: t.Union[FileResponse, StreamingResponse]
         if request.headers.get("range"):
             response = await self.ranged_file_response(path, request)
@@ -68,6 +91,27 @@ class Media(HTTPEndpoint):
 
         return response
 
+    async def thumbnail_response(
+        self, path: str, size: int, request: Request
+    ) -> t.Optional[FileResponse]:
+        fmt = fost.parse_thumbnail_format(request.headers.get("accept"))
+
+        try:
+            thumbnail_path = await fost.get_thumbnail_cache().get(
+                path, size, fmt=fmt
+            )
+        except Exception as e:
+            # Fall back to serving the original media
+            logger.debug("Failed to generate thumbnail for '%s': %s", path, e)
+            return None
+
+        response = FileResponse(
+            thumbnail_path, media_type=fost.get_media_type(fmt)
+        )
+        response.headers["Vary"] = "Accept"
+
+        return response
+
     async def ranged_file_response(
         self, path: str, request: Request
     ) -> StreamingResponse:
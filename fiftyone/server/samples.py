@@ -6,14 +6,21 @@ FiftyOne Server samples pagination
 |
 """
 import asyncio
+import base64
+from datetime import datetime
+import math
+
+from bson import json_util, ObjectId
 import strawberry as gql
 import typing as t
 
 
 from fiftyone.core.collections import SampleCollection
 from fiftyone.core.expressions import ViewField as F
+import fiftyone.core.fields as fof
 import fiftyone.core.media as fom
 import fiftyone.core.odm as foo
+import fiftyone.core.stages as fosg
 from fiftyone.server.filters import SampleFilter
 
 import fiftyone.server.metadata as fosm
@@ -99,20 +106,44 @@ async def paginate_samples(
     # full datasets.
     full_lookup = media == fom.VIDEO and (filters or stages)
     support = [1, 1] if not full_lookup else None
-    if after is None:
-        after = "-1"
-
-    if int(after) > -1:
-        view = view.skip(int(after) + 1)
-
-    pipeline = view._pipeline(
-        attach_frames=media == fom.VIDEO,
-        detach_frames=False,
-        manual_group_select=sample_filter
-        and sample_filter.group
-        and (sample_filter.group.id and not sample_filter.group.slices),
-        support=support,
-    )
+
+    # When the view is sorted by fields, pages are resumed via a range
+    # `$match` on the last seen sort keys rather than via `$skip`
+    keys = _get_keyset_keys(view)
+    index, keyset = _parse_cursor(after, keys)
+
+    def get_pipeline(view):
+        return view._pipeline(
+            attach_frames=media == fom.VIDEO,
+            detach_frames=False,
+            manual_group_select=sample_filter
+            and sample_filter.group
+            and (sample_filter.group.id and not sample_filter.group.slices),
+            support=support,
+        )
+
+    # Resuming via keysets is only efficient if an index on the sort keys
+    # exists, such as the one created by `SortBy`. Indexes are never created
+    # here, since this would modify the dataset as a side effect of a read
+    if keys is not None and not _has_keyset_index(view, keys):
+        keys = None
+
+    pipeline = None
+    if keys is not None:
+        if keyset is None and index > -1:
+            _view = view.skip(index + 1)
+        else:
+            _view = view
+
+        pipeline = _add_keyset_stages(get_pipeline(_view), keys, keyset)
+
+    if pipeline is None:
+        keys = None
+        keyset = None
+        if index > -1:
+            view = view.skip(index + 1)
+
+        pipeline = get_pipeline(view)
 
     # Only return the first frame of each video sample for the grid thumbnail
     if media == fom.VIDEO:
@@ -128,6 +159,10 @@ async def paginate_samples(
         samples = samples[:first]
         more = True
 
+    end_keyset = None
+    if keys is not None:
+        end_keyset = _make_keyset(samples, keys)
+
     metadata_cache = {}
     url_cache = {}
     nodes = await asyncio.gather(
@@ -142,16 +177,20 @@ async def paginate_samples(
         edges.append(
             Edge(
                 node=node,
-                cursor=str(idx + int(after) + 1),
+                cursor=str(idx + index + 1),
             )
         )
 
+    end_cursor = edges[-1].cursor if len(edges) > 1 else None
+    if end_cursor is not None and end_keyset is not None:
+        end_cursor = _encode_cursor(int(end_cursor), keys, end_keyset)
+
     return Connection(
         page_info=PageInfo(
             has_previous_page=False,
             has_next_page=more,
             start_cursor=edges[0].cursor if edges else None,
-            end_cursor=edges[-1].cursor if len(edges) > 1 else None,
+            end_cursor=end_cursor,
         ),
         edges=edges,
     )
@@ -179,3 +218,264 @@ async def _create_sample_item(
     )
 
     return from_dict(cls, {"id": sample["_id"], "sample": sample, **metadata})
+
+
+_KEYSET_FIELD = "_keyset"
+
+# Stages that may follow a sort without changing the relative order of the
+# samples that it outputs
+_KEYSET_SAFE_STAGES = (
+    fosg.ExcludeFields,
+    fosg.ExcludeLabels,
+    fosg.Exists,
+    fosg.FilterField,
+    fosg.FilterKeypoints,
+    fosg.FilterLabels,
+    fosg.LimitLabels,
+    fosg.MapLabels,
+    fosg.Match,
+    fosg.MatchFrames,
+    fosg.MatchLabels,
+    fosg.MatchTags,
+    fosg.SelectFields,
+    fosg.SelectLabels,
+    fosg.SetField,
+)
+
+_KEYSET_SAFE_MONGO_OPS = {"$addFields", "$match", "$project", "$set", "$unset"}
+
+_KEYSET_KEY_FIELDS = fof._PRIMITIVE_FIELDS + (fof.DateField,)
+
+# BSON comparison order of the types of sort keys that we support
+_KEYSET_TYPES = [
+    "null",
+    "number",
+    "string",
+    "object",
+    "array",
+    "binData",
+    "objectId",
+    "bool",
+    "date",
+    "timestamp",
+    "regex",
+]
+
+
+def _get_keyset_keys(view: SampleCollection):
+    stages = view._stages
+
+    sort_idx = None
+    for idx, stage in enumerate(stages):
+        if isinstance(stage, fosg.SortBy):
+            sort_idx = idx
+
+    if sort_idx is None:
+        return None
+
+    for stage in stages[sort_idx + 1 :]:
+        if isinstance(stage, fosg.Mongo):
+            if not all(
+                set(s.keys()) <= _KEYSET_SAFE_MONGO_OPS for s in stage.pipeline
+            ):
+                return None
+        elif not isinstance(stage, _KEYSET_SAFE_STAGES):
+            return None
+
+    stage = stages[sort_idx]
+    field_or_expr = stage._get_mongo_field_or_expr()
+    if not isinstance(field_or_expr, (list, tuple)):
+        field_or_expr = [(field_or_expr, 1)]
+
+    keys = []
+    for field_name, order in field_or_expr:
+        if not isinstance(field_name, str):
+            return None
+
+        field = view.get_field(field_name)
+        if not isinstance(field, _KEYSET_KEY_FIELDS):
+            return None
+
+        (
+            path,
+            is_frame_field,
+            unwind_list_fields,
+            other_list_fields,
+            _,
+        ) = view._parse_field_name(field_name)
+        if is_frame_field or unwind_list_fields or other_list_fields:
+            return None
+
+        if stage.reverse:
+            order = -order
+
+        keys.append((path, order))
+
+    # Sort ties are broken by ID so that every sample has a unique keyset
+    if "_id" not in set(path for path, _ in keys):
+        keys.append(("_id", -1 if stage.reverse else 1))
+
+    return keys
+
+
+def _has_keyset_index(view: SampleCollection, keys):
+    # The ID tie-breaker need not be indexed, since ties are resolved among
+    # the few samples that share the same sort keys
+    if len(keys) > 1 and keys[-1][0] == "_id":
+        keys = keys[:-1]
+
+    index_info = view._dataset._sample_collection.index_information()
+    reverse_keys = [(path, -order) for path, order in keys]
+    for info in index_info.values():
+        spec = [tuple(k) for k in info["key"][: len(keys)]]
+
+        # Indexes can be traversed in either direction
+        if spec == keys or spec == reverse_keys:
+            return True
+
+    return False
+
+
+def _parse_cursor(after: t.Optional[str], keys):
+    if after is None:
+        return -1, None
+
+    try:
+        return int(after), None
+    except ValueError:
+        pass
+
+    try:
+        d = json_util.loads(base64.urlsafe_b64decode(after.encode()))
+        index = d["index"]
+    except Exception:
+        raise ValueError("Invalid cursor '%s'" % after)
+
+    if keys is None or [list(k) for k in keys] != d["keys"]:
+        return index, None
+
+    return index, d["values"]
+
+
+def _encode_cursor(index: int, keys, keyset) -> str:
+    d = {
+        "index": index,
+        "keys": [list(k) for k in keys],
+        "values": keyset,
+    }
+    return base64.urlsafe_b64encode(json_util.dumps(d).encode()).decode()
+
+
+def _add_keyset_stages(pipeline: t.List[t.Dict], keys, keyset):
+    sort_idx = None
+    for idx, stage in enumerate(pipeline):
+        if "$sort" in stage:
+            sort_idx = idx
+
+    if sort_idx is None:
+        return None
+
+    sort = list(pipeline[sort_idx]["$sort"].items())
+    if sort != [tuple(k) for k in keys] and sort != [
+        tuple(k) for k in keys[:-1]
+    ]:
+        return None
+
+    # Add the ID tie-breaker to the sort
+    stages = [{"$sort": dict(keys)}]
+
+    if keyset is not None:
+        stages.append({"$match": _make_keyset_query(keys, keyset)})
+
+    stages.append(
+        {
+            "$set": {
+                _KEYSET_FIELD: [
+                    {"$ifNull": ["$" + path, None]} for path, _ in keys
+                ]
+            }
+        }
+    )
+
+    return pipeline[:sort_idx] + stages + pipeline[sort_idx + 1 :]
+
+
+def _make_keyset_query(keys, values):
+    # Matches samples whose keys are strictly after `values` in sort order,
+    # respecting MongoDB's comparison order across types
+    conditions = []
+    equal = {}
+    for (path, order), value in zip(keys, values):
+        after = _make_keyset_after(path, order, value)
+        if after:
+            if equal:
+                conditions.append({**equal, "$or": after})
+            else:
+                conditions.extend(after)
+
+        equal[path] = value
+
+    return {"$or": conditions}
+
+
+def _make_keyset_after(path: str, order: int, value):
+    value_type = _get_keyset_type(value)
+    type_idx = _KEYSET_TYPES.index(value_type)
+
+    if order > 0:
+        other_types = _KEYSET_TYPES[type_idx + 1 :]
+    else:
+        other_types = _KEYSET_TYPES[:type_idx]
+
+    conditions = []
+    if value_type != "null":
+        op = "$gt" if order > 0 else "$lt"
+        conditions.append({path: {op: value}})
+
+    if "null" in other_types:
+        conditions.append({path: None})
+        other_types = [t for t in other_types if t != "null"]
+
+    if other_types:
+        conditions.append({path: {"$type": other_types}})
+
+    return conditions
+
+
+def _get_keyset_type(value):
+    if value is None:
+        return "null"
+
+    if isinstance(value, bool):
+        return "bool"
+
+    if isinstance(value, (int, float)):
+        return "number"
+
+    if isinstance(value, str):
+        return "string"
+
+    if isinstance(value, ObjectId):
+        return "objectId"
+
+    if isinstance(value, datetime):
+        return "date"
+
+    return None
+
+
+def _make_keyset(samples: t.List[t.Dict], keys):
+    values = [sample.pop(_KEYSET_FIELD, None) for sample in samples]
+
+    if not values or values[-1] is None:
+        return None
+
+    last = values[-1]
+    for value in last:
+        if _get_keyset_type(value) is None:
+            return None
+
+        if isinstance(value, float) and math.isnan(value):
+            return None
+
+    return last
@@ -0,0 +1,300 @@
+"""
+FiftyOne Server thumbnails
+
+| Copyright 2017-2023, Voxel51, Inc.
+| `voxel51.com <https://voxel51.com/>`_
+|
+"""
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
+import threading
+import typing as t
+
+from PIL import Image
+
+import fiftyone as fo
+
+
+_FORMATS = {
+    "jpeg": ("JPEG", ".jpg", "image/jpeg"),
+    "webp": ("WEBP", ".webp", "image/webp"),
+}
+_MAX_THUMBNAIL_SIZE = 4096
+_QUALITY = 85
+_NUM_WORKERS = min(4, os.cpu_count() or 1)
+
+
+class ThumbnailCache(object):
+    """A bounded on-disk cache of downscaled image thumbnails.
+
+    Thumbnails are keyed by the source path, its modification time and file
+    size, and the requested thumbnail size and format, so editing a source
+    image automatically invalidates its thumbnails.
+
+    When the total size of the cache exceeds ``max_size`` bytes, the least
+    recently used thumbnails are deleted.
+
+    Args:
+        cache_dir: the directory in which to store thumbnails
+        max_size: the maximum total size of the cache, in bytes
+        num_workers (None): the number of worker threads to use to generate
+            thumbnails
+    """
+
+    def __init__(self, cache_dir, max_size, num_workers=None):
+        if num_workers is None:
+            num_workers = _NUM_WORKERS
+
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+        self._executor = ThreadPoolExecutor(max_workers=num_workers)
+        self._lock = threading.Lock()
+        self._entries = None
+        self._total_size = 0
+        self._pending = {}
+
+    async def get(self, path: str, size: int, fmt: str = "jpeg") -> str:
+        """Returns the path to a thumbnail of the given image, generating it
+        if necessary.
+
+        Args:
+            path: the path to the source image
+            size: the maximum width/height of the thumbnail, in pixels
+            fmt ("jpeg"): the thumbnail format, "jpeg" or "webp"
+
+        Returns:
+            the path to the thumbnail
+        """
+        # All disk I/O happens in the executor, so the event loop never
+        # blocks on the filesystem or on ``_lock``, which only worker threads
+        # acquire
+        loop = asyncio.get_running_loop()
+        key, thumbnail_path, hit = await loop.run_in_executor(
+            self._executor, self._lookup, path, size, fmt
+        )
+
+        if hit:
+            return thumbnail_path
+
+        # ``_pending`` is only accessed from the event loop and there is no
+        # ``await`` between checking and registering a future, so concurrent
+        # requests for the same thumbnail share a single generation task
+        future = self._pending.get(key, None)
+        if future is None:
+            future = loop.run_in_executor(
+                self._executor,
+                self._generate,
+                key,
+                path,
+                thumbnail_path,
+                size,
+                fmt,
+            )
+            self._pending[key] = future
+
+        try:
+            await asyncio.shield(future)
+        finally:
+            if self._pending.get(key, None) is future:
+                self._pending.pop(key)
+
+        return thumbnail_path
+
+    def close(self):
+        """Shuts down the cache's worker threads.
+
+        Thumbnails that are currently being generated are allowed to finish.
+        """
+        self._executor.shutdown(wait=False)
+
+    def clear(self):
+        """Deletes all thumbnails from the cache."""
+        with self._lock:
+            self._load_entries()
+            for key in list(self._entries.keys()):
+                self._delete(key)
+
+    def _lookup(self, path, size, fmt):
+        key, thumbnail_path = self._get_key(path, size, fmt)
+
+        with self._lock:
+            self._load_entries()
+            hit = key in self._entries
+            if hit:
+                self._entries.move_to_end(key)
+
+        if hit:
+            # Persist recency so LRU order survives server restarts
+            try:
+                os.utime(thumbnail_path)
+            except OSError:
+                pass
+
+        return key, thumbnail_path, hit
+
+    def _get_key(self, path, size, fmt):
+        stat = os.stat(path)
+        ext = _FORMATS[fmt][1]
+        h = hashlib.sha1(
+            (
+                "%s:%d:%d:%d:%s"
+                % (
+                    os.path.abspath(path),
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                    size,
+                    fmt,
+                )
+            ).encode()
+        ).hexdigest()
+        key = h + ext
+        return key, os.path.join(self.cache_dir, key[:2], key)
+
+    def _load_entries(self):
+        if self._entries is not None:
+            return
+
+        # Rebuild the index from disk, least recently used first
+        entries = []
+        if os.path.isdir(self.cache_dir):
+            for root, _, filenames in os.walk(self.cache_dir):
+                for filename in filenames:
+                    if filename.endswith(".tmp"):
+                        continue
+
+                    try:
+                        stat = os.stat(os.path.join(root, filename))
+                    except OSError:
+                        continue
+
+                    entries.append((stat.st_mtime, filename, stat.st_size))
+
+        entries.sort()
+
+        self._entries = OrderedDict((k, s) for _, k, s in entries)
+        self._total_size = sum(self._entries.values())
+
+    def _generate(self, key, path, thumbnail_path, size, fmt):
+        pil_format = _FORMATS[fmt][0]
+
+        with Image.open(path) as img:
+            # Lets the JPEG decoder downscale while decoding
+            img.draft("RGB", (size, size))
+            img.thumbnail((size, size))
+
+            if img.mode not in ("RGB", "L") and not (
+                fmt == "webp" and img.mode == "RGBA"
+            ):
+                img = img.convert("RGBA" if fmt == "webp" else "RGB")
+
+            os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+
+            # Write atomically so concurrent readers never see partial files
+            tmp_path = "%s.%d.tmp" % (thumbnail_path, threading.get_ident())
+            try:
+                img.save(tmp_path, format=pil_format, quality=_QUALITY)
+                os.replace(tmp_path, thumbnail_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        with self._lock:
+            self._load_entries()
+            if key in self._entries:
+                self._total_size -= self._entries.pop(key)
+
+            thumbnail_size = os.path.getsize(thumbnail_path)
+            self._entries[key] = thumbnail_size
+            self._total_size += thumbnail_size
+
+            # Never evict the thumbnail that was just generated
+            while self._total_size > self.max_size and len(self._entries) > 1:
+                self._delete(next(iter(self._entries)))
+
+    def _delete(self, key):
+        self._total_size -= self._entries.pop(key)
+        try:
+            os.remove(os.path.join(self.cache_dir, key[:2], key))
+        except OSError:
+            pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """Returns the server's :class:`ThumbnailCache`, which is configured via
+    ``fo.config.thumbnail_cache_dir`` and ``fo.config.thumbnail_cache_size``.
+
+    Returns:
+        a :class:`ThumbnailCache`
+    """
+    global _cache
+
+    with _cache_lock:
+        config = fo.config
+        if (
+            _cache is None
+            or _cache.cache_dir != config.thumbnail_cache_dir
+            or _cache.max_size != config.thumbnail_cache_size
+        ):
+            if _cache is not None:
+                _cache.close()
+
+            _cache = ThumbnailCache(
+                config.thumbnail_cache_dir, config.thumbnail_cache_size
+            )
+
+        return _cache
+
+
+def parse_thumbnail_size(value: t.Optional[str]) -> t.Optional[int]:
+    """Parses the ``thumbnail`` query parameter of a media request.
+
+    Args:
+        value: the raw query parameter value, or None
+
+    Returns:
+        the thumbnail size in pixels, or None if no thumbnail was requested
+    """
+    if value is None or value == "":
+        return None
+
+    size = int(value)
+    if size <= 0:
+        raise ValueError("Thumbnail size must be positive; found %d" % size)
+
+    return min(size, _MAX_THUMBNAIL_SIZE)
+
+
+def parse_thumbnail_format(accept: t.Optional[str]) -> str:
+    """Chooses the thumbnail format to serve based on a request's ``Accept``
+    header.
+
+    Args:
+        accept: the ``Accept`` header, or None
+
+    Returns:
+        "webp" if the client accepts WebP images, else "jpeg"
+    """
+    if accept and "image/webp" in accept:
+        return "webp"
+
+    return "jpeg"
+
+
+def get_media_type(fmt: str) -> str:
+    """Returns the MIME type of the given thumbnail format.
+
+    Args:
+        fmt: the thumbnail format
+
+    Returns:
+        the MIME type
+    """
+    return _FORMATS[fmt][2]
@@ -314,6 +314,8 @@ class ActivityNetDetectionResults(DetectionResults):
             ``num_iou_threshs x num_classes x num_recall``
         missing (None): a missing label string. Any unmatched segments are
             given this label for evaluation purposes
+        fingerprints (None): an optional dict mapping sample IDs to the
+            fingerprints of their labels, for use by incremental evaluations
         backend (None): a :class:`ActivityNetEvaluation` backend
     """
 
@@ -330,6 +332,7 @@ class ActivityNetDetectionResults(DetectionResults):
         classes,
         thresholds=None,
         missing=None,
+        fingerprints=None,
         backend=None,
     ):
         super().__init__(
@@ -339,6 +342,7 @@ class ActivityNetDetectionResults(DetectionResults):
             matches,
             classes=classes,
             missing=missing,
+            fingerprints=fingerprints,
             backend=backend,
         )
 
@@ -5,8 +5,11 @@ Base evaluation methods.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+import hashlib
 import itertools
+import logging
 
+from bson import json_util
 import numpy as np
 import sklearn.metrics as skm
 
@@ -14,6 +17,9 @@ import fiftyone.core.evaluation as foe
 import fiftyone.core.plots as fop
 
 
+logger = logging.getLogger(__name__)
+
+
 class BaseEvaluationResults(foe.EvaluationResults):
     """Base class for evaluation results.
 
@@ -32,6 +38,8 @@ class BaseEvaluationResults(foe.EvaluationResults):
             observed ground truth/predicted labels are used
         missing (None): a missing label string. Any None-valued labels are
             given this label for evaluation purposes
+        fingerprints (None): an optional dict mapping sample IDs to the
+            fingerprints of their labels, for use by incremental evaluations
         samples (None): the :class:`fiftyone.core.collections.SampleCollection`
             for which the results were computed
         backend (None): a :class:`fiftyone.core.evaluation.EvaluationMethod`
@@ -51,6 +59,7 @@ class BaseEvaluationResults(foe.EvaluationResults):
         ypred_ids=None,
         classes=None,
         missing=None,
+        fingerprints=None,
         backend=None,
     ):
         super().__init__(samples, config, eval_key, backend=backend)
@@ -72,6 +81,7 @@ class BaseEvaluationResults(foe.EvaluationResults):
         )
         self.classes = np.asarray(classes)
         self.missing = missing
+        self.fingerprints = fingerprints
 
     def report(self, classes=None):
         """Generates a classification report for the results via
@@ -372,6 +382,7 @@ class BaseEvaluationResults(foe.EvaluationResults):
         ypred_ids = d.get("ypred_ids", None)
         classes = d.get("classes", None)
         missing = d.get("missing", None)
+        fingerprints = d.get("fingerprints", None)
         return cls(
             samples,
             config,
@@ -384,10 +395,230 @@ class BaseEvaluationResults(foe.EvaluationResults):
             ypred_ids=ypred_ids,
             classes=classes,
             missing=missing,
+            fingerprints=fingerprints,
             **kwargs,
         )
 
 
+class _IncrementalEvaluation(object):
+    """Determines the samples that must be (re-)evaluated in order to
+    incrementally update an existing evaluation run.
+
+    Each sample's fingerprint is a hash of its contents in the given label
+    fields, excluding any attributes populated by evaluation runs. Samples
+    whose fingerprints match those stored in the previous run's results are
+    not re-evaluated.
+
+    Fingerprints are computed client-side from the raw label documents of
+    every sample, because they must also provide the IDs of the unchanged
+    labels whose previous results are reused. So incremental evaluation
+    avoids re-evaluating and re-writing unchanged samples, but not reading
+    their label fields.
+
+    Args:
+        eval_method: the :class:`fiftyone.core.evaluation.EvaluationMethod`
+            being run
+        samples: a :class:`fiftyone.core.collections.SampleCollection`
+        eval_key: the evaluation key
+        fields: the list of label fields involved in the evaluation
+    """
+
+    def __init__(self, eval_method, samples, eval_key, fields):
+        if eval_key is None:
+            raise ValueError(
+                "You must provide an `eval_key` in order to perform "
+                "incremental evaluation"
+            )
+
+        self.fields = fields
+        self.samples = samples
+        self.prev_results = _load_incremental_results(
+            eval_method, samples, eval_key
+        )
+        self.fingerprints = {}
+
+        self._label_ids = set()
+        self._num_empty = 0
+
+        if self.prev_results is None:
+            return
+
+        changed_ids = self._compute_fingerprints(
+            samples, prev_fingerprints=self.prev_results.fingerprints
+        )
+
+        num_samples = len(self.fingerprints)
+        num_changed = len(changed_ids)
+        if (
+            num_changed > _MAX_CHANGED_FRACTION * num_samples
+            or num_changed > _MAX_CHANGED_SAMPLES
+        ):
+            logger.info(
+                "Found %d/%d changed samples; performing full evaluation",
+                num_changed,
+                num_samples,
+            )
+            self.prev_results = None
+            self.fingerprints = {}
+            self._label_ids = set()
+            self._num_empty = 0
+            return
+
+        logger.info("Found %d/%d changed samples", num_changed, num_samples)
+        self.samples = samples.select(changed_ids)
+
+    def update_fingerprints(self):
+        """Records the fingerprints of the samples that were evaluated.
+
+        This method must be called after the samples in :attr:`samples` have
+        been evaluated.
+        """
+        self._compute_fingerprints(self.samples)
+
+    def get_unchanged_inds(self):
+        """Returns the indices of the entries in the previous run's results
+        that correspond to unchanged samples.
+
+        Returns:
+            a list of indices
+        """
+        if self.prev_results is None:
+            return []
+
+        ytrue_ids = self.prev_results.ytrue_ids
+        ypred_ids = self.prev_results.ypred_ids
+        label_ids = self._label_ids
+        num_empty = self._num_empty
+
+        inds = []
+        for idx, (ytrue_id, ypred_id) in enumerate(zip(ytrue_ids, ypred_ids)):
+            if ytrue_id is None and ypred_id is None:
+                # Entries without labels can't be attributed to a specific
+                # sample, but they are interchangeable
+                if num_empty > 0:
+                    inds.append(idx)
+                    num_empty -= 1
+            elif ytrue_id in label_ids or ypred_id in label_ids:
+                inds.append(idx)
+
+        return inds
+
+    def _compute_fingerprints(self, samples, prev_fingerprints=None):
+        exclude_keys = set()
+        for key in samples._root_dataset.list_evaluations():
+            exclude_keys.update((key, key + "_id", key + "_iou"))
+
+        num_fields = len(self.fields)
+        is_frame_field = samples._is_frame_field(self.fields[0])
+
+        paths = ["_id"] + list(self.fields)
+        if is_frame_field:
+            paths.append(samples._FRAMES_PREFIX + "frame_number")
+
+        changed_ids = []
+        for sample_id, *values in zip(*samples.values(paths, _raw=True)):
+            sample_id = str(sample_id)
+
+            if is_frame_field:
+                docs = list(zip(*values))
+            else:
+                docs = [tuple(values)]
+
+            docs = _strip_keys(docs, exclude_keys)
+            fingerprint = hashlib.sha1(
+                json_util.dumps(docs, sort_keys=True).encode()
+            ).hexdigest()
+
+            self.fingerprints[sample_id] = fingerprint
+
+            if prev_fingerprints is None:
+                continue
+
+            if prev_fingerprints.get(sample_id, None) != fingerprint:
+                changed_ids.append(sample_id)
+                continue
+
+            _add_label_ids(docs, self._label_ids)
+            self._num_empty += sum(
+                all(v is None for v in doc[:num_fields]) for doc in docs
+            )
+
+        return changed_ids
+
+
+_MAX_CHANGED_FRACTION = 0.5
+_MAX_CHANGED_SAMPLES = 250000
+
+
+def _load_incremental_results(eval_method, samples, eval_key):
+    if eval_key not in eval_method.list_runs(samples):
+        return None
+
+    try:
+        info = eval_method.get_run_info(samples, eval_key)
+    except:
+        return None
+
+    config_str = json_util.dumps(info.config.serialize(), sort_keys=True)
+    new_config_str = json_util.dumps(
+        eval_method.config.serialize(), sort_keys=True
+    )
+    if config_str != new_config_str:
+        logger.info(
+            "Evaluation '%s' has a different config; performing full "
+            "evaluation",
+            eval_key,
+        )
+        return None
+
+    run_doc = eval_method._get_run_doc(samples, eval_key)
+    view_stages = [
+        json_util.dumps(s)
+        for s in samples.view()._serialize(include_uuids=False)
+    ]
+    if list(run_doc.view_stages) != view_stages:
+        logger.info(
+            "Evaluation '%s' was performed on a different view; performing "
+            "full evaluation",
+            eval_key,
+        )
+        return None
+
+    results = eval_method.load_run_results(samples, eval_key)
+    if getattr(results, "fingerprints", None) is None:
+        logger.info(
+            "Evaluation '%s' has no fingerprints; performing full evaluation",
+            eval_key,
+        )
+        return None
+
+    return results
+
+
+def _strip_keys(value, keys):
+    if isinstance(value, dict):
+        return {
+            k: _strip_keys(v, keys) for k, v in value.items() if k not in keys
+        }
+
+    if isinstance(value, (list, tuple)):
+        return [_strip_keys(v, keys) for v in value]
+
+    return value
+
+
+def _add_label_ids(value, label_ids):
+    if isinstance(value, dict):
+        if "_id" in value:
+            label_ids.add(str(value["_id"]))
+
+        for v in value.values():
+            _add_label_ids(v, label_ids)
+    elif isinstance(value, list):
+        for v in value:
+            _add_label_ids(v, label_ids)
+
+
 def _parse_labels(ytrue, ypred, classes, missing):
     if classes is None:
         classes = set(ytrue) | set(ypred)
@@ -5,6 +5,7 @@ Classification evaluation.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+from collections import defaultdict
 import itertools
 import warnings
 
@@ -19,7 +20,7 @@ import fiftyone.core.plots as fop
 import fiftyone.core.utils as fou
 import fiftyone.core.validation as fov
 
-from .base import BaseEvaluationResults
+from .base import BaseEvaluationResults, _IncrementalEvaluation
 
 
 def evaluate_classifications(
@@ -30,6 +31,7 @@ def evaluate_classifications(
     classes=None,
     missing=None,
     method="simple",
+    incremental=False,
     **kwargs,
 ):
     """Evaluates the classification predictions in the given collection with
@@ -74,6 +76,14 @@ def evaluate_classifications(
             given this label for results purposes
         method ("simple"): a string specifying the evaluation method to use.
             Supported values are ``("simple", "binary", "top-k")``
+        incremental (False): whether to incrementally update an existing
+            evaluation with key ``eval_key`` by only re-evaluating samples
+            whose ``pred_field`` or ``gt_field`` contents have changed since
+            the last evaluation that was run with ``incremental=True``. A full
+            evaluation is performed if no such evaluation exists or if it was
+            performed with a different config or view. Note that detecting
+            changes requires reading the ``pred_field`` and ``gt_field``
+            contents of every sample
         **kwargs: optional keyword arguments for the constructor of the
             :class:`ClassificationEvaluationConfig` being used
 
@@ -88,12 +98,31 @@ def evaluate_classifications(
     eval_method = config.build()
     eval_method.ensure_requirements()
 
-    eval_method.register_run(samples, eval_key)
+    if incremental:
+        inc = _IncrementalEvaluation(
+            eval_method, samples, eval_key, [gt_field, pred_field]
+        )
+        _samples = inc.samples
+    else:
+        inc = None
+        _samples = samples
+
+    # Incremental updates must preserve the existing run's fields
+    if inc is None or inc.prev_results is None:
+        eval_method.register_run(samples, eval_key)
+
     eval_method.register_samples(samples, eval_key)
 
     results = eval_method.evaluate_samples(
-        samples, eval_key=eval_key, classes=classes, missing=missing
+        _samples, eval_key=eval_key, classes=classes, missing=missing
     )
+
+    if inc is not None:
+        inc.update_fingerprints()
+        results = _merge_results(
+            inc, results, samples, eval_key, classes, missing
+        )
+
     eval_method.save_run_results(samples, eval_key, results)
 
     return results
@@ -373,40 +402,73 @@ class TopKEvaluation(ClassificationEvaluation):
         is_frame_field = samples._is_frame_field(gt_field)
         k = self.config.k
 
-        # This extracts a potentially huge number of logits
-        # @todo consider sample iteration for very large datasets?
-        ytrue, ytrue_ids, ypred, ypred_ids, logits = samples.values(
+        ytrue, ytrue_ids, ypred, ypred_ids = samples.values(
             [
                 gt_field + ".label",
                 gt_field + ".id",
                 pred_field + ".label",
                 pred_field + ".id",
-                pred_field + ".logits",
             ]
         )
 
         targets_map = {label: idx for idx, label in enumerate(classes)}
 
         if is_frame_field:
-            confs = []
-            correct = []
-            for _ytrue, _ypred, _logits in zip(ytrue, ypred, logits):
-                _confs, _correct = _evaluate_top_k(
-                    _ytrue, _ypred, _logits, k, targets_map
-                )
-                confs.append(_confs)
-                correct.append(_correct)
+            counts = [len(_ytrue) for _ytrue in ytrue]
 
             ytrue = list(itertools.chain.from_iterable(ytrue))
             ytrue_ids = list(itertools.chain.from_iterable(ytrue_ids))
             ypred = list(itertools.chain.from_iterable(ypred))
             ypred_ids = list(itertools.chain.from_iterable(ypred_ids))
-            confs = list(itertools.chain.from_iterable(confs))
+
+        # Logits are potentially huge, so they are streamed from the database
+        # and evaluated in batches of samples
+        logits_field = samples.get_field(pred_field + ".logits")
+        if is_frame_field:
+            logits_path = pred_field[len(samples._FRAMES_PREFIX) :] + ".logits"
         else:
-            confs, correct = _evaluate_top_k(
-                ytrue, ypred, logits, k, targets_map
+            logits_path = pred_field + ".logits"
+
+        _samples = samples.select_fields(pred_field)
+        cursor = _samples._aggregate(attach_frames=is_frame_field)
+
+        confs = []
+        _correct = []
+        idx = 0
+        for batch in fou.iter_batches(cursor, _TOP_K_BATCH_SAMPLES):
+            if is_frame_field:
+                logits = [
+                    _get_logits(frame, logits_path, logits_field)
+                    for d in batch
+                    for frame in d.get("frames", None) or []
+                ]
+            else:
+                logits = [
+                    _get_logits(d, logits_path, logits_field) for d in batch
+                ]
+
+            num_logits = len(logits)
+            _ytrue = ytrue[idx : idx + num_logits]
+            _ypred = ypred[idx : idx + num_logits]
+
+            batch_confs, batch_correct = _evaluate_top_k(
+                _ytrue, _ypred, logits, k, targets_map
             )
 
+            ypred[idx : idx + num_logits] = _ypred
+            confs.extend(batch_confs)
+            _correct.extend(batch_correct)
+            idx += num_logits
+
+        if is_frame_field:
+            correct = []
+            idx = 0
+            for count in counts:
+                correct.append(_correct[idx : idx + count])
+                idx += count
+        else:
+            correct = _correct
+
         results = ClassificationResults(
             samples,
             self.config,
@@ -440,15 +502,37 @@ class TopKEvaluation(ClassificationEvaluation):
         return results
 
 
+# The number of samples whose logits are loaded from the database at once
+_TOP_K_BATCH_SAMPLES = 1000
+
+# The maximum number of logits to process in a single batch
+_TOP_K_BATCH_ELEMENTS = 10000000
+
+
+def _get_logits(d, path, field):
+    for key in path.split("."):
+        if d is None:
+            return None
+
+        d = d.get(key, None)
+
+    if d is None:
+        return None
+
+    return field.to_python(d)
+
+
 def _evaluate_top_k(ytrue, ypred, logits, k, targets_map):
-    confs = []
-    correct = []
+    num_samples = len(ytrue)
+    confs = [None] * num_samples
+    correct = [False] * num_samples
+
+    # Group the samples whose logits must be processed by number of logits
+    inds_map = defaultdict(list)
     for idx, (_ytrue, _logits) in enumerate(zip(ytrue, logits)):
         if _logits is None:
             # No logits; no prediction
             ypred[idx] = None
-            _conf = None
-            _correct = False
             msg = (
                 "Found sample(s) with no logits. Logits are required to "
                 + "compute top-k accuracy"
@@ -456,55 +540,85 @@ def _evaluate_top_k(ytrue, ypred, logits, k, targets_map):
             warnings.warn(msg)
         elif _ytrue is None:
             # Missing ground truth
-            _correct = ypred[idx] is None
-            _conf = None
+            correct[idx] = ypred[idx] is None
         else:
-            try:
-                target = targets_map[_ytrue]
-            except KeyError:
-                raise ValueError(
-                    "Found ground truth label '%s' not in provided classes"
-                    % _ytrue
-                )
-
-            if k >= len(_logits):
-                found = True
-            else:
-                top_k = np.argpartition(_logits, -k)[-k:]
-                found = target in top_k
-
-            if found:
-                # Truth is in top-k; use it
-                ypred[idx] = _ytrue
-                logit = _logits[target]
-                _correct = True
-            elif ypred[idx] is not None:
-                # Truth is not in top-k; retain actual prediction
-                _ypred = ypred[idx]
-
-                try:
-                    _pred_idx = targets_map[_ypred]
-                except KeyError:
-                    raise ValueError(
-                        "Found predicted label '%s' not in provided classes"
-                        % _ypred
-                    )
-
-                logit = _logits[_pred_idx]
-                _correct = False
-            else:
-                # Missing prediction
-                logit = -np.inf
-                _correct = False
+            inds_map[len(_logits)].append(idx)
 
-            _conf = np.exp(logit) / np.sum(np.exp(_logits))
+    for num_logits, inds in inds_map.items():
+        # Limit the size of the logits arrays that are processed at once
+        batch_size = max(1, _TOP_K_BATCH_ELEMENTS // max(num_logits, 1))
 
-        confs.append(_conf)
-        correct.append(_correct)
+        for batch_inds in fou.iter_batches(inds, batch_size):
+            _logits = np.stack([logits[idx] for idx in batch_inds])
+            if not np.issubdtype(_logits.dtype, np.floating):
+                _logits = _logits.astype(float)
+
+            _ytrue = [ytrue[idx] for idx in batch_inds]
+            _ypred = [ypred[idx] for idx in batch_inds]
+
+            _confs, _found = _evaluate_top_k_batch(
+                _ytrue, _ypred, _logits, k, targets_map
+            )
+
+            for idx, conf, found in zip(batch_inds, _confs, _found):
+                if found:
+                    # Truth is in top-k; use it
+                    ypred[idx] = ytrue[idx]
+
+                confs[idx] = conf
+                correct[idx] = found
 
     return confs, correct
 
 
+def _evaluate_top_k_batch(ytrue, ypred, logits, k, targets_map):
+    targets = []
+    for _ytrue in ytrue:
+        try:
+            targets.append(targets_map[_ytrue])
+        except KeyError:
+            raise ValueError(
+                "Found ground truth label '%s' not in provided classes"
+                % _ytrue
+            )
+
+    targets = np.array(targets, dtype=int)
+
+    # -1 denotes a missing prediction and -2 denotes an unknown class
+    pred_inds = np.array(
+        [-1 if p is None else targets_map.get(p, -2) for p in ypred],
+        dtype=int,
+    )
+
+    num_logits = logits.shape[1]
+    if k >= num_logits:
+        found = np.ones(len(targets), dtype=bool)
+    else:
+        top_k = np.argpartition(logits, -k, axis=1)[:, -k:]
+        found = (top_k == targets[:, np.newaxis]).any(axis=1)
+
+    # Truth is not in top-k; retain actual prediction
+    unknown = ~found & (pred_inds == -2)
+    if unknown.any():
+        _ypred = ypred[np.flatnonzero(unknown)[0]]
+        raise ValueError(
+            "Found predicted label '%s' not in provided classes" % _ypred
+        )
+
+    inds = np.where(found, targets, pred_inds)
+    logit = logits[np.arange(len(inds)), np.maximum(inds, 0)]
+
+    # Missing prediction
+    logit[inds == -1] = -np.inf
+
+    # Subtract the row maximums so that large logits do not overflow
+    max_logits = logits.max(axis=1)
+    exp_logits = np.exp(logits - max_logits[:, np.newaxis])
+    confs = np.exp(logit - max_logits) / np.sum(exp_logits, axis=1)
+
+    return confs.tolist(), found.tolist()
+
+
 class BinaryEvaluationConfig(ClassificationEvaluationConfig):
     """Binary evaluation config.
 
@@ -672,6 +786,8 @@ class ClassificationResults(BaseEvaluationResults):
             observed ground truth/predicted labels are used
         missing (None): a missing label string. Any None-valued labels are
             given this label for evaluation purposes
+        fingerprints (None): an optional dict mapping sample IDs to the
+            fingerprints of their labels, for use by incremental evaluations
         backend (None): a :class:`ClassificationEvaluation` backend
     """
 
@@ -695,6 +811,8 @@ class BinaryClassificationResults(ClassificationResults):
         weights (None): an optional list of sample weights
         ytrue_ids (None): a list of IDs for the ground truth labels
         ypred_ids (None): a list of IDs for the predicted labels
+        fingerprints (None): an optional dict mapping sample IDs to the
+            fingerprints of their labels, for use by incremental evaluations
         backend (None): a :class:`ClassificationEvaluation` backend
     """
 
@@ -710,6 +828,7 @@ class BinaryClassificationResults(ClassificationResults):
         weights=None,
         ytrue_ids=None,
         ypred_ids=None,
+        fingerprints=None,
         backend=None,
     ):
         super().__init__(
@@ -724,6 +843,7 @@ class BinaryClassificationResults(ClassificationResults):
             ypred_ids=ypred_ids,
             classes=classes,
             missing=classes[0],
+            fingerprints=fingerprints,
             backend=backend,
         )
 
@@ -843,6 +963,7 @@ class BinaryClassificationResults(ClassificationResults):
         weights = d.get("weights", None)
         ytrue_ids = d.get("ytrue_ids", None)
         ypred_ids = d.get("ypred_ids", None)
+        fingerprints = d.get("fingerprints", None)
         return cls(
             samples,
             config,
@@ -854,10 +975,52 @@ class BinaryClassificationResults(ClassificationResults):
             weights=weights,
             ytrue_ids=ytrue_ids,
             ypred_ids=ypred_ids,
+            fingerprints=fingerprints,
             **kwargs,
         )
 
 
+def _merge_results(inc, results, samples, eval_key, classes, missing):
+    prev_results = inc.prev_results
+    inds = inc.get_unchanged_inds()
+
+    if not inds:
+        results.fingerprints = inc.fingerprints
+        return results
+
+    d = results.serialize()
+    for attr in (
+        "ytrue",
+        "ypred",
+        "confs",
+        "weights",
+        "ytrue_ids",
+        "ypred_ids",
+    ):
+        values = getattr(results, attr)
+        prev_values = getattr(prev_results, attr)
+        if values is None or prev_values is None:
+            continue
+
+        d[attr] = np.concatenate([prev_values[inds], values]).tolist()
+
+    # Restore missing labels so that `classes` and `missing` are re-applied
+    for attr in ("ytrue", "ypred"):
+        ids = d[attr + "_ids"]
+        if ids is not None:
+            d[attr] = [
+                y if i is not None else None for y, i in zip(d[attr], ids)
+            ]
+
+    d["classes"] = classes
+    d["missing"] = missing
+    d["fingerprints"] = inc.fingerprints
+
+    return type(results)._from_dict(
+        d, samples, results.config, eval_key, backend=results.backend
+    )
+
+
 def _parse_config(pred_field, gt_field, method, **kwargs):
     if method is None:
         method = "simple"
@@ -13,6 +13,7 @@ import numpy as np
 import eta.core.utils as etau
 
 import fiftyone.core.plots as fop
+import fiftyone.core.utils as fou
 import fiftyone.utils.iou as foui
 
 from .detection import (
@@ -246,6 +247,8 @@ class COCODetectionResults(DetectionResults):
             ``num_iou_threshs x num_classes x num_recall``
         missing (None): a missing label string. Any unmatched objects are
             given this label for evaluation purposes
+        fingerprints (None): an optional dict mapping sample IDs to the
+            fingerprints of their labels, for use by incremental evaluations
         backend (None): a :class:`COCOEvaluation` backend
     """
 
@@ -261,6 +264,7 @@ class COCODetectionResults(DetectionResults):
         classes,
         thresholds=None,
         missing=None,
+        fingerprints=None,
         backend=None,
     ):
         super().__init__(
@@ -270,6 +274,7 @@ class COCODetectionResults(DetectionResults):
             matches,
             classes=classes,
             missing=missing,
+            fingerprints=fingerprints,
             backend=backend,
         )
 
@@ -638,65 +643,46 @@ def _compute_pr_curves(samples, config, classes=None):
     pred_field = config.pred_field
     iou_threshs = config.iou_threshs
 
-    samples = samples.select_fields([gt_field, pred_field])
+    _, processing_frames = samples._handle_frame_field(gt_field)
 
-    gt_field, processing_frames = samples._handle_frame_field(gt_field)
-    pred_field, _ = samples._handle_frame_field(pred_field)
+    # The labels returned by `values()` are copies, so the sweep does not edit
+    # the user's data
+    gts, preds = samples.values([gt_field, pred_field])
 
-    num_threshs = len(iou_threshs)
-    thresh_matches = [{} for _ in range(num_threshs)]
-
-    if classes is None:
-        _classes = set()
+    thresh_inds = []
+    gt_labels = []
+    pred_labels = []
+    confs = []
+    crowds = []
 
     logger.info("Performing IoU sweep...")
-    for sample in samples.iter_samples(progress=True):
-        if processing_frames:
-            images = sample.frames.values()
-        else:
-            images = [sample]
-
-        for image in images:
-            # Don't edit user's data during sweep
-            gts = _copy_labels(image[gt_field])
-            preds = _copy_labels(image[pred_field])
-
-            matches_list = _coco_evaluation_iou_sweep(gts, preds, config)
-
-            for idx, matches in enumerate(matches_list):
-                for match in matches:
-                    gt_label = match[0]
-                    pred_label = match[1]
-                    iscrowd = match[-1]
-
-                    if classes is None:
-                        _classes.add(gt_label)
-                        _classes.add(pred_label)
-
-                    if iscrowd:
-                        continue
-
-                    c = gt_label if gt_label is not None else pred_label
-
-                    if c not in thresh_matches[idx]:
-                        thresh_matches[idx][c] = {
-                            "tp": [],
-                            "fp": [],
-                            "num_gt": 0,
-                        }
-
-                    if gt_label == pred_label:
-                        thresh_matches[idx][c]["tp"].append(match)
-                    elif pred_label:
-                        thresh_matches[idx][c]["fp"].append(match)
+    with fou.ProgressBar(total=len(gts)) as pb:
+        for sample_gts, sample_preds in pb(zip(gts, preds)):
+            if processing_frames:
+                images = zip(sample_gts, sample_preds)
+            else:
+                images = [(sample_gts, sample_preds)]
+
+            for image_gts, image_preds in images:
+                matches_list = _coco_evaluation_iou_sweep(
+                    image_gts, image_preds, config
+                )
 
-                    if gt_label:
-                        thresh_matches[idx][c]["num_gt"] += 1
+                for idx, matches in enumerate(matches_list):
+                    thresh_inds.extend([idx] * len(matches))
+                    for match in matches:
+                        gt_labels.append(match[0])
+                        pred_labels.append(match[1])
+                        confs.append(match[3])
+                        crowds.append(match[-1])
 
     if classes is None:
+        _classes = set(gt_labels)
+        _classes.update(pred_labels)
         _classes.discard(None)
         classes = sorted(_classes)
 
+    num_threshs = len(iou_threshs)
     num_classes = len(classes)
     class_idx_map = {c: idx for idx, c in enumerate(classes)}
 
@@ -705,53 +691,83 @@ def _compute_pr_curves(samples, config, classes=None):
     precision = -np.ones((num_threshs, num_classes, 101))
     thresholds = -np.ones((num_threshs, num_classes, 101))
     recall = np.linspace(0, 1, 101)
-    for idx, _thresh_matches in enumerate(thresh_matches):
-        for c, matches in _thresh_matches.items():
-            c_idx = class_idx_map.get(c, None)
-            num_gt = matches["num_gt"]
-
-            if c_idx is None or num_gt == 0:
-                continue
-
-            tp = matches["tp"]
-            fp = matches["fp"]
-            tp_fp = np.array([1] * len(tp) + [0] * len(fp))
-            confs = np.array([m[3] for m in tp] + [m[3] for m in fp])
-            if None in confs:
-                raise ValueError(
-                    "All predicted objects must have their `confidence` "
-                    "attribute populated in order to compute precision-recall "
-                    "curves"
-                )
 
-            inds = np.argsort(-confs, kind="mergesort")
-            tp_fp = tp_fp[inds]
-            confs = confs[inds]
+    if not thresh_inds or num_classes == 0:
+        return precision, recall, thresholds, iou_threshs, classes
+
+    # Each match is assigned to the class of its ground truth object, if any,
+    # and crowd matches are ignored
+    class_inds = np.array(
+        [
+            class_idx_map.get(g if g is not None else p, -1)
+            for g, p in zip(gt_labels, pred_labels)
+        ],
+        dtype=int,
+    )
+    is_gt = np.array([g is not None for g in gt_labels], dtype=bool)
+    is_pred = np.array([p is not None for p in pred_labels], dtype=bool)
+    is_tp = np.array(
+        [g == p for g, p in zip(gt_labels, pred_labels)], dtype=bool
+    )
+    valid = (class_inds >= 0) & ~np.array(crowds, dtype=bool)
+
+    # Flat (IoU threshold, class) indexes
+    groups = np.array(thresh_inds, dtype=int) * num_classes + class_inds
+    num_groups = num_threshs * num_classes
+
+    num_gt = np.bincount(groups[valid & is_gt], minlength=num_groups)
+
+    # Curves are only computed for classes with ground truth objects
+    precision.reshape(num_groups, 101)[num_gt > 0] = 0
+    thresholds.reshape(num_groups, 101)[num_gt > 0] = 0
+
+    keep = valid & is_pred
+    keep[keep] = num_gt[groups[keep]] > 0
+
+    confs = np.array(confs, dtype=object)[keep]
+    if any(c is None for c in confs):
+        raise ValueError(
+            "All predicted objects must have their `confidence` "
+            "attribute populated in order to compute precision-recall "
+            "curves"
+        )
+
+    groups = groups[keep]
+    confs = confs.astype(float)
+    is_tp = is_tp[keep]
+
+    # Sort by group, then by descending confidence, with true positives first
+    # in the event of ties
+    inds = np.lexsort((~is_tp, -confs, groups))
+    groups = groups[inds]
+    confs = confs[inds]
+    is_tp = is_tp[inds]
+
+    ugroups, starts = np.unique(groups, return_index=True)
+    ends = np.append(starts[1:], len(groups))
 
-            tp_sum = np.cumsum(tp_fp).astype(dtype=float)
-            total = np.arange(1, len(tp_fp) + 1).astype(dtype=float)
+    for group, start, end in zip(ugroups, starts, ends):
+        idx, c_idx = divmod(group, num_classes)
 
-            pre = tp_sum / total
-            rec = tp_sum / num_gt
+        tp_sum = np.cumsum(is_tp[start:end], dtype=float)
+        total = np.arange(1, end - start + 1, dtype=float)
 
-            for i in range(len(pre) - 1, 0, -1):
-                if pre[i] > pre[i - 1]:
-                    pre[i - 1] = pre[i]
+        pre = tp_sum / total
+        rec = tp_sum / num_gt[group]
 
-            q = np.zeros(101)
-            t = np.zeros(101)
+        # Make precision monotonically decreasing
+        pre = np.maximum.accumulate(pre[::-1])[::-1]
 
-            inds = np.searchsorted(rec, recall, side="left")
+        q = np.zeros(101)
+        t = np.zeros(101)
 
-            try:
-                for ri, pi in enumerate(inds):
-                    q[ri] = pre[pi]
-                    t[ri] = confs[pi]
-            except:
-                pass
+        inds = np.searchsorted(rec, recall, side="left")
+        found = inds < len(pre)
+        q[found] = pre[inds[found]]
+        t[found] = confs[start:end][inds[found]]
 
-            precision[idx][c_idx] = q
-            thresholds[idx][c_idx] = t
+        precision[idx][c_idx] = q
+        thresholds[idx][c_idx] = t
 
     return precision, recall, thresholds, iou_threshs, classes
 
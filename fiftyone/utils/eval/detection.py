@@ -12,11 +12,13 @@ import numpy as np
 
 import fiftyone.core.evaluation as foe
 import fiftyone.core.fields as fof
+import fiftyone.core.frame as fofr
 import fiftyone.core.labels as fol
+import fiftyone.core.sample as fos
 import fiftyone.core.utils as fou
 import fiftyone.core.validation as fov
 
-from .base import BaseEvaluationResults
+from .base import BaseEvaluationResults, _IncrementalEvaluation
 
 
 logger = logging.getLogger(__name__)
@@ -35,6 +37,8 @@ def evaluate_detections(
     use_boxes=False,
     classwise=True,
     dynamic=True,
+    num_workers=None,
+    incremental=False,
     **kwargs,
 ):
     """Evaluates the predicted detections in the given samples with respect to
@@ -127,6 +131,19 @@ def evaluate_detections(
             label (True) or allow matches between classes (False)
         dynamic (True): whether to declare the dynamic object-level attributes
             that are populated on the dataset's schema
+        num_workers (None): the number of processes to use to match objects.
+            By default, matching is performed in the main process. Only
+            applicable when the evaluation method does not require fields
+            besides ``pred_field`` and ``gt_field``
+        incremental (False): whether to incrementally update an existing
+            evaluation with key ``eval_key`` by only re-evaluating samples
+            whose ``pred_field`` or ``gt_field`` contents have changed since
+            the last evaluation that was run with ``incremental=True``. A full
+            evaluation is performed if no such evaluation exists or if it was
+            performed with a different config or view. Any IoU sweeps
+            required to compute mAP are always performed on all samples. Note
+            that detecting changes requires reading the ``pred_field`` and
+            ``gt_field`` contents of every sample
         **kwargs: optional keyword arguments for the constructor of the
             :class:`DetectionEvaluationConfig` being used
 
@@ -161,54 +178,54 @@ def evaluate_detections(
     eval_method = config.build()
     eval_method.ensure_requirements()
 
-    eval_method.register_run(samples, eval_key)
+    if incremental:
+        if config.requires_additional_fields:
+            raise ValueError(
+                "Evaluation method '%s' does not support incremental "
+                "evaluation" % config.method
+            )
+
+        inc = _IncrementalEvaluation(
+            eval_method, samples, eval_key, [gt_field, pred_field]
+        )
+        _samples = inc.samples
+    else:
+        inc = None
+        _samples = samples
+
+    # Incremental updates must preserve the existing run's fields
+    if inc is None or inc.prev_results is None:
+        eval_method.register_run(samples, eval_key)
+
     eval_method.register_samples(samples, eval_key, dynamic=dynamic)
 
     processing_frames = samples._is_frame_field(pred_field)
 
-    if eval_key is not None:
-        tp_field = "%s_tp" % eval_key
-        fp_field = "%s_fp" % eval_key
-        fn_field = "%s_fn" % eval_key
-
+    logger.info("Evaluating detections...")
     if config.requires_additional_fields:
-        _samples = samples
+        matches = _evaluate_samples(
+            _samples, eval_method, eval_key, processing_frames
+        )
     else:
-        _samples = samples.select_fields([gt_field, pred_field])
-
-    matches = []
-    logger.info("Evaluating detections...")
-    for sample in _samples.iter_samples(progress=True):
-        if processing_frames:
-            docs = sample.frames.values()
-        else:
-            docs = [sample]
-
-        sample_tp = 0
-        sample_fp = 0
-        sample_fn = 0
-        for doc in docs:
-            doc_matches = eval_method.evaluate(doc, eval_key=eval_key)
-            matches.extend(doc_matches)
-            tp, fp, fn = _tally_matches(doc_matches)
-            sample_tp += tp
-            sample_fp += fp
-            sample_fn += fn
-
-            if processing_frames and eval_key is not None:
-                doc[tp_field] = tp
-                doc[fp_field] = fp
-                doc[fn_field] = fn
+        matches = _evaluate_values(
+            _samples,
+            eval_method,
+            eval_key,
+            processing_frames,
+            num_workers=num_workers,
+        )
 
-        if eval_key is not None:
-            sample[tp_field] = sample_tp
-            sample[fp_field] = sample_fp
-            sample[fn_field] = sample_fn
-            sample.save()
+    if inc is not None:
+        inc.update_fingerprints()
+        matches = _get_unchanged_matches(inc) + matches
 
     results = eval_method.generate_results(
         samples, matches, eval_key=eval_key, classes=classes, missing=missing
     )
+
+    if inc is not None:
+        results.fingerprints = inc.fingerprints
+
     eval_method.save_run_results(samples, eval_key, results)
 
     return results
@@ -500,6 +517,8 @@ class DetectionResults(BaseEvaluationResults):
             observed ground truth/predicted labels are used
         missing (None): a missing label string. Any unmatched objects are given
             this label for evaluation purposes
+        fingerprints (None): an optional dict mapping sample IDs to the
+            fingerprints of their labels, for use by incremental evaluations
         backend (None): a :class:`DetectionEvaluation` backend
     """
 
@@ -511,6 +530,7 @@ class DetectionResults(BaseEvaluationResults):
         matches,
         classes=None,
         missing=None,
+        fingerprints=None,
         backend=None,
     ):
         if matches:
@@ -536,6 +556,7 @@ class DetectionResults(BaseEvaluationResults):
             ypred_ids=ypred_ids,
             classes=classes,
             missing=missing,
+            fingerprints=fingerprints,
             backend=backend,
         )
 
@@ -561,6 +582,7 @@ class DetectionResults(BaseEvaluationResults):
 
         classes = d.get("classes", None)
         missing = d.get("missing", None)
+        fingerprints = d.get("fingerprints", None)
 
         matches = list(zip(ytrue, ypred, ious, confs, ytrue_ids, ypred_ids))
 
@@ -571,6 +593,7 @@ class DetectionResults(BaseEvaluationResults):
             matches,
             classes=classes,
             missing=missing,
+            fingerprints=fingerprints,
             **kwargs,
         )
 
@@ -618,3 +641,285 @@ def _tally_matches(matches):
             tp += 1
 
     return tp, fp, fn
+
+
+def _get_unchanged_matches(inc):
+    results = inc.prev_results
+    if results is None:
+        return []
+
+    ytrue = results.ytrue.tolist()
+    ypred = results.ypred.tolist()
+    ious = results.ious.tolist()
+    confs = results.confs.tolist()
+    ytrue_ids = results.ytrue_ids.tolist()
+    ypred_ids = results.ypred_ids.tolist()
+
+    matches = []
+    for idx in inc.get_unchanged_inds():
+        gt_id = ytrue_ids[idx]
+        pred_id = ypred_ids[idx]
+
+        # Unmatched objects were given the `missing` label
+        gt_label = ytrue[idx] if gt_id is not None else None
+        pred_label = ypred[idx] if pred_id is not None else None
+
+        matches.append(
+            (gt_label, pred_label, ious[idx], confs[idx], gt_id, pred_id)
+        )
+
+    return matches
+
+
+def _evaluate_samples(samples, eval_method, eval_key, processing_frames):
+    if eval_key is not None:
+        tp_field = "%s_tp" % eval_key
+        fp_field = "%s_fp" % eval_key
+        fn_field = "%s_fn" % eval_key
+
+    matches = []
+    for sample in samples.iter_samples(progress=True):
+        if processing_frames:
+            docs = sample.frames.values()
+        else:
+            docs = [sample]
+
+        sample_tp = 0
+        sample_fp = 0
+        sample_fn = 0
+        for doc in docs:
+            doc_matches = eval_method.evaluate(doc, eval_key=eval_key)
+            matches.extend(doc_matches)
+            tp, fp, fn = _tally_matches(doc_matches)
+            sample_tp += tp
+            sample_fp += fp
+            sample_fn += fn
+
+            if processing_frames and eval_key is not None:
+                doc[tp_field] = tp
+                doc[fp_field] = fp
+                doc[fn_field] = fn
+
+        if eval_key is not None:
+            sample[tp_field] = sample_tp
+            sample[fp_field] = sample_fp
+            sample[fn_field] = sample_fn
+            sample.save()
+
+    return matches
+
+
+def _evaluate_values(
+    samples, eval_method, eval_key, processing_frames, num_workers=None
+):
+    gt_field = eval_method.config.gt_field
+    pred_field = eval_method.config.pred_field
+
+    # Samples are evaluated and their results are written in batches, so that
+    # only a bounded number of labels are held in memory at any given time
+    inputs = _iter_docs(samples, gt_field, pred_field, processing_frames)
+
+    matches = []
+    with fou.ProgressBar(total=len(samples)) as pb:
+        for sample_ids, outputs in _evaluate_batches(
+            inputs, eval_method, eval_key, processing_frames, num_workers
+        ):
+            pb.update(count=len(sample_ids))
+
+            sample_counts = []
+            frame_counts = []
+            gts = []
+            preds = []
+            for doc_outputs in outputs:
+                _counts = []
+                _gts = []
+                _preds = []
+                for doc_gts, doc_preds, doc_matches in doc_outputs:
+                    matches.extend(doc_matches)
+                    _counts.append(_tally_matches(doc_matches))
+                    _gts.append(doc_gts)
+                    _preds.append(doc_preds)
+
+                sample_counts.append(
+                    tuple(sum(c) for c in zip((0, 0, 0), *_counts))
+                )
+
+                if processing_frames:
+                    frame_counts.append(_counts)
+                    gts.append(_gts)
+                    preds.append(_preds)
+                else:
+                    gts.append(_gts[0])
+                    preds.append(_preds[0])
+
+            if eval_key is None:
+                continue
+
+            for idx, suffix in enumerate(("tp", "fp", "fn")):
+                field = "%s_%s" % (eval_key, suffix)
+                values = [c[idx] for c in sample_counts]
+                samples.set_values(
+                    field, dict(zip(sample_ids, values)), key_field="id"
+                )
+
+                if processing_frames:
+                    values = [
+                        [c[idx] for c in _counts] for _counts in frame_counts
+                    ]
+                    samples.set_values(
+                        samples._FRAMES_PREFIX + field,
+                        dict(zip(sample_ids, values)),
+                        key_field="id",
+                    )
+
+            _set_label_lists(
+                samples, gt_field, sample_ids, gts, processing_frames
+            )
+            _set_label_lists(
+                samples, pred_field, sample_ids, preds, processing_frames
+            )
+
+    return matches
+
+
+def _iter_docs(samples, gt_field, pred_field, processing_frames):
+    # Only the label fields are loaded from the database. Each evaluation
+    # receives an in-memory sample or frame that contains just these fields
+    gt_type = samples.get_field(gt_field)
+    pred_type = samples.get_field(pred_field)
+
+    if processing_frames:
+        gt_path = gt_field[len(samples._FRAMES_PREFIX) :]
+        pred_path = pred_field[len(samples._FRAMES_PREFIX) :]
+    else:
+        gt_path = gt_field
+        pred_path = pred_field
+
+    view = samples.select_fields([gt_field, pred_field])
+    for d in view._aggregate(attach_frames=processing_frames):
+        if processing_frames:
+            images = d.get("frames", None) or []
+            key = "frame_number"
+        else:
+            images = [d]
+            key = "filepath"
+
+        docs = []
+        for image in images:
+            gts = _get_label(image, gt_path, gt_type)
+            preds = _get_label(image, pred_path, pred_type)
+            docs.append((image[key], gts, preds))
+
+        yield str(d["_id"]), docs
+
+
+def _get_label(d, path, field):
+    for key in path.split("."):
+        if d is None:
+            return None
+
+        d = d.get(key, None)
+
+    if d is None:
+        return None
+
+    return field.to_python(d)
+
+
+def _evaluate_batches(
+    inputs, eval_method, eval_key, processing_frames, num_workers
+):
+    if num_workers is None or num_workers <= 1:
+        for batch in fou.iter_batches(inputs, _BATCH_SIZE):
+            sample_ids, docs = zip(*batch)
+            outputs = [
+                _evaluate_docs(_docs, eval_method, eval_key, processing_frames)
+                for _docs in docs
+            ]
+            yield sample_ids, outputs
+
+        return
+
+    # Labels are pickled to and from the workers, so the returned labels,
+    # which contain the evaluation attributes, are the ones that must be saved
+    with fou.get_multiprocessing_context().Pool(
+        processes=num_workers,
+        initializer=_init_worker,
+        initargs=(eval_method, eval_key, processing_frames),
+    ) as pool:
+        for batch in fou.iter_batches(inputs, _BATCH_SIZE):
+            sample_ids, docs = zip(*batch)
+            chunksize = max(1, min(100, len(docs) // (4 * num_workers)))
+            outputs = list(
+                pool.imap(_do_evaluate_docs, docs, chunksize=chunksize)
+            )
+            yield sample_ids, outputs
+
+
+def _set_label_lists(
+    samples, label_field, sample_ids, labels, processing_frames
+):
+    label_type, list_path = samples._get_label_field_path(label_field)
+    list_field = label_type._LABEL_LIST_FIELD
+
+    def _get_list(label):
+        if label is None:
+            return None
+
+        return label[list_field]
+
+    if processing_frames:
+        values = [[_get_list(l) for l in _labels] for _labels in labels]
+    else:
+        values = [_get_list(l) for l in labels]
+
+    # Replaces entire lists when `samples` is a dataset, or updates the list
+    # elements by ID when `samples` is a view whose labels may be filtered
+    samples.set_values(
+        list_path,
+        dict(zip(sample_ids, values)),
+        key_field="id",
+        skip_none=True,
+    )
+
+
+# The number of samples to evaluate and save at a time
+_BATCH_SIZE = 1000
+
+_eval_method = None
+_eval_key = None
+_processing_frames = None
+
+
+def _init_worker(eval_method, eval_key, processing_frames):
+    global _eval_method
+    global _eval_key
+    global _processing_frames
+
+    _eval_method = eval_method
+    _eval_key = eval_key
+    _processing_frames = processing_frames
+
+
+def _do_evaluate_docs(docs):
+    return _evaluate_docs(docs, _eval_method, _eval_key, _processing_frames)
+
+
+def _evaluate_docs(docs, eval_method, eval_key, processing_frames):
+    gt_field = eval_method.gt_field
+    pred_field = eval_method.pred_field
+
+    outputs = []
+    for key, gts, preds in docs:
+        if processing_frames:
+            doc = fofr.Frame(frame_number=key)
+        else:
+            doc = fos.Sample(filepath=key)
+
+        doc[gt_field] = gts
+        doc[pred_field] = preds
+
+        doc_matches = eval_method.evaluate(doc, eval_key=eval_key)
+        outputs.append((doc[gt_field], doc[pred_field], doc_matches))
+
+    return outputs
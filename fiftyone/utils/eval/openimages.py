@@ -277,6 +277,8 @@ class OpenImagesDetectionResults(DetectionResults):
         thresholds (None): an optional dict of per-class decision thresholds
         missing (None): a missing label string. Any unmatched objects are
             given this label for evaluation purposes
+        fingerprints (None): an optional dict mapping sample IDs to the
+            fingerprints of their labels, for use by incremental evaluations
         backend (None): a :class:`OpenImagesEvaluation` backend
     """
 
@@ -291,6 +293,7 @@ class OpenImagesDetectionResults(DetectionResults):
         classes,
         thresholds=None,
         missing=None,
+        fingerprints=None,
         backend=None,
     ):
         super().__init__(
@@ -300,6 +303,7 @@ class OpenImagesDetectionResults(DetectionResults):
             matches,
             classes=classes,
             missing=missing,
+            fingerprints=fingerprints,
             backend=backend,
         )
 
@@ -32,6 +32,7 @@ def evaluate_segmentations(
     eval_key=None,
     mask_targets=None,
     method="simple",
+    num_workers=None,
     **kwargs,
 ):
     """Evaluates the specified semantic segmentation masks in the given
@@ -80,6 +81,9 @@ def evaluate_segmentations(
             labels. If not provided, the observed values are used as labels
         method ("simple"): a string specifying the evaluation method to use.
             Supported values are ``("simple")``
+        num_workers (None): the number of processes to use to load masks and
+            compute their confusion matrices. By default, all work is
+            performed in the main process
         **kwargs: optional keyword arguments for the constructor of the
             :class:`SegmentationEvaluationConfig` being used
 
@@ -98,7 +102,10 @@ def evaluate_segmentations(
     eval_method.register_samples(samples, eval_key)
 
     results = eval_method.evaluate_samples(
-        samples, eval_key=eval_key, mask_targets=mask_targets
+        samples,
+        eval_key=eval_key,
+        mask_targets=mask_targets,
+        num_workers=num_workers,
     )
     eval_method.save_run_results(samples, eval_key, results)
 
@@ -167,7 +174,9 @@ class SegmentationEvaluation(foe.EvaluationMethod):
             if processing_frames:
                 dataset.add_frame_field(dice_field, fof.FloatField)
 
-    def evaluate_samples(self, samples, eval_key=None, mask_targets=None):
+    def evaluate_samples(
+        self, samples, eval_key=None, mask_targets=None, num_workers=None
+    ):
         """Evaluates the predicted segmentation masks in the given samples with
         respect to the specified ground truth masks.
 
@@ -178,6 +187,9 @@ class SegmentationEvaluation(foe.EvaluationMethod):
                 contain a subset of the possible classes if you wish to
                 evaluate a subset of the semantic classes. By default, the
                 observed pixel values are used as labels
+            num_workers (None): the number of processes to use to load masks
+                and compute their confusion matrices. By default, all work is
+                performed in the main process
 
         Returns:
             a :class:`SegmentationResults` instance
@@ -301,7 +313,9 @@ class SimpleEvaluation(SegmentationEvaluation):
         config: a :class:`SimpleEvaluationConfig`
     """
 
-    def evaluate_samples(self, samples, eval_key=None, mask_targets=None):
+    def evaluate_samples(
+        self, samples, eval_key=None, mask_targets=None, num_workers=None
+    ):
         pred_field = self.config.pred_field
         gt_field = self.config.gt_field
 
@@ -335,59 +349,57 @@ class SimpleEvaluation(SegmentationEvaluation):
                 dice_field = "%s_dice" % eval_key
 
         logger.info("Evaluating segmentations...")
-        for sample in _samples.iter_samples(progress=True):
-            if processing_frames:
-                images = sample.frames.values()
-            else:
-                images = [sample]
-
-            sample_conf_mat = np.zeros((nc, nc), dtype=int)
-            for image in images:
-                gt_seg = image[gt_field]
-                if gt_seg is None or not gt_seg.has_mask:
-                    msg = "Skipping sample with missing ground truth mask"
-                    warnings.warn(msg)
-                    continue
+        inputs = _iter_segmentations(
+            _samples, gt_field, pred_field, processing_frames
+        )
+        outputs = _compute_confusion_matrices(
+            inputs,
+            values,
+            bandwidth=bandwidth,
+            average=average,
+            compute_dice=compute_dice,
+            record_samples=eval_key is not None,
+            record_frames=processing_frames and eval_key is not None,
+            num_workers=num_workers,
+        )
 
-                pred_seg = image[pred_field]
-                if pred_seg is None or not pred_seg.has_mask:
-                    msg = "Skipping sample with missing prediction mask"
-                    warnings.warn(msg)
-                    continue
+        # Samples and frames with missing masks are skipped, so their existing
+        # field values are not overwritten
+        sample_metrics = {}
+        frame_metrics = {}
+        for sample_id, (sample_conf_mat, smetrics, fmetrics) in outputs:
+            confusion_matrix += sample_conf_mat
 
-                image_conf_mat = _compute_pixel_confusion_matrix(
-                    pred_seg.get_mask(),
-                    gt_seg.get_mask(),
-                    values,
-                    bandwidth=bandwidth,
-                )
-                sample_conf_mat += image_conf_mat
+            if eval_key is not None and smetrics is not None:
+                if compute_dice:
+                    sdice = _compute_dice_score(confusion_matrix)
+                    smetrics = smetrics + (sdice,)
 
-                # Record frame stats, if requested
-                if processing_frames and eval_key is not None:
-                    facc, fpre, frec = _compute_accuracy_precision_recall(
-                        image_conf_mat, values, average
-                    )
-                    image[acc_field] = facc
-                    image[pre_field] = fpre
-                    image[rec_field] = frec
-                    if compute_dice:
-                        image[dice_field] = _compute_dice_score(image_conf_mat)
+                sample_metrics[sample_id] = smetrics
+                frame_metrics[sample_id] = fmetrics
 
-            confusion_matrix += sample_conf_mat
+        # Record sample and frame stats, if requested
+        if eval_key is not None and sample_metrics:
+            fields = [acc_field, pre_field, rec_field]
+            if compute_dice:
+                fields.append(dice_field)
 
-            # Record sample stats, if requested
-            if eval_key is not None:
-                sacc, spre, srec = _compute_accuracy_precision_recall(
-                    sample_conf_mat, values, average
+            for idx, field in enumerate(fields):
+                samples.set_values(
+                    field,
+                    {_id: m[idx] for _id, m in sample_metrics.items()},
+                    key_field="id",
                 )
-                sample[acc_field] = sacc
-                sample[pre_field] = spre
-                sample[rec_field] = srec
-                if compute_dice:
-                    sample[dice_field] = _compute_dice_score(confusion_matrix)
 
-                sample.save()
+                if processing_frames:
+                    samples.set_values(
+                        samples._FRAMES_PREFIX + field,
+                        {
+                            _id: {fn: m[idx] for fn, m in fm}
+                            for _id, fm in frame_metrics.items()
+                        },
+                        key_field="id",
+                    )
 
         if nc > 0:
             missing = classes[0] if values[0] in (0, "#000000") else None
@@ -531,6 +543,162 @@ def _compute_pixel_confusion_matrix(
         return np.zeros((num_classes, num_classes), dtype=int)
 
 
+def _iter_segmentations(samples, gt_field, pred_field, processing_frames):
+    # Only the raw mask bytes or mask paths are emitted, so that workers don't
+    # need to receive pickled label objects
+    with fou.ProgressBar(total=len(samples)) as pb:
+        for d in pb(samples._aggregate(attach_frames=processing_frames)):
+            if processing_frames:
+                images = d.get("frames", None) or []
+            else:
+                images = [d]
+
+            segs = []
+            for image in images:
+                gt_mask = _get_mask_input(image, gt_field)
+                if gt_mask is None:
+                    msg = "Skipping sample with missing ground truth mask"
+                    warnings.warn(msg)
+                    continue
+
+                pred_mask = _get_mask_input(image, pred_field)
+                if pred_mask is None:
+                    msg = "Skipping sample with missing prediction mask"
+                    warnings.warn(msg)
+                    continue
+
+                frame_number = image.get("frame_number", None)
+                segs.append((frame_number, gt_mask, pred_mask))
+
+            yield str(d["_id"]), segs
+
+
+def _get_mask_input(d, field):
+    for key in field.split("."):
+        if d is None:
+            return None
+
+        d = d.get(key, None)
+
+    if d is None:
+        return None
+
+    mask = d.get("mask", None)
+    if mask is not None:
+        return bytes(mask), None
+
+    mask_path = d.get("mask_path", None)
+    if mask_path is not None:
+        return None, mask_path
+
+    return None
+
+
+def _load_mask(mask_input):
+    mask, mask_path = mask_input
+    if mask is not None:
+        return fou.deserialize_numpy_array(mask)
+
+    return fol._read_mask(mask_path)
+
+
+def _compute_confusion_matrices(
+    inputs,
+    values,
+    bandwidth=None,
+    average="micro",
+    compute_dice=False,
+    record_samples=False,
+    record_frames=False,
+    num_workers=None,
+):
+    kwargs = dict(
+        bandwidth=bandwidth,
+        average=average,
+        compute_dice=compute_dice,
+        record_samples=record_samples,
+        record_frames=record_frames,
+    )
+
+    if num_workers is None or num_workers <= 1:
+        for sample_id, segs in inputs:
+            yield sample_id, _compute_sample_confusion_matrices(
+                segs, values, **kwargs
+            )
+
+        return
+
+    # Samples are dispatched in batches so that only a bounded number of
+    # masks are held in memory at any given time
+    batch_size = 4 * num_workers
+    with fou.get_multiprocessing_context().Pool(
+        processes=num_workers,
+        initializer=_init_worker,
+        initargs=(values, kwargs),
+    ) as pool:
+        for batch in fou.iter_batches(inputs, batch_size):
+            sample_ids, segs = zip(*batch)
+            outputs = pool.imap(_do_compute_confusion_matrices, segs)
+            yield from zip(sample_ids, outputs)
+
+
+_values = None
+_kwargs = None
+
+
+def _init_worker(values, kwargs):
+    global _values
+    global _kwargs
+
+    _values = values
+    _kwargs = kwargs
+
+
+def _do_compute_confusion_matrices(segs):
+    return _compute_sample_confusion_matrices(segs, _values, **_kwargs)
+
+
+def _compute_sample_confusion_matrices(
+    segs,
+    values,
+    bandwidth=None,
+    average="micro",
+    compute_dice=False,
+    record_samples=False,
+    record_frames=False,
+):
+    nc = len(values)
+    sample_conf_mat = np.zeros((nc, nc), dtype=int)
+    sample_metrics = None
+    frame_metrics = []
+
+    for frame_number, gt_mask, pred_mask in segs:
+        image_conf_mat = _compute_pixel_confusion_matrix(
+            _load_mask(pred_mask),
+            _load_mask(gt_mask),
+            values,
+            bandwidth=bandwidth,
+        )
+        sample_conf_mat += image_conf_mat
+
+        if record_frames:
+            fmetrics = _compute_accuracy_precision_recall(
+                image_conf_mat, values, average
+            )
+            if compute_dice:
+                fmetrics += (_compute_dice_score(image_conf_mat),)
+
+            frame_metrics.append((frame_number, fmetrics))
+
+    # Samples whose masks are all missing have no metrics
+    if record_samples and segs:
+        sample_metrics = _compute_accuracy_precision_recall(
+            sample_conf_mat, values, average
+        )
+
+    return sample_conf_mat, sample_metrics, frame_metrics
+
+
 def _compute_dice_score(confusion_matrix):
     confusion_matrix = np.asarray(confusion_matrix)
     tp = np.diag(confusion_matrix).sum()
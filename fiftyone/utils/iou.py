@@ -6,10 +6,11 @@ Intersection over union (IoU) utilities.
 |
 """
 import contextlib
+import functools
 import logging
+import warnings
 
 import numpy as np
-import scipy.spatial as sp
 
 import eta.core.numutils as etan
 import eta.core.utils as etau
@@ -85,7 +86,8 @@ def compute_ious(
         return np.zeros((len(preds), len(gts)))
 
     if etau.is_str(iscrowd):
-        iscrowd = lambda l: bool(l.get_attribute_value(iscrowd, False))
+        crowd_attr = iscrowd
+        iscrowd = lambda l: bool(l.get_attribute_value(crowd_attr, False))
 
     if isinstance(preds[0], fol.Polyline):
         if use_boxes:
@@ -143,6 +145,7 @@ def compute_max_ious(
     other_field=None,
     iou_attr="max_iou",
     id_attr=None,
+    num_workers=None,
     **kwargs,
 ):
     """Populates an attribute on each label in the given spatial field(s) that
@@ -169,6 +172,8 @@ def compute_max_ious(
         iou_attr ("max_iou"): the label attribute in which to store the max IoU
         id_attr (None): an optional attribute in which to store the label ID of
             the maximum overlapping label
+        num_workers (None): the number of processes to use to compute IoUs.
+            By default, all IoUs are computed in the main process
         **kwargs: optional keyword arguments for :func:`compute_ious`
     """
     if other_field is None:
@@ -187,73 +192,83 @@ def compute_max_ious(
     _other_field, _ = sample_collection._handle_frame_field(other_field)
 
     if other_field != label_field:
-        view = sample_collection.select_fields([label_field, other_field])
+        fields = [label_field, other_field]
     else:
-        view = sample_collection.select_fields(label_field)
-
-    max_ious1 = []
-    max_ious2 = []
-    label_ids1 = []
-    label_ids2 = []
-
-    for sample in view.iter_samples(progress=True):
-        if is_frame_field:
-            _max_ious1 = []
-            _max_ious2 = []
-            _label_ids1 = []
-            _label_ids2 = []
-            for frame in sample.frames.values():
-                iou1, iou2, id1, id2 = _compute_max_ious(
-                    frame, _label_field, _other_field, **kwargs
-                )
-                _max_ious1.append(iou1)
-                _max_ious2.append(iou2)
-                _label_ids1.append(id1)
-                _label_ids2.append(id2)
-
-            max_ious1.append(_max_ious1)
-            max_ious2.append(_max_ious2)
-            label_ids1.append(_label_ids1)
-            label_ids2.append(_label_ids2)
-        else:
-            iou1, iou2, id1, id2 = _compute_max_ious(
-                sample, _label_field, _other_field, **kwargs
-            )
-            max_ious1.append(iou1)
-            max_ious2.append(iou2)
-            label_ids1.append(id1)
-            label_ids2.append(id2)
+        fields = [label_field]
 
     _, iou_path1 = sample_collection._get_label_field_path(
         label_field, iou_attr
     )
 
-    sample_collection.set_values(iou_path1, max_ious1)
-
     if id_attr is not None:
         _, id_path1 = sample_collection._get_label_field_path(
             label_field, id_attr
         )
 
-        sample_collection.set_values(id_path1, label_ids1)
-
     if other_field != label_field:
         _, iou_path2 = sample_collection._get_label_field_path(
             other_field, iou_attr
         )
 
-        sample_collection.set_values(iou_path2, max_ious2)
-
         if id_attr is not None:
             _, id_path2 = sample_collection._get_label_field_path(
                 other_field, id_attr
             )
 
-            sample_collection.set_values(id_path2, label_ids2)
+    batches = _apply_to_labels(
+        sample_collection,
+        fields,
+        functools.partial(
+            _compute_max_ious,
+            field1=_label_field,
+            field2=_other_field,
+            **kwargs,
+        ),
+        is_frame_field,
+        num_workers=num_workers,
+    )
+
+    for sample_ids, outputs in batches:
+        max_ious1 = []
+        max_ious2 = []
+        label_ids1 = []
+        label_ids2 = []
+
+        for _outputs in outputs:
+            if is_frame_field:
+                max_ious1.append([o[0] for o in _outputs])
+                max_ious2.append([o[1] for o in _outputs])
+                label_ids1.append([o[2] for o in _outputs])
+                label_ids2.append([o[3] for o in _outputs])
+            else:
+                iou1, iou2, id1, id2 = _outputs[0]
+                max_ious1.append(iou1)
+                max_ious2.append(iou2)
+                label_ids1.append(id1)
+                label_ids2.append(id2)
+
+        _set_values(sample_collection, iou_path1, sample_ids, max_ious1)
+
+        if id_attr is not None:
+            _set_values(sample_collection, id_path1, sample_ids, label_ids1)
+
+        if other_field != label_field:
+            _set_values(sample_collection, iou_path2, sample_ids, max_ious2)
+
+            if id_attr is not None:
+                _set_values(
+                    sample_collection, id_path2, sample_ids, label_ids2
+                )
 
 
 def find_duplicates(
-    sample_collection, label_field, iou_thresh=0.999, method="simple", **kwargs
+    sample_collection,
+    label_field,
+    iou_thresh=0.999,
+    method="simple",
+    sparse=False,
+    num_workers=None,
+    **kwargs,
 ):
     """Returns IDs of duplicate labels in the given field of the collection, as
     defined as labels with an IoU greater than a chosen threshold with another
@@ -270,6 +285,13 @@ def find_duplicates(
         than the specified threshold. This method is more computationally
         expensive than the simple method
 
+    By default, the full pairwise IoU matrix of the labels in each
+    sample/frame is computed. For dense scenes containing many
+    :class:`fiftyone.core.labels.Detections`, you can pass ``sparse=True`` to
+    use a sort-and-sweep search over the bounding boxes so that IoUs are only
+    computed between pairs of boxes that overlap. Both modes return the same
+    duplicate IDs.
+
     Args:
         sample_collection: a
             :class:`fiftyone.core.collections.SampleCollection`
@@ -281,6 +303,13 @@ def find_duplicates(
             labels are duplicates
         method ("simple"): the duplicate removal method to use. The supported
             values are ``("simple", "greedy")``
+        sparse (False): whether to only compute IoUs between pairs of
+            overlapping bounding boxes. Only applicable to
+            :class:`fiftyone.core.labels.Detections` whose IoUs are computed
+            from their bounding boxes and a non-negative ``iou_thresh``; the
+            full IoU matrix is always used otherwise
+        num_workers (None): the number of processes to use to compute IoUs.
+            By default, all IoUs are computed in the main process
         **kwargs: optional keyword arguments for :func:`compute_ious`
 
     Returns:
@@ -296,24 +325,129 @@ def find_duplicates(
         label_field
     )
 
-    view = sample_collection.select_fields(label_field)
+    batches = _apply_to_labels(
+        sample_collection,
+        [label_field],
+        functools.partial(
+            _find_duplicates,
+            field=_label_field,
+            iou_thresh=iou_thresh,
+            method=method,
+            sparse=sparse,
+            **kwargs,
+        ),
+        is_frame_field,
+        num_workers=num_workers,
+    )
 
     dup_ids = []
+    for _, outputs in batches:
+        for _outputs in outputs:
+            for _dup_ids in _outputs:
+                dup_ids.extend(_dup_ids)
+
+    return dup_ids
+
 
-    for sample in view.iter_samples(progress=True):
+def _apply_to_labels(
+    sample_collection, fields, fcn, is_frame_field, num_workers=None
+):
+    # Labels are processed in batches, so that only a bounded number of labels
+    # are held in memory at any given time
+    inputs = _iter_docs(sample_collection, fields, is_frame_field)
+    num_samples = len(sample_collection)
+
+    with fou.ProgressBar(total=num_samples) as pb:
+        if num_workers is None or num_workers <= 1 or num_samples <= 1:
+            for batch in fou.iter_batches(inputs, _BATCH_SIZE):
+                sample_ids, docs = zip(*batch)
+                outputs = [_apply(fcn, _docs) for _docs in docs]
+                pb.update(count=len(sample_ids))
+                yield sample_ids, outputs
+
+            return
+
+        with fou.get_multiprocessing_context().Pool(
+            processes=num_workers,
+            initializer=_init_worker,
+            initargs=(fcn,),
+        ) as pool:
+            for batch in fou.iter_batches(inputs, _BATCH_SIZE):
+                sample_ids, docs = zip(*batch)
+                chunksize = max(1, min(100, len(docs) // (4 * num_workers)))
+                outputs = list(pool.imap(_do_apply, docs, chunksize=chunksize))
+                pb.update(count=len(sample_ids))
+                yield sample_ids, outputs
+
+
+def _iter_docs(sample_collection, fields, is_frame_field):
+    # Only the label fields are loaded; no sample documents are constructed
+    label_fields = [
+        (
+            sample_collection._handle_frame_field(field)[0],
+            sample_collection.get_field(field),
+        )
+        for field in fields
+    ]
+
+    view = sample_collection.select_fields(fields)
+    for d in view._aggregate(attach_frames=is_frame_field):
         if is_frame_field:
-            for frame in sample.frames.values():
-                _dup_ids = _find_duplicates(
-                    frame, _label_field, iou_thresh, method, **kwargs
-                )
-                dup_ids.extend(_dup_ids)
+            images = d.get("frames", None) or []
         else:
-            _dup_ids = _find_duplicates(
-                sample, _label_field, iou_thresh, method, **kwargs
-            )
-            dup_ids.extend(_dup_ids)
+            images = [d]
+
+        docs = [
+            {
+                path: _get_label(image, path, field)
+                for path, field in label_fields
+            }
+            for image in images
+        ]
+
+        yield str(d["_id"]), docs
 
-    return dup_ids
+
+def _get_label(d, path, field):
+    for key in path.split("."):
+        if d is None:
+            return None
+
+        d = d.get(key, None)
+
+    if d is None:
+        return None
+
+    return field.to_python(d)
+
+
+def _set_values(sample_collection, path, sample_ids, values):
+    # A batch may contain only None values, which must still be written
+    sample_collection.set_values(
+        path,
+        dict(zip(sample_ids, values)),
+        key_field="id",
+        _allow_missing=True,
+    )
+
+
+def _apply(fcn, docs):
+    return [fcn(doc) for doc in docs]
+
+
+# The number of samples whose labels are processed at a time
+_BATCH_SIZE = 1000
+
+_fcn = None
+
+
+def _init_worker(fcn):
+    global _fcn
+    _fcn = fcn
+
+
+def _do_apply(docs):
+    return _apply(_fcn, docs)
 
 
 def _compute_max_ious(doc, field1, field2, **kwargs):
@@ -375,20 +509,31 @@ def _extract_max_ious(ious, labels1, labels2):
     return max1, max2, ids1, ids2
 
 
-def _find_duplicates(doc, field, iou_thresh, method, **kwargs):
+def _find_duplicates(doc, field, iou_thresh, method, sparse=False, **kwargs):
+    if method not in ("simple", "greedy"):
+        raise ValueError("Unsupported method '%s'" % method)
+
     labels = _get_labels(doc, field)
 
     if labels is None:
         return []
 
+    if sparse and _supports_sparse_ious(labels, iou_thresh, **kwargs):
+        i, j = _find_overlapping_pairs(labels, iou_thresh, **kwargs)
+
+        if method == "simple":
+            dup_inds = np.unique(j)
+        else:
+            dup_inds = _find_duplicates_greedy_sparse(i, j, len(labels))
+
+        return [labels[i].id for i in dup_inds]
+
     ious = compute_ious(labels, labels, **kwargs)
 
     if method == "simple":
         dup_inds = _find_duplicates_simple(ious, iou_thresh)
-    elif method == "greedy":
-        dup_inds = _find_duplicates_greedy(ious, iou_thresh)
     else:
-        raise ValueError("Unsupported method '%s'" % method)
+        dup_inds = _find_duplicates_greedy(ious, iou_thresh)
 
     return [labels[i].id for i in dup_inds]
 
@@ -419,41 +564,107 @@ def _find_duplicates_greedy(ious, iou_thresh):
     return sorted(dup_inds)
 
 
-def _get_bbox_dim(detection):
-    if all(
-        getattr(detection, a, None) is not None
-        for a in ("dimensions", "location", "rotation")
-    ):
-        return 3
+def _supports_sparse_ious(
+    labels, iou_thresh, use_masks=False, use_boxes=False, **kwargs
+):
+    # Non-overlapping boxes have zero IoU, so they can only be skipped when
+    # the threshold is non-negative
+    return (
+        bool(labels)
+        and iou_thresh >= 0
+        and isinstance(labels[0], fol.Detection)
+        and not use_masks
+        and _get_bbox_dim(labels[0]) == 2
+    )
 
-    return 2
 
+def _find_overlapping_pairs(
+    labels, iou_thresh, iscrowd=None, classwise=False, **kwargs
+):
+    # Returns the `(i, j)` indexes, `i < j`, of all pairs of labels whose IoU
+    # exceeds `iou_thresh`. Candidate pairs are found by sorting the boxes by
+    # their left edges and sweeping from left to right, so IoUs are only
+    # computed for boxes whose horizontal extents overlap
+    if etau.is_str(iscrowd):
+        crowd_attr = iscrowd
+        iscrowd = lambda l: bool(l.get_attribute_value(crowd_attr, False))
 
-def _compute_bbox_iou(gt, pred, gt_crowd=False):
-    gx, gy, gw, gh = gt.bounding_box
-    gt_area = gh * gw
+    num_labels = len(labels)
+    boxes = _to_bbox_array(labels)
 
-    px, py, pw, ph = pred.bounding_box
-    pred_area = ph * pw
+    x1 = boxes[:, 0]
+    x2 = x1 + boxes[:, 2]
 
-    # Width of intersection
-    w = min(px + pw, gx + gw) - max(px, gx)
-    if w <= 0:
-        return 0
+    order = np.argsort(x1, kind="stable")
+    ends = np.searchsorted(x1[order], x2[order], side="left")
+    counts = np.maximum(ends - np.arange(1, num_labels + 1), 0)
 
-    # Height of intersection
-    h = min(py + ph, gy + gh) - max(py, gy)
-    if h <= 0:
-        return 0
+    # The box at sorted position `p` is paired with the boxes at sorted
+    # positions `p + 1, ..., ends[p] - 1`
+    a = np.repeat(np.arange(num_labels), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(
+        np.cumsum(counts) - counts, counts
+    )
+    b = order[a + 1 + offsets]
+    a = order[a]
 
-    inter = h * w
+    i = np.minimum(a, b)
+    j = np.maximum(a, b)
 
-    if gt_crowd:
-        union = pred_area
+    if classwise:
+        class_labels = np.array([l.label for l in labels], dtype=object)
+        keep = class_labels[i] == class_labels[j]
+        i = i[keep]
+        j = j[keep]
+
+    if iscrowd is not None:
+        gt_crowds = np.array([iscrowd(l) for l in labels], dtype=bool)
     else:
-        union = pred_area + gt_area - inter
+        gt_crowds = np.zeros(num_labels, dtype=bool)
+
+    # Matches the symmetric dense IoU matrix, whose entries are computed with
+    # the latter label as the prediction and the former as the ground truth
+    ious = _compute_bbox_iou_pairs(boxes[j], boxes[i], gt_crowds[i])
+    keep = ious > iou_thresh
+
+    return i[keep], j[keep]
+
+
+def _find_duplicates_greedy_sparse(i, j, num_labels):
+    # Equivalent to `_find_duplicates_greedy()`, given the `(i, j)` pairs
+    # whose IoUs exceed the threshold
+    degrees = np.bincount(np.concatenate((i, j)), minlength=num_labels)
+    neighbors = [set() for _ in range(num_labels)]
+    for _i, _j in zip(i.tolist(), j.tolist()):
+        neighbors[_i].add(_j)
+        neighbors[_j].add(_i)
+
+    dup_inds = []
+    while True:
+        # Remove most common value
+        k = np.argmax(degrees)
+        if degrees[k] == 0:
+            break
+
+        dup_inds.append(k)
+        for n in neighbors[k]:
+            neighbors[n].discard(k)
+            degrees[n] -= 1
+
+        neighbors[k].clear()
+        degrees[k] = 0
+
+    return sorted(dup_inds)
+
+
+def _get_bbox_dim(detection):
+    if all(
+        getattr(detection, a, None) is not None
+        for a in ("dimensions", "location", "rotation")
+    ):
+        return 3
 
-    return min(etan.safe_divide(inter, union), 1)
+    return 2
 
 
 def _compute_bbox_ious(preds, gts, iscrowd=None, classwise=False):
@@ -473,14 +684,82 @@ def _compute_bbox_ious(preds, gts, iscrowd=None, classwise=False):
             gts = _polylines_to_detections(gts)
 
     if _get_bbox_dim(gts[0]) == 3:
-        bbox_iou_fcn = _compute_cuboid_iou
+        return _compute_cuboid_ious(preds, gts, gt_crowds, classwise=classwise)
+
+    pred_boxes = _to_bbox_array(preds)
+    if is_symmetric:
+        gt_boxes = pred_boxes
     else:
-        bbox_iou_fcn = _compute_bbox_iou
+        gt_boxes = _to_bbox_array(gts)
+
+    ious = _compute_bbox_iou_matrix(
+        pred_boxes, gt_boxes, np.array(gt_crowds, dtype=bool)
+    )
+
+    if classwise:
+        ious[_get_label_mismatches(preds, gts)] = 0
+
+    if is_symmetric:
+        ious = np.tril(ious, k=-1)
+        ious += ious.T
+        np.fill_diagonal(ious, 1)
+
+    return ious
+
+
+def _to_bbox_array(detections):
+    boxes = np.array(
+        [detection.bounding_box for detection in detections], dtype=float
+    )
+    return boxes.reshape(-1, 4)
+
+
+def _compute_bbox_iou_matrix(pred_boxes, gt_boxes, gt_crowds):
+    # [x, y, w, h] -> [x1, y1, x2, y2]
+    px1, py1, pw, ph = (pred_boxes[:, i, np.newaxis] for i in range(4))
+    gx1, gy1, gw, gh = (gt_boxes[np.newaxis, :, i] for i in range(4))
+
+    w = np.minimum(px1 + pw, gx1 + gw) - np.maximum(px1, gx1)
+    h = np.minimum(py1 + ph, gy1 + gh) - np.maximum(py1, gy1)
+    inter = np.where((w > 0) & (h > 0), w * h, 0.0)
+
+    pred_areas = pw * ph
+    gt_areas = gw * gh
+
+    # The area of the prediction is the "union" for crowd objects
+    union = np.where(gt_crowds, pred_areas, pred_areas + gt_areas - inter)
+
+    ious = np.divide(inter, union, out=np.zeros_like(inter), where=(inter > 0))
+
+    return np.minimum(ious, 1)
+
+
+def _compute_bbox_iou_pairs(pred_boxes, gt_boxes, gt_crowds):
+    # Elementwise version of `_compute_bbox_iou_matrix()`
+    px1, py1, pw, ph = (pred_boxes[:, i] for i in range(4))
+    gx1, gy1, gw, gh = (gt_boxes[:, i] for i in range(4))
+
+    w = np.minimum(px1 + pw, gx1 + gw) - np.maximum(px1, gx1)
+    h = np.minimum(py1 + ph, gy1 + gh) - np.maximum(py1, gy1)
+    inter = np.where((w > 0) & (h > 0), w * h, 0.0)
+
+    pred_areas = pw * ph
+    gt_areas = gw * gh
+
+    # The area of the prediction is the "union" for crowd objects
+    union = np.where(gt_crowds, pred_areas, pred_areas + gt_areas - inter)
+
+    ious = np.divide(inter, union, out=np.zeros_like(inter), where=(inter > 0))
+
+    return np.minimum(ious, 1)
+
+
+def _compute_cuboid_ious(preds, gts, gt_crowds, classwise=False):
+    is_symmetric = preds is gts
 
     ious = np.zeros((len(preds), len(gts)))
 
     for j, (gt, gt_crowd) in enumerate(zip(gts, gt_crowds)):
-
         for i, pred in enumerate(preds):
             if is_symmetric and i < j:
                 iou = ious[j, i]
@@ -489,13 +768,19 @@ def _compute_bbox_ious(preds, gts, iscrowd=None, classwise=False):
             elif classwise and pred.label != gt.label:
                 continue
             else:
-                iou = bbox_iou_fcn(gt, pred, gt_crowd=gt_crowd)
+                iou = _compute_cuboid_iou(gt, pred, gt_crowd=gt_crowd)
 
             ious[i, j] = iou
 
     return ious
 
 
+def _get_label_mismatches(preds, gts):
+    pred_labels = np.array([pred.label for pred in preds], dtype=object)
+    gt_labels = np.array([gt.label for gt in gts], dtype=object)
+    return pred_labels[:, np.newaxis] != gt_labels[np.newaxis, :]
+
+
 def _compute_polyline_ious(
     preds, gts, error_level, iscrowd=None, classwise=False, gt_crowds=None
 ):
@@ -641,49 +926,66 @@ def _compute_segment_ious(preds, gts):
 
 
 def _compute_keypoint_similarities(preds, gts, classwise=False):
-    sims = np.zeros((len(preds), len(gts)))
-    for j, gt in enumerate(gts):
-        for i, pred in enumerate(preds):
-            if classwise and pred.label != gt.label:
-                continue
-
-            sims[i, j] = _compute_object_keypoint_similarity(gt, pred)
-
-    return sims
-
+    pred_points, pred_lens = _to_points_array(preds)
+    gt_points, gt_lens = _to_points_array(gts)
 
-def _compute_object_keypoint_similarity(gt, pred):
-    gtp = np.array(gt.points, dtype=float)
-    predp = np.array(pred.points, dtype=float)
+    num_points = min(pred_points.shape[1], gt_points.shape[1])
+    if num_points == 0:
+        return np.zeros((len(preds), len(gts)))
+    pred_points = pred_points[:, np.newaxis, :num_points, :]
+    gtp = gt_points[np.newaxis, :, :num_points, :]
 
     # Use extent of GT points as proxy for box area
-    scale = np.sqrt(np.prod(np.nanmax(gtp, axis=0) - np.nanmin(gtp, axis=0)))
+    with np.errstate(invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        extent = np.nanmax(gt_points, axis=1) - np.nanmin(gt_points, axis=1)
+
+    scale = np.sqrt(np.prod(extent, axis=1))
     scale = np.maximum(0.0, np.minimum(scale, 1.0))
+    scale = scale[np.newaxis, :, np.newaxis]
+
+    # Only the first `min(len(gt.points), len(pred.points))` points are
+    # compared
+    valid = (
+        np.arange(num_points)[np.newaxis, np.newaxis, :]
+        < np.minimum(pred_lens[:, np.newaxis], gt_lens[np.newaxis, :])[
+            :, :, np.newaxis
+        ]
+    )
 
     # If GT points are None/nan/inf: skip
     # If pred points are None/nan/inf: use max distance
-    dists = []
-    for g, p in zip(gtp, predp):
-        if not np.isfinite(g).all():
-            continue
+    valid &= np.isfinite(gtp).all(axis=3)
+    pred_valid = np.isfinite(pred_points).all(axis=3)
 
-        if np.isfinite(p).all():
-            d = sp.distance.euclidean(g, p)
-        else:
-            # Max distance
-            d = 1
+    dists = np.sqrt(np.sum((gtp - pred_points) ** 2, axis=3))
+    dists = np.where(pred_valid, dists, 1.0)
 
-        dists.append(d)
+    # object keypoint similarity with kappa == 1
+    # https://cocodataset.org/#keypoints-eval
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sims = np.exp(-(dists**2) / (2 * (scale**2)))
 
-    dists = np.array(dists)
-    n = len(dists)
+    n = valid.sum(axis=2)
+    sims = np.where(valid, sims, 0.0).sum(axis=2)
+    sims = np.divide(sims, n, out=np.zeros_like(sims), where=(n > 0))
 
-    if n == 0:
-        return 0.0
+    if classwise:
+        sims[_get_label_mismatches(preds, gts)] = 0
 
-    # object keypoint similarity with kappa == 1
-    # https://cocodataset.org/#keypoints-eval
-    return np.sum(np.exp(-(dists**2) / (2 * (scale**2)))) / n
+    return sims
+
+
+def _to_points_array(keypoints):
+    lens = np.array([len(kp.points) for kp in keypoints], dtype=int)
+    num_points = lens.max() if lens.size > 0 else 0
+
+    points = np.full((len(keypoints), num_points, 2), np.nan)
+    for idx, kp in enumerate(keypoints):
+        if kp.points:
+            points[idx, : lens[idx]] = np.array(kp.points, dtype=float)
+
+    return points, lens
 
 
 def _polylines_to_detections(polylines):
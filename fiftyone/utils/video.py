@@ -5,9 +5,12 @@ Video utilities.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+from collections import deque
+import contextlib
 import itertools
 import json
 import logging
+from multiprocessing.pool import ThreadPool
 import os
 
 import eta.core.frameutils as etaf
@@ -94,6 +97,7 @@ def reencode_videos(
     rel_dir=None,
     update_filepaths=True,
     delete_originals=False,
+    num_workers=None,
     skip_failures=False,
     verbose=False,
     **kwargs,
@@ -147,6 +151,8 @@ def reencode_videos(
             sample collection
         delete_originals (False): whether to delete the original videos after
             re-encoding
+        num_workers (None): the number of videos to process concurrently. By
+            default, videos are processed serially
         skip_failures (False): whether to gracefully continue without raising
             an error if a video cannot be re-encoded
         verbose (False): whether to log the ``ffmpeg`` commands that are
@@ -165,6 +171,7 @@ def reencode_videos(
         rel_dir=rel_dir,
         update_filepaths=update_filepaths,
         delete_originals=delete_originals,
+        num_workers=num_workers,
         skip_failures=skip_failures,
         verbose=verbose,
         **kwargs,
@@ -187,6 +194,7 @@ def transform_videos(
     rel_dir=None,
     update_filepaths=True,
     delete_originals=False,
+    num_workers=None,
     skip_failures=False,
     verbose=False,
     **kwargs,
@@ -253,6 +261,8 @@ def transform_videos(
             sample collection
         delete_originals (False): whether to delete the original videos after
             re-encoding
+        num_workers (None): the number of videos to process concurrently. By
+            default, videos are processed serially
         skip_failures (False): whether to gracefully continue without raising
             an error if a video cannot be transformed
         verbose (False): whether to log the ``ffmpeg`` commands that are
@@ -277,6 +287,7 @@ def transform_videos(
         rel_dir=rel_dir,
         update_filepaths=update_filepaths,
         delete_originals=delete_originals,
+        num_workers=num_workers,
         skip_failures=skip_failures,
         verbose=verbose,
         **kwargs,
@@ -300,6 +311,7 @@ def sample_videos(
     rel_dir=None,
     save_filepaths=False,
     delete_originals=False,
+    num_workers=None,
     skip_failures=False,
     verbose=False,
     **kwargs,
@@ -399,6 +411,8 @@ def sample_videos(
             ``output_field`` field of each frame of the input collection
         delete_originals (False): whether to delete the original videos after
             sampling
+        num_workers (None): the number of videos to sample concurrently. By
+            default, videos are sampled serially
         skip_failures (False): whether to gracefully continue without raising
             an error if a video cannot be sampled
         verbose (False): whether to log the ``ffmpeg`` commands that are
@@ -425,6 +439,7 @@ def sample_videos(
         rel_dir=rel_dir,
         save_filepaths=save_filepaths,
         delete_originals=delete_originals,
+        num_workers=num_workers,
         skip_failures=skip_failures,
         verbose=verbose,
         **kwargs,
@@ -722,6 +737,7 @@ def _transform_videos(
     save_filepaths=False,
     update_filepaths=True,
     delete_originals=False,
+    num_workers=None,
     skip_failures=False,
     verbose=False,
     **kwargs,
@@ -743,8 +759,58 @@ def _transform_videos(
     if frames is None:
         frames = itertools.repeat(None)
 
-    with fou.ProgressBar(total=len(view)) as pb:
-        for sample, _frames in pb(zip(view, frames)):
+    if num_workers is not None and num_workers <= 1:
+        num_workers = None
+
+    transform_kwargs = dict(
+        fps=fps,
+        min_fps=min_fps,
+        max_fps=max_fps,
+        size=size,
+        min_size=min_size,
+        max_size=max_size,
+        original_frame_numbers=original_frame_numbers,
+        reencode=reencode,
+        force_reencode=force_reencode,
+        delete_original=delete_originals,
+        skip_failures=skip_failures,
+        verbose=verbose,
+        **kwargs,
+    )
+
+    finalize_kwargs = dict(
+        sample_frames=sample_frames,
+        output_field=output_field,
+        save_filepaths=save_filepaths,
+        update_filepaths=update_filepaths,
+        diff_field=diff_field,
+        skip_failures=skip_failures,
+    )
+
+    # Jobs whose outputs have not yet been recorded on their samples
+    pending = deque()
+    pending_outpaths = set()
+
+    with contextlib.ExitStack() as context:
+        pb = context.enter_context(fou.ProgressBar(total=len(view)))
+
+        if num_workers is not None:
+            pool = context.enter_context(ThreadPool(processes=num_workers))
+        else:
+            pool = None
+
+        def _finalize_next():
+            sample, inpath, outpath, _frames, result = pending.popleft()
+            pending_outpaths.discard(outpath)
+            if result is not None:
+                result.get()
+
+            _finalize_transform(
+                sample, inpath, outpath, _frames, **finalize_kwargs
+            )
+            pb.update()
+
+        for sample, _frames in zip(view, frames):
             inpath = sample[media_field]
 
             _outpath = _get_outpath(
@@ -755,12 +821,6 @@ def _transform_videos(
                 outpath = os.path.join(
                     os.path.splitext(_outpath)[0], frames_patt
                 )
-
-                # If sampling was not forced and the first frame exists, assume
-                # that all frames exist
-                fn = _frames[0] if _frames else 1
-                if not force_reencode and os.path.isfile(outpath % fn):
-                    continue
             elif reencode:
                 root, ext = os.path.splitext(_outpath)
                 if ext.lower() != ".mp4":
@@ -770,55 +830,82 @@ def _transform_videos(
             else:
                 outpath = _outpath
 
-            _transform_video(
-                inpath,
-                outpath,
-                frames=_frames,
-                fps=fps,
-                min_fps=min_fps,
-                max_fps=max_fps,
-                size=size,
-                min_size=min_size,
-                max_size=max_size,
-                original_frame_numbers=original_frame_numbers,
-                reencode=reencode,
-                force_reencode=force_reencode,
-                delete_original=delete_originals,
-                skip_failures=skip_failures,
-                verbose=verbose,
-                **kwargs,
-            )
+            # Multiple samples may write to the same location, so we must wait
+            # for any in-progress jobs for this location to finish first
+            while outpath in pending_outpaths:
+                _finalize_next()
 
-            if save_filepaths and sample_frames:
-                if _frames is None:
-                    try:
-                        if sample.metadata is None:
-                            sample.compute_metadata()
-
-                        _frames = range(
-                            1, sample.metadata.total_frame_count + 1
-                        )
-                    except BaseException as e:
-                        if not skip_failures:
-                            raise
-
-                        _frames = []
-                        logger.warning(e)
-
-                for fn in _frames:
-                    frame_path = outpath % fn
-                    if os.path.isfile(frame_path):
-                        sample.frames[fn][output_field] = frame_path
-
-                sample.save()
-
-            if (
-                update_filepaths
-                and not sample_frames
-                and (diff_field or outpath != inpath)
-            ):
-                sample[output_field] = outpath
-                sample.save()
+            if sample_frames:
+                # If sampling was not forced and the first frame exists, assume
+                # that all frames exist
+                fn = _frames[0] if _frames else 1
+                if not force_reencode and os.path.isfile(outpath % fn):
+                    pb.update()
+                    continue
+
+            if pool is not None:
+                result = pool.apply_async(
+                    _transform_video,
+                    args=(inpath, outpath),
+                    kwds=dict(frames=_frames, **transform_kwargs),
+                )
+            else:
+                _transform_video(
+                    inpath, outpath, frames=_frames, **transform_kwargs
+                )
+                result = None
+
+            pending.append((sample, inpath, outpath, _frames, result))
+            pending_outpaths.add(outpath)
+
+            # Keep a bounded number of jobs queued so that workers stay busy
+            if len(pending) > 2 * (num_workers or 0):
+                _finalize_next()
+
+        while pending:
+            _finalize_next()
+
+
+def _finalize_transform(
+    sample,
+    inpath,
+    outpath,
+    frames,
+    sample_frames=False,
+    output_field=None,
+    save_filepaths=False,
+    update_filepaths=True,
+    diff_field=False,
+    skip_failures=False,
+):
+    if save_filepaths and sample_frames:
+        if frames is None:
+            try:
+                if sample.metadata is None:
+                    sample.compute_metadata()
+
+                frames = range(1, sample.metadata.total_frame_count + 1)
+            except BaseException as e:
+                if not skip_failures:
+                    raise
+
+                frames = []
+                logger.warning(e)
+
+        for fn in frames:
+            frame_path = outpath % fn
+            if os.path.isfile(frame_path):
+                sample.frames[fn][output_field] = frame_path
+
+        sample.save()
+
+    if (
+        update_filepaths
+        and not sample_frames
+        and (diff_field or outpath != inpath)
+    ):
+        sample[output_field] = outpath
+        sample.save()
 
 
 def _transform_video(
@@ -9,6 +9,7 @@ Results are written to `add_samples_benchmark.log`.
 """
 import logging
 import os
+import time
 
 import eta.core.logging as etal
 
@@ -35,12 +36,31 @@ etal.custom_setup(
 # Add samples benchmark
 #
 
+NUM_SAMPLES = int(1e6)
+
 dataset = foz.load_zoo_dataset("cifar10", split="train")
 
-samples = [s.copy() for s in dataset]
+# Replicate CIFAR-10 until we have 1M+ samples
+_samples = [s.copy() for s in dataset]
+samples = []
+while len(samples) < NUM_SAMPLES:
+    samples.extend(s.copy() for s in _samples)
 
-logger.info("\nStarting test")
-for batch_size in [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, None]:
-    logger.info("\nBatch size: %s" % batch_size)
+logger.info("\nStarting test: %d samples" % len(samples))
+for num_workers in [None, 1, 2, 4, 8]:
+    logger.info("\nNum workers: %s" % num_workers)
     dataset2 = fo.Dataset()
-    dataset2.add_samples(samples, _batch_size=batch_size)
+
+    start = time.time()
+    dataset2.add_samples(samples, num_workers=num_workers)
+    duration = time.time() - start
+
+    logger.info(
+        "Added %d samples in %.1fs (%.0f samples/s)"
+        % (len(samples), duration, len(samples) / duration)
+    )
+
+    dataset2.delete()
+
+    # Allow samples to be re-added to a new dataset
+    samples = [s.copy() for s in samples]
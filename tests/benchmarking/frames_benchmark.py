@@ -0,0 +1,75 @@
+"""
+Benchmarking for iterating over the frames of sparsely labeled videos via
+:meth:`fiftyone.core.frame.Frames.values`.
+
+Results are written to `frames_benchmark.log`.
+
+| Copyright 2017-2023, Voxel51, Inc.
+| `voxel51.com <https://voxel51.com/>`_
+|
+"""
+import logging
+import os
+import time
+
+import eta.core.logging as etal
+
+import fiftyone as fo
+
+
+logger = logging.getLogger(__name__)
+
+
+# Logs everything written by a `logger` in this benchmark
+etal.custom_setup(
+    etal.LoggingConfig(
+        dict(
+            filename=os.path.splitext(os.path.abspath(__file__))[0] + ".log",
+            file_format="%(message)s",
+        )
+    ),
+    verbose=False,
+)
+
+
+#
+# Sparse frames benchmark
+#
+
+NUM_FRAMES = 500000
+NUM_LABELED_FRAMES = 20
+NUM_ITERS = 10
+
+step = NUM_FRAMES // NUM_LABELED_FRAMES
+frame_numbers = list(range(step, NUM_FRAMES + 1, step))
+
+sample = fo.Sample(filepath="video.mp4")
+for frame_number in frame_numbers:
+    sample.frames[frame_number] = fo.Frame(
+        gt=fo.Classification(label=str(frame_number))
+    )
+
+dataset = fo.Dataset()
+dataset.add_sample(sample)
+
+logger.info(
+    "\nStarting test: %d labeled frames out of %d"
+    % (NUM_LABELED_FRAMES, NUM_FRAMES)
+)
+
+for name, in_memory in [("in-memory", True), ("database", False)]:
+    durations = []
+    for _ in range(NUM_ITERS):
+        if not in_memory:
+            sample.frames.reload()
+
+        start = time.time()
+        num_frames = sum(1 for _ in sample.frames.values())
+        durations.append(time.time() - start)
+
+    logger.info(
+        "Iterated over %d %s frames in %.4fs (best of %d)"
+        % (num_frames, name, min(durations), NUM_ITERS)
+    )
+
+dataset.delete()
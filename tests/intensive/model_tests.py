@@ -9,11 +9,15 @@ All of these tests are designed to be run manually via::
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+import os
 import unittest
 
 import numpy as np
 
+import eta.core.utils as etau
+
 import fiftyone as fo
+import fiftyone.core.models as fomo
 import fiftyone.zoo as foz
 
 
@@ -100,6 +104,41 @@ def _assert_embedding_dicts_equal(embeddings_dict1, embeddings_dict2):
         assert np.allclose(embeddings1, embeddings2)
 
 
+def test_compute_embeddings_store():
+    dataset = foz.load_zoo_dataset("quickstart")
+    view = dataset.take(50)
+
+    model = foz.load_zoo_model("inception-v3-imagenet-torch")
+
+    with etau.TempDir() as tmp_dir:
+        embeddings1 = view.compute_embeddings(model, batch_size=8)
+        store = view.compute_embeddings(
+            model,
+            batch_size=8,
+            embeddings_store=os.path.join(tmp_dir, "embeddings"),
+        )
+
+        assert store.shape == embeddings1.shape
+        assert list(store.ids.astype(str)) == view.values("id")
+        _assert_embeddings_equal(embeddings1, store.embeddings)
+
+        ids = view.take(10).values("id")
+        embeddings2 = store.get_embeddings(ids)
+        embeddings2b = fomo.EmbeddingsStore(store.path).get_embeddings(ids)
+        _assert_embeddings_equal(embeddings2, embeddings2b)
+
+        patch_embeddings = view.compute_patch_embeddings(model, "ground_truth")
+        store = view.compute_patch_embeddings(
+            model,
+            "ground_truth",
+            embeddings_store=os.path.join(tmp_dir, "patch_embeddings"),
+        )
+
+        for sample_id, embeddings in patch_embeddings.items():
+            inds = store.sample_ids == sample_id.encode()
+            _assert_embeddings_equal(embeddings, store.embeddings[inds])
+
+
 def test_apply_model_frames():
     dataset = foz.load_zoo_dataset("quickstart-video")
     view = dataset.take(2)
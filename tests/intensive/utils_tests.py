@@ -164,6 +164,42 @@ def test_transform_videos(tmpdir):
     assert sample.metadata.frame_width >= 512
 
 
+def test_sample_videos(tmpdir):
+    video_path = os.path.join(tmpdir, "video.avi")
+    dataset_dir = os.path.join(tmpdir, "videos")
+    frames_dir1 = os.path.join(tmpdir, "frames1")
+    frames_dir2 = os.path.join(tmpdir, "frames2")
+
+    _write_video(video_path, fps=5, size=(720, 1280), num_frames=10)
+    dataset = _make_dataset(video_path, dataset_dir, num_samples=8)
+    frames = [[1, 5, 10]] * len(dataset)
+
+    fouv.sample_videos(
+        dataset,
+        frames=frames,
+        output_dir=frames_dir1,
+        output_field="frames1",
+        save_filepaths=True,
+    )
+    fouv.sample_videos(
+        dataset,
+        frames=frames,
+        output_dir=frames_dir2,
+        output_field="frames2",
+        save_filepaths=True,
+        num_workers=4,
+    )
+
+    filepaths1 = dataset.values("frames.frames1", unwind=True)
+    filepaths2 = dataset.values("frames.frames2", unwind=True)
+
+    assert len(filepaths1) == 3 * len(dataset)
+    assert [os.path.relpath(f, frames_dir1) for f in filepaths1] == [
+        os.path.relpath(f, frames_dir2) for f in filepaths2
+    ]
+    assert all(os.path.isfile(f) for f in filepaths2)
+
+
 if __name__ == "__main__":
     fo.config.show_progress_bars = False
     pytest.main([__file__])
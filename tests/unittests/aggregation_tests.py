@@ -658,6 +658,112 @@ class DatasetTests(unittest.TestCase):
         self.assertListEqual(values1, expected)
         self.assertListEqual(values2, expected)
 
+    @drop_datasets
+    def test_values_numpy(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [
+                fo.Sample(
+                    filepath="image1.jpeg",
+                    numeric_field=1,
+                    numeric_list_field=[1, 2, 3],
+                    vector_field=np.array([1.0, 2.0]),
+                    predictions=fo.Detections(
+                        detections=[
+                            fo.Detection(label="cat", confidence=0.9),
+                            fo.Detection(label="dog", confidence=0.8),
+                        ]
+                    ),
+                ),
+                fo.Sample(
+                    filepath="image2.jpeg",
+                    numeric_field=None,
+                    numeric_list_field=[4],
+                    vector_field=np.array([3.0, 4.0]),
+                    predictions=None,
+                ),
+                fo.Sample(
+                    filepath="image3.jpeg",
+                    numeric_field=3,
+                    numeric_list_field=None,
+                    vector_field=np.array([5.0, 6.0]),
+                    predictions=fo.Detections(
+                        detections=[fo.Detection(label="rabbit")]
+                    ),
+                ),
+            ]
+        )
+
+        values = dataset.values("numeric_field", format="numpy")
+        self.assertIsInstance(values, np.ndarray)
+        self.assertTrue(np.isnan(values[1]))
+        self.assertListEqual(values[[0, 2]].tolist(), [1.0, 3.0])
+
+        values = dataset.values(
+            "numeric_field", missing_value=-1, format="numpy"
+        )
+        self.assertEqual(values.dtype, np.int64)
+        self.assertListEqual(values.tolist(), [1, -1, 3])
+
+        values, offsets = dataset.values("numeric_list_field", format="numpy")
+        self.assertListEqual(values.tolist(), [1, 2, 3, 4])
+        self.assertListEqual(offsets.tolist(), [0, 3, 4, 4])
+
+        values = dataset.values("vector_field", format="numpy")
+        self.assertTupleEqual(values.shape, (3, 2))
+
+        labels, offsets = dataset.values(
+            "predictions.detections.label", format="numpy"
+        )
+        self.assertListEqual(labels.tolist(), ["cat", "dog", "rabbit"])
+        self.assertListEqual(offsets.tolist(), [0, 2, 2, 3])
+
+        confs, offsets = dataset.values(
+            "predictions.detections.confidence", format="numpy"
+        )
+        self.assertEqual(confs.dtype, float)
+        self.assertListEqual(confs[:2].tolist(), [0.9, 0.8])
+        self.assertTrue(np.isnan(confs[2]))
+
+        values = dataset.values(
+            "predictions.detections[].label", format="numpy"
+        )
+        self.assertListEqual(values.tolist(), ["cat", "dog", "rabbit"])
+
+        with self.assertRaises(ValueError):
+            dataset.values("numeric_field", format="foo")
+
+    @drop_datasets
+    def test_values_numpy_frames(self):
+        sample1 = fo.Sample(filepath="video1.mp4")
+        sample1.frames[1] = fo.Frame(
+            ground_truth=fo.Classifications(
+                classifications=[fo.Classification(label="cat")]
+            )
+        )
+        sample1.frames[2] = fo.Frame()
+
+        sample2 = fo.Sample(filepath="video2.mp4")
+        sample2.frames[1] = fo.Frame(
+            ground_truth=fo.Classifications(
+                classifications=[
+                    fo.Classification(label="cat"),
+                    fo.Classification(label="dog"),
+                ]
+            )
+        )
+
+        dataset = fo.Dataset()
+        dataset.add_samples([sample1, sample2])
+
+        values, offsets = dataset.values(
+            "frames.ground_truth.classifications.label", format="numpy"
+        )
+        self.assertListEqual(values.tolist(), ["cat", "cat", "dog"])
+        self.assertEqual(len(offsets), 2)
+        self.assertListEqual(offsets[0].tolist(), [0, 2, 3])
+        self.assertListEqual(offsets[1].tolist(), [0, 1, 1, 3])
+
     @drop_datasets
     def test_nan_inf(self):
         dataset = fo.Dataset()
@@ -1213,6 +1319,257 @@ class DatasetTests(unittest.TestCase):
         self.assertDictEqual(counts, {True: 1, False: 4})
         self.assertEqual(len(filepaths), 5)
 
+    @drop_datasets
+    def test_aggregate_num_shards(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [
+                fo.Sample(
+                    filepath="image%d.jpg" % i,
+                    numeric_field=float(i) if i % 3 else None,
+                    numeric_list_field=[i, i + 1],
+                    tags=["even" if i % 2 == 0 else "odd"],
+                    ground_truth=fo.Detections(
+                        detections=[
+                            fo.Detection(label=str(i % 3), confidence=j / 4)
+                            for j in range(i % 4)
+                        ]
+                    ),
+                )
+                for i in range(50)
+            ]
+        )
+
+        aggregations = [
+            fo.Count(),
+            fo.Count("ground_truth.detections"),
+            fo.Sum("numeric_field"),
+            fo.Bounds("numeric_field"),
+            fo.Bounds("numeric_field", safe=True, _count_nonfinites=True),
+            fo.CountValues("tags"),
+            fo.CountValues("ground_truth.detections.label"),
+            fo.HistogramValues("numeric_field", bins=5, range=[0, 50]),
+            fo.Distinct("ground_truth.detections.label"),
+            fo.Mean("numeric_field"),
+            fo.Std("numeric_list_field"),
+            fo.Std("numeric_list_field", sample=True),
+            fo.HistogramValues("numeric_field", auto=True),
+            fo.CountValues("tags", _first=1),
+        ]
+
+        views = [
+            dataset,
+            dataset.match(F("numeric_field") > 10).filter_labels(
+                "ground_truth", F("confidence") > 0.3
+            ),
+            dataset.limit(20),  # unshardable
+        ]
+
+        for view in views:
+            expected = view.aggregate(aggregations)
+            actual = view.aggregate(aggregations, num_shards=4)
+
+            self.assertEqual(len(actual), len(expected))
+            for result, expected_result in zip(actual, expected):
+                self._assert_results_equal(result, expected_result)
+
+        self.assertEqual(dataset.aggregate(fo.Count(), num_shards=4), 50)
+
+        dataset.clear()
+        self.assertListEqual(
+            dataset.aggregate(aggregations[:4], num_shards=4),
+            [0, 0, 0, (None, None)],
+        )
+
+    @drop_datasets
+    def test_std_num_shards(self):
+        # Large offsets with small spread defeat the naive power sum formula
+        values = [1e9 + (i % 7) / 10 for i in range(100)]
+
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [
+                fo.Sample(filepath="image%d.jpg" % i, numeric_field=v)
+                for i, v in enumerate(values)
+            ]
+        )
+
+        for sample in (False, True):
+            expected = np.std(values, ddof=int(sample))
+            std = dataset.aggregate(
+                fo.Std("numeric_field", sample=sample), num_shards=4
+            )
+            self.assertAlmostEqual(std, expected, places=6)
+
+    def _assert_results_equal(self, result, expected):
+        if isinstance(expected, float):
+            self.assertAlmostEqual(result, expected)
+        elif isinstance(expected, (list, tuple)):
+            self.assertEqual(len(result), len(expected))
+            for r, e in zip(result, expected):
+                self._assert_results_equal(r, e)
+        elif isinstance(expected, dict):
+            self.assertSetEqual(set(result.keys()), set(expected.keys()))
+            for k, e in expected.items():
+                self._assert_results_equal(result[k], e)
+        else:
+            self.assertEqual(result, expected)
+
+
+class AggregationCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._cache_size = fo.config.aggregation_cache_size
+        fo.config.aggregation_cache_size = 16
+
+    def tearDown(self):
+        fo.config.aggregation_cache_size = self._cache_size
+
+    @drop_datasets
+    def test_aggregation_cache(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [
+                fo.Sample(filepath="image%d.jpg" % i, int_field=i)
+                for i in range(10)
+            ]
+        )
+        view = dataset.match(F("int_field") >= 5)
+
+        dataset.clear_cache()
+
+        self.assertTupleEqual(view.bounds("int_field"), (5, 9))
+        self.assertTupleEqual(view.bounds("int_field"), (5, 9))
+        self.assertEqual(view.count(), 5)
+
+        stats = dataset.get_aggregation_cache_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["size"], 2)
+
+        # Cached results must not be affected by changes to returned values
+        counts = dataset.count_values("int_field")
+        counts.clear()
+        self.assertEqual(len(dataset.count_values("int_field")), 10)
+
+        # Sample edits invalidate the cache
+        sample = view.first()
+        sample["int_field"] = 100
+        sample.save()
+
+        self.assertTupleEqual(view.bounds("int_field"), (6, 100))
+
+        # Batched edits invalidate the cache
+        view.set_field("int_field", F("int_field") + 1).save()
+        self.assertTupleEqual(view.bounds("int_field"), (7, 101))
+
+        for sample in view.iter_samples(autosave=True):
+            sample["int_field"] = -1
+
+        self.assertTupleEqual(dataset.bounds("int_field"), (-1, 4))
+
+        dataset.set_values("int_field", list(range(10)))
+        self.assertTupleEqual(view.bounds("int_field"), (5, 9))
+
+        # Sample additions and deletions invalidate the cache
+        dataset.add_sample(fo.Sample(filepath="image10.jpg", int_field=10))
+        self.assertEqual(view.count(), 6)
+
+        dataset.delete_samples(view.limit(2))
+        self.assertEqual(view.count(), 4)
+
+        fo.config.aggregation_cache_size = 0
+
+        dataset.clear_cache()
+        self.assertEqual(view.count(), 4)
+        self.assertEqual(view.count(), 4)
+
+        stats = dataset.get_aggregation_cache_stats()
+        self.assertEqual(stats["hits"], 0)
+        self.assertEqual(stats["misses"], 0)
+
+    @drop_datasets
+    def test_aggregation_cache_field_edits(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [
+                fo.Sample(
+                    filepath="image%d.jpg" % i,
+                    a=i,
+                    b=i if i < 2 else None,
+                )
+                for i in range(5)
+            ]
+        )
+
+        def modification_count():
+            stats = dataset.get_aggregation_cache_stats()
+            return stats["modification_count"]
+
+        self.assertEqual(dataset.count("b"), 2)
+
+        # Deleting a field invalidates the cache
+        count = modification_count()
+        dataset.delete_sample_field("b")
+        self.assertGreater(modification_count(), count)
+
+        # Cloning a field invalidates the cache
+        count = modification_count()
+        dataset.clone_sample_field("a", "b")
+        self.assertGreater(modification_count(), count)
+        self.assertEqual(dataset.count("b"), 5)
+
+        # Renaming a field invalidates the cache
+        count = modification_count()
+        dataset.rename_sample_field("b", "c")
+        self.assertGreater(modification_count(), count)
+        self.assertEqual(dataset.count("c"), 5)
+
+        # Clearing a field invalidates the cache
+        count = modification_count()
+        dataset.clear_sample_field("c")
+        self.assertGreater(modification_count(), count)
+        self.assertEqual(dataset.count("c"), 0)
+
+    @drop_datasets
+    def test_aggregation_cache_frame_field_edits(self):
+        sample = fo.Sample(filepath="video.mp4")
+        for frame_number in range(1, 5):
+            sample.frames[frame_number] = fo.Frame(
+                a=frame_number, b=frame_number if frame_number < 3 else None
+            )
+
+        dataset = fo.Dataset()
+        dataset.add_sample(sample)
+
+        def modification_count():
+            stats = dataset.get_aggregation_cache_stats()
+            return stats["modification_count"]
+
+        self.assertEqual(dataset.count("frames.b"), 2)
+
+        # Deleting a frame field invalidates the cache
+        count = modification_count()
+        dataset.delete_frame_field("b")
+        self.assertGreater(modification_count(), count)
+
+        # Cloning a frame field invalidates the cache
+        count = modification_count()
+        dataset.clone_frame_field("a", "b")
+        self.assertGreater(modification_count(), count)
+        self.assertEqual(dataset.count("frames.b"), 4)
+
+        # Renaming a frame field invalidates the cache
+        count = modification_count()
+        dataset.rename_frame_field("b", "c")
+        self.assertGreater(modification_count(), count)
+        self.assertEqual(dataset.count("frames.c"), 4)
+
+        # Clearing a frame field invalidates the cache
+        count = modification_count()
+        dataset.clear_frame_field("c")
+        self.assertGreater(modification_count(), count)
+        self.assertEqual(dataset.count("frames.c"), 0)
+
 
 if __name__ == "__main__":
     fo.config.show_progress_bars = False
@@ -16,6 +16,7 @@ import unittest
 from bson import ObjectId
 from mongoengine import ValidationError
 import numpy as np
+from pymongo.errors import CursorNotFound
 import pytz
 
 import eta.core.utils as etau
@@ -529,6 +530,131 @@ class DatasetTests(unittest.TestCase):
 
         self.assertTupleEqual(dataset.bounds("int"), (4, 53))
 
+        with dataset.save_context(batch_size=7, async_writes=True) as context:
+            for idx, sample in enumerate(dataset):
+                sample["int"] = idx + 5
+                context.save(sample)
+
+        self.assertTupleEqual(dataset.bounds("int"), (5, 54))
+
+        view = dataset.select_fields("int")
+        with view.save_context(batch_size=7, async_writes=True) as context:
+            for idx, sample in enumerate(view):
+                sample["int"] = idx + 6
+                context.save(sample)
+
+        self.assertTupleEqual(dataset.bounds("int"), (6, 55))
+        self.assertEqual(dataset.first()["int"], 6)
+
+    @drop_datasets
+    def test_save_context_failures(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [fo.Sample(filepath="image%d.jpg" % i, uid=i) for i in range(20)]
+        )
+        dataset.create_index("uid", unique=True)
+        ids = dataset.values("id")
+
+        def _edit(context):
+            # The 8th sample's update violates the unique index
+            num_saved = 0
+            for idx, sample in enumerate(dataset):
+                sample["uid"] = 19 if idx == 7 else idx + 100
+                context.save(sample)
+                num_saved += 1
+
+            return num_saved
+
+        for async_writes in (False, True):
+            dataset.set_values("uid", list(range(20)))
+
+            num_saved = None
+            with self.assertRaises(Exception):
+                with dataset.save_context(
+                    batch_size=5, async_writes=async_writes
+                ) as context:
+                    num_saved = _edit(context)
+
+            # Async write errors are raised on exit, not by unrelated saves
+            if async_writes:
+                self.assertEqual(num_saved, 20)
+
+            dataset.set_values("uid", list(range(20)))
+
+            with self.assertLogs("fiftyone.core.collections") as logs:
+                with dataset.save_context(
+                    batch_size=5,
+                    async_writes=async_writes,
+                    skip_failures=True,
+                ) as context:
+                    _edit(context)
+
+            # Only the failed batch is reported, against its own samples
+            self.assertEqual(len(logs.output), 1)
+            self.assertIn(str(ids[7]), logs.output[0])
+            self.assertNotIn(str(ids[10]), logs.output[0])
+
+            # Other batches, and the unordered writes of the failed batch,
+            # were still written
+            uids = dataset.values("uid")
+            self.assertEqual(uids[7], 7)
+            self.assertListEqual(
+                uids[:7] + uids[8:],
+                [idx + 100 for idx in range(20) if idx != 7],
+            )
+
+    @drop_datasets
+    def test_iter_samples_prefetch(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [fo.Sample(filepath="image%d.jpg" % i) for i in range(50)]
+        )
+        filepaths = dataset.values("filepath")
+
+        samples = list(dataset.iter_samples(prefetch=4))
+        self.assertListEqual([s.filepath for s in samples], filepaths)
+
+        for idx, sample in enumerate(
+            dataset.iter_samples(autosave=True, prefetch=4)
+        ):
+            sample["int"] = idx + 1
+
+        self.assertTupleEqual(dataset.bounds("int"), (1, 50))
+
+        view = dataset.skip(10)
+        for idx, sample in enumerate(view.iter_samples(prefetch=4)):
+            if idx == 5:
+                break
+
+        self.assertEqual(sample.filepath, filepaths[15])
+
+        # Cursor timeouts are resumed from the last fetched sample
+        aggregate = dataset._aggregate
+
+        def _aggregate(*args, **kwargs):
+            dataset._aggregate = aggregate
+            for idx, d in enumerate(aggregate(*args, **kwargs)):
+                if idx == 20:
+                    raise CursorNotFound("cursor timed out")
+
+                yield d
+
+        dataset._aggregate = _aggregate
+
+        samples = list(dataset.iter_samples(prefetch=4))
+        self.assertListEqual([s.filepath for s in samples], filepaths)
+
+        # Errors raised while fetching are propagated
+        def _aggregate(*args, **kwargs):
+            dataset._aggregate = aggregate
+            raise ValueError("fetch failed")
+            yield
+
+        dataset._aggregate = _aggregate
+
+        with self.assertRaises(ValueError):
+            list(dataset.iter_samples(prefetch=4))
+
     @drop_datasets
     def test_date_fields(self):
         dataset = fo.Dataset()
@@ -1672,6 +1798,47 @@ class DatasetTests(unittest.TestCase):
                 ],
             )
 
+    @drop_datasets
+    def test_add_samples_num_workers(self):
+        samples = [
+            fo.Sample(
+                filepath="image%d.jpg" % i,
+                int_field=i,
+                ground_truth=fo.Classification(label=str(i % 3)),
+            )
+            for i in range(100)
+        ]
+        samples.append(fo.Sample(filepath="image100.jpg", new_field="foo"))
+
+        dataset = fo.Dataset()
+        sample_ids = dataset.add_samples(samples, num_workers=4)
+
+        self.assertEqual(len(dataset), 101)
+        self.assertListEqual(sample_ids, dataset.values("id"))
+        self.assertListEqual(
+            dataset.values("filepath"), [s.filepath for s in samples]
+        )
+        self.assertListEqual(
+            dataset.values("int_field"), list(range(100)) + [None]
+        )
+        self.assertIn("new_field", dataset.get_field_schema())
+        self.assertTrue(all(s.in_dataset for s in samples))
+        self.assertEqual(samples[0].id, sample_ids[0])
+
+        bad_samples = [
+            fo.Sample(filepath="image%d.jpg" % i, int_field=i)
+            for i in range(10)
+        ]
+        bad_samples.append(fo.Sample(filepath="bad.jpg", int_field="foo"))
+
+        dataset2 = fo.Dataset()
+        dataset2.add_sample_field("int_field", fo.IntField)
+
+        with self.assertRaises(ValueError):
+            dataset2.add_samples(bad_samples, num_workers=2)
+
+        self.assertNotIn("bad.jpg", dataset2.values("filepath"))
+
     @drop_datasets
     def test_add_collection(self):
         sample1 = fo.Sample(filepath="image.jpg", foo="bar")
@@ -5,10 +5,12 @@ FiftyOne evaluation-related unit tests.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+import itertools
 import os
 import random
 import string
 import unittest
+from unittest import mock
 import warnings
 
 import numpy as np
@@ -16,6 +18,10 @@ import numpy as np
 import eta.core.utils as etau
 
 import fiftyone as fo
+from fiftyone import ViewField as F
+import fiftyone.utils.eval.classification as foucl
+import fiftyone.utils.eval.coco as fouc
+import fiftyone.utils.eval.detection as foud
 import fiftyone.utils.labels as foul
 import fiftyone.utils.iou as foui
 
@@ -271,6 +277,59 @@ class ClassificationTests(unittest.TestCase):
 
         return dataset
 
+    @drop_datasets
+    def test_evaluate_classifications_incremental(self):
+        dataset = self._make_classification_dataset()
+
+        results = dataset.evaluate_classifications(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval",
+            incremental=True,
+        )
+
+        self.assertEqual(len(results.fingerprints), 5)
+        self.assertListEqual(
+            dataset.values("eval"), [True, False, False, True, False]
+        )
+
+        sample = dataset.last()
+        sample.predictions.label = "cat"
+        sample.save()
+
+        eval_cls = fo.utils.eval.classification.SimpleEvaluation
+        with mock.patch.object(
+            eval_cls,
+            "evaluate_samples",
+            autospec=True,
+            side_effect=eval_cls.evaluate_samples,
+        ) as evaluate_samples:
+            results = dataset.evaluate_classifications(
+                "predictions",
+                gt_field="ground_truth",
+                eval_key="eval",
+                incremental=True,
+            )
+
+        # Only the changed sample was re-evaluated
+        samples = evaluate_samples.call_args.args[1]
+        self.assertListEqual(samples.values("id"), [sample.id])
+
+        dataset2 = dataset.clone()
+        results2 = dataset2.evaluate_classifications(
+            "predictions", gt_field="ground_truth", eval_key="eval"
+        )
+
+        self.assertListEqual(dataset.values("eval"), dataset2.values("eval"))
+        self.assertListEqual(
+            sorted(zip(results.ytrue, results.ypred, results.confs)),
+            sorted(zip(results2.ytrue, results2.ypred, results2.confs)),
+        )
+        self.assertListEqual(
+            sorted(results.ytrue_ids.tolist(), key=str),
+            sorted(results2.ytrue_ids.tolist(), key=str),
+        )
+
     @drop_datasets
     def test_evaluate_classifications_simple(self):
         dataset = self._make_classification_dataset()
@@ -468,6 +527,69 @@ class ClassificationTests(unittest.TestCase):
             [False, False, False, True, False],
         )
 
+    @drop_datasets
+    def test_evaluate_classifications_top_k_logits(self):
+        classes = ["cat", "dog", "bird", "fish"]
+        logits = np.array(
+            [
+                [4.0, 3.0, 2.0, 1.0],
+                [4.0, 3.0, 2.0, 1.0],
+                [1.0, 2.0, 3.0, 4.0],
+            ],
+            dtype=np.float32,
+        )
+
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [
+                fo.Sample(
+                    filepath="image%d.jpg" % i,
+                    ground_truth=fo.Classification(label=label),
+                    predictions=fo.Classification(
+                        label=classes[np.argmax(l)], logits=l
+                    ),
+                )
+                for i, (label, l) in enumerate(
+                    zip(["dog", "bird", "cat"], logits)
+                )
+            ]
+        )
+
+        results = dataset.evaluate_classifications(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval",
+            classes=classes,
+            method="top-k",
+            k=2,
+        )
+
+        self.assertListEqual(dataset.values("eval"), [True, False, False])
+        self.assertListEqual(list(results.ypred), ["dog", "cat", "fish"])
+
+        expected = [
+            np.exp(l[classes.index(p)]) / np.sum(np.exp(l))
+            for l, p in zip(logits.astype(float), results.ypred)
+        ]
+        self.assertTrue(np.allclose(results.confs, expected))
+
+        # Large logits must not overflow, and logits are loaded in batches
+        for sample, l in zip(dataset, logits):
+            sample.predictions.logits = l + 1000.0
+            sample.save()
+
+        with mock.patch.object(foucl, "_TOP_K_BATCH_SAMPLES", 2):
+            results = dataset.evaluate_classifications(
+                "predictions",
+                gt_field="ground_truth",
+                classes=classes,
+                method="top-k",
+                k=2,
+            )
+
+        self.assertListEqual(list(results.ypred), ["dog", "cat", "fish"])
+        self.assertTrue(np.allclose(results.confs, expected))
+
     @drop_datasets
     def test_evaluate_classifications_binary(self):
         dataset = self._make_classification_dataset()
@@ -1594,6 +1716,302 @@ class DetectionsTests(unittest.TestCase):
 
         self._evaluate_open_images(dataset, kwargs)
 
+    @drop_datasets
+    def test_evaluate_detections_num_workers(self):
+        dataset = self._make_detections_dataset()
+
+        results1 = dataset.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval1",
+            compute_mAP=True,
+        )
+        results2 = dataset.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval2",
+            compute_mAP=True,
+            num_workers=2,
+        )
+
+        self.assertListEqual(list(results1.ytrue), list(results2.ytrue))
+        self.assertListEqual(list(results1.ypred), list(results2.ypred))
+        self.assertListEqual(list(results1.ious), list(results2.ious))
+        self.assertEqual(results1.mAP(), results2.mAP())
+
+        for suffix in ("tp", "fp", "fn"):
+            self.assertListEqual(
+                dataset.values("eval1_" + suffix),
+                dataset.values("eval2_" + suffix),
+            )
+
+        for field in ("ground_truth", "predictions"):
+            for suffix in ("", "_id", "_iou"):
+                self.assertListEqual(
+                    dataset.values("%s.detections.eval1%s" % (field, suffix)),
+                    dataset.values("%s.detections.eval2%s" % (field, suffix)),
+                )
+
+        self.assertListEqual(dataset.values("eval2_tp"), [0, 0, 0, 1, 0])
+        self.assertListEqual(
+            dataset.values("ground_truth.detections.eval2"),
+            [None, ["fn"], None, ["tp"], ["fn"]],
+        )
+
+        # Label elements of filtered views are updated in-place
+
+        view = dataset.filter_labels("predictions", F("label") == "dog")
+        view.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval3",
+            num_workers=2,
+        )
+
+        self.assertListEqual(
+            dataset.values("predictions.detections.eval3"),
+            [None, None, [None], [None], ["fp"]],
+        )
+        self.assertEqual(dataset.count("predictions.detections"), 3)
+
+    @drop_datasets
+    def test_evaluate_detections_batches(self):
+        dataset = self._make_detections_dataset()
+
+        dataset.evaluate_detections(
+            "predictions", gt_field="ground_truth", eval_key="eval1"
+        )
+
+        # The serial path doesn't configure the worker globals
+        with mock.patch.object(foud, "_BATCH_SIZE", 2), mock.patch.object(
+            foud, "_init_worker", side_effect=foud._init_worker
+        ) as init_worker:
+            dataset.evaluate_detections(
+                "predictions", gt_field="ground_truth", eval_key="eval2"
+            )
+
+        init_worker.assert_not_called()
+
+        with mock.patch.object(foud, "_BATCH_SIZE", 2):
+            dataset.evaluate_detections(
+                "predictions",
+                gt_field="ground_truth",
+                eval_key="eval3",
+                num_workers=2,
+            )
+
+        for eval_key in ("eval2", "eval3"):
+            for suffix in ("tp", "fp", "fn"):
+                self.assertListEqual(
+                    dataset.values("eval1_" + suffix),
+                    dataset.values("%s_%s" % (eval_key, suffix)),
+                )
+
+            for field in ("ground_truth", "predictions"):
+                for suffix in ("", "_id", "_iou"):
+                    self.assertListEqual(
+                        dataset.values(
+                            "%s.detections.eval1%s" % (field, suffix)
+                        ),
+                        dataset.values(
+                            "%s.detections.%s%s" % (field, eval_key, suffix)
+                        ),
+                    )
+
+    @drop_datasets
+    def test_evaluate_detections_samples(self):
+        dataset = self._make_detections_dataset()
+
+        with mock.patch.object(
+            fouc.COCOEvaluation,
+            "evaluate",
+            autospec=True,
+            side_effect=fouc.COCOEvaluation.evaluate,
+        ) as evaluate:
+            dataset.evaluate_detections(
+                "predictions", gt_field="ground_truth", eval_key="eval"
+            )
+
+        # Evaluation methods receive samples, not raw label dicts
+        docs = [call.args[1] for call in evaluate.call_args_list]
+        self.assertTrue(all(isinstance(d, fo.Sample) for d in docs))
+        self.assertListEqual(
+            [d.filepath for d in docs], dataset.values("filepath")
+        )
+        self.assertListEqual(dataset.values("eval_tp"), [0, 0, 0, 1, 0])
+
+    @drop_datasets
+    def test_evaluate_detections_pr_curves(self):
+        def _det(label, bounding_box, confidence=None, iscrowd=False):
+            detection = fo.Detection(
+                label=label, bounding_box=bounding_box, confidence=confidence
+            )
+            if iscrowd:
+                detection["iscrowd"] = 1
+
+            return detection
+
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [
+                # Confidence ties between a true and false positive
+                fo.Sample(
+                    filepath="image1.jpg",
+                    ground_truth=fo.Detections(
+                        detections=[_det("cat", [0.1, 0.1, 0.4, 0.4])]
+                    ),
+                    predictions=fo.Detections(
+                        detections=[
+                            _det("cat", [0.1, 0.1, 0.4, 0.4], 0.9),
+                            _det("cat", [0.6, 0.6, 0.3, 0.3], 0.9),
+                        ]
+                    ),
+                ),
+                # A match with IoU 0.6, which is only a true positive at the
+                # first IoU threshold
+                fo.Sample(
+                    filepath="image2.jpg",
+                    ground_truth=fo.Detections(
+                        detections=[
+                            _det("dog", [0.1, 0.1, 0.5, 0.5]),
+                            _det("cat", [0.6, 0.1, 0.3, 0.3]),
+                        ]
+                    ),
+                    predictions=fo.Detections(
+                        detections=[
+                            _det("dog", [0.1, 0.1, 0.5, 0.3], 0.8),
+                            _det("cat", [0.6, 0.1, 0.3, 0.3], 0.7),
+                        ]
+                    ),
+                ),
+                # Predictions that match crowds are ignored
+                fo.Sample(
+                    filepath="image3.jpg",
+                    ground_truth=fo.Detections(
+                        detections=[
+                            _det("dog", [0.0, 0.0, 1.0, 1.0], iscrowd=True),
+                            _det("dog", [0.5, 0.5, 0.2, 0.2]),
+                        ]
+                    ),
+                    predictions=fo.Detections(
+                        detections=[
+                            _det("dog", [0.0, 0.0, 0.5, 0.5], 0.6),
+                            _det("dog", [0.5, 0.0, 0.5, 0.5], 0.9),
+                            _det("dog", [0.5, 0.5, 0.2, 0.2], 0.5),
+                        ]
+                    ),
+                ),
+                # A class with ground truth but no predictions, and a class
+                # with predictions but no ground truth
+                fo.Sample(
+                    filepath="image4.jpg",
+                    ground_truth=fo.Detections(
+                        detections=[_det("bird", [0.2, 0.2, 0.2, 0.2])]
+                    ),
+                    predictions=fo.Detections(
+                        detections=[
+                            _det("fish", [0.6, 0.1, 0.2, 0.2], 0.95),
+                            _det("cat", [0.7, 0.7, 0.2, 0.2], 0.7),
+                        ]
+                    ),
+                ),
+            ]
+        )
+
+        results = dataset.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            compute_mAP=True,
+            iou_threshs=[0.5, 0.75],
+        )
+
+        def _curve(*runs):
+            return list(
+                itertools.chain.from_iterable([v] * n for v, n in runs)
+            )
+
+        # (IoU threshold, class) -> (precision, thresholds)
+        expected = {
+            (0, "bird"): (_curve((0, 101)), _curve((0, 101))),
+            (0, "cat"): (
+                _curve((1, 51), (2 / 3, 50)),
+                _curve((0.9, 51), (0.7, 50)),
+            ),
+            (0, "dog"): (_curve((1, 101)), _curve((0.8, 51), (0.5, 50))),
+            (0, "fish"): (_curve((-1, 101)), _curve((-1, 101))),
+            (1, "bird"): (_curve((0, 101)), _curve((0, 101))),
+            (1, "cat"): (
+                _curve((1, 51), (2 / 3, 50)),
+                _curve((0.9, 51), (0.7, 50)),
+            ),
+            (1, "dog"): (
+                _curve((0.5, 51), (0, 50)),
+                _curve((0.8, 1), (0.5, 50), (0, 50)),
+            ),
+            (1, "fish"): (_curve((-1, 101)), _curve((-1, 101))),
+        }
+
+        self.assertListEqual(
+            list(results.classes), ["bird", "cat", "dog", "fish"]
+        )
+        self.assertTupleEqual(results.precision.shape, (2, 4, 101))
+
+        for (idx, label), (precision, thresholds) in expected.items():
+            c_idx = list(results.classes).index(label)
+            self.assertTrue(
+                np.allclose(results.precision[idx, c_idx], precision)
+            )
+            self.assertTrue(
+                np.allclose(results.thresholds[idx, c_idx], thresholds)
+            )
+
+    @drop_datasets
+    def test_evaluate_detections_incremental(self):
+        dataset = self._make_detections_dataset()
+
+        results = dataset.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval",
+            incremental=True,
+        )
+
+        self.assertEqual(len(results.fingerprints), 5)
+        self.assertListEqual(dataset.values("eval_tp"), [0, 0, 0, 1, 0])
+
+        sample = dataset.last()
+        sample.ground_truth.detections[0].label = "dog"
+        sample.save()
+
+        results = dataset.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval",
+            incremental=True,
+        )
+
+        self.assertListEqual(dataset.values("eval_tp"), [0, 0, 0, 1, 1])
+        self.assertListEqual(dataset.values("eval_fp"), [0, 0, 1, 0, 0])
+        self.assertListEqual(dataset.values("eval_fn"), [0, 1, 0, 0, 0])
+        self.assertListEqual(
+            dataset.values("ground_truth.detections.eval"),
+            [None, ["fn"], None, ["tp"], ["tp"]],
+        )
+
+        dataset2 = dataset.clone()
+        results2 = dataset2.evaluate_detections(
+            "predictions", gt_field="ground_truth", eval_key="eval"
+        )
+
+        self.assertListEqual(
+            sorted(zip(results.ytrue, results.ypred, results.ypred_ids)),
+            sorted(zip(results2.ytrue, results2.ypred, results2.ypred_ids)),
+        )
+
+        dataset.clear_cache()
+        results = dataset.load_evaluation_results("eval")
+        self.assertEqual(len(results.fingerprints), 5)
+
     @drop_datasets
     def test_load_evaluation_view_select_fields(self):
         dataset = self._make_detections_dataset()
@@ -1777,6 +2195,176 @@ class CuboidTests(unittest.TestCase):
         self._check_iou(dataset, "test4_box1", "test4_box4", expected_iou)
 
 
+class IoUTests(unittest.TestCase):
+    def test_compute_bbox_ious(self):
+        preds = [
+            fo.Detection(label="cat", bounding_box=[0.0, 0.0, 0.5, 0.5]),
+            fo.Detection(label="dog", bounding_box=[0.25, 0.0, 0.5, 0.5]),
+            fo.Detection(label="cat", bounding_box=[0.6, 0.6, 0.2, 0.2]),
+        ]
+        gts = [
+            fo.Detection(label="cat", bounding_box=[0.0, 0.0, 0.5, 0.5]),
+            fo.Detection(
+                label="dog", bounding_box=[0.0, 0.0, 1.0, 1.0], iscrowd=True
+            ),
+        ]
+
+        ious = foui.compute_ious(preds, gts)
+        expected = np.array([[1.0, 0.25], [1.0 / 3.0, 0.25], [0.0, 0.04]])
+        self.assertTrue(np.allclose(ious, expected))
+
+        ious = foui.compute_ious(preds, gts, iscrowd="iscrowd")
+        expected[:, 1] = [1.0, 1.0, 1.0]
+        self.assertTrue(np.allclose(ious, expected))
+
+        ious = foui.compute_ious(preds, gts, classwise=True)
+        expected = np.array([[1.0, 0.0], [0.0, 0.25], [0.0, 0.0]])
+        self.assertTrue(np.allclose(ious, expected))
+
+        ious = foui.compute_ious(preds, preds)
+        expected = np.array(
+            [[1.0, 1.0 / 3.0, 0.0], [1.0 / 3.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+        )
+        self.assertTrue(np.allclose(ious, expected))
+
+    def test_compute_keypoint_similarities(self):
+        preds = [
+            fo.Keypoint(label="cat", points=[[0.0, 0.0], [1.0, 1.0]]),
+            fo.Keypoint(label="dog", points=[[0.0, 0.0], [None, None]]),
+            fo.Keypoint(label="cat", points=[[0.0, 0.0]]),
+        ]
+        gts = [
+            fo.Keypoint(label="cat", points=[[0.0, 0.0], [1.0, 1.0]]),
+            fo.Keypoint(
+                label="dog",
+                points=[[None, None], [0.0, 0.0], [1.0, 1.0]],
+            ),
+        ]
+
+        sims = foui.compute_ious(preds, gts)
+
+        # Missing GT points are skipped and missing predicted points are
+        # treated as maximally distant
+        expected = np.array(
+            [
+                [1.0, np.exp(-1.0)],
+                [0.5 * (1.0 + np.exp(-0.5)), np.exp(-0.5)],
+                [1.0, 0.0],
+            ]
+        )
+        self.assertTrue(np.allclose(sims, expected))
+
+        sims = foui.compute_ious(preds, gts, classwise=True)
+        expected[0, 1] = 0.0
+        expected[1, 0] = 0.0
+        expected[2, 1] = 0.0
+        self.assertTrue(np.allclose(sims, expected))
+
+    def _make_duplicates_dataset(self):
+        dataset = fo.Dataset()
+
+        sample1 = fo.Sample(filepath="image1.jpg")
+        sample2 = fo.Sample(
+            filepath="image2.jpg",
+            detections=fo.Detections(
+                detections=[
+                    fo.Detection(
+                        label="cat", bounding_box=[0.0, 0.0, 0.5, 0.5]
+                    ),
+                    fo.Detection(
+                        label="cat", bounding_box=[0.0, 0.0, 0.5, 0.5]
+                    ),
+                    fo.Detection(
+                        label="dog", bounding_box=[0.25, 0.0, 0.5, 0.5]
+                    ),
+                ]
+            ),
+        )
+        sample3 = fo.Sample(
+            filepath="image3.jpg",
+            detections=fo.Detections(
+                detections=[
+                    fo.Detection(
+                        label="cat", bounding_box=[0.6, 0.6, 0.2, 0.2]
+                    ),
+                ]
+            ),
+        )
+
+        dataset.add_samples([sample1, sample2, sample3])
+
+        return dataset
+
+    @drop_datasets
+    def test_compute_max_ious(self):
+        dataset = self._make_duplicates_dataset()
+
+        foui.compute_max_ious(dataset, "detections", id_attr="max_iou_id")
+
+        max_ious = dataset.values("detections.detections.max_iou")
+        self.assertEqual(max_ious[0], None)
+        self.assertTrue(np.allclose(max_ious[1], [1.0, 1.0, 1.0 / 3.0]))
+        self.assertListEqual(max_ious[2], [None])
+
+        ids = dataset.values("detections.detections.id")
+        max_iou_ids = dataset.values("detections.detections.max_iou_id")
+        self.assertListEqual(max_iou_ids[1], [ids[1][1], ids[1][0], ids[1][0]])
+
+        foui.compute_max_ious(
+            dataset, "detections", iou_attr="max_iou2", num_workers=2
+        )
+
+        max_ious2 = dataset.values("detections.detections.max_iou2")
+        self.assertListEqual(max_ious2, max_ious)
+
+        # Labels are processed in batches, and the serial path doesn't
+        # configure the worker globals
+        with mock.patch.object(foui, "_BATCH_SIZE", 1), mock.patch.object(
+            foui, "_init_worker", side_effect=foui._init_worker
+        ) as init_worker:
+            foui.compute_max_ious(dataset, "detections", iou_attr="max_iou3")
+
+        init_worker.assert_not_called()
+
+        max_ious3 = dataset.values("detections.detections.max_iou3")
+        self.assertListEqual(max_ious3, max_ious)
+
+    @drop_datasets
+    def test_find_duplicates(self):
+        dataset = self._make_duplicates_dataset()
+        ids = dataset.values("detections.detections.id")
+
+        dup_ids = foui.find_duplicates(dataset, "detections")
+        self.assertListEqual(dup_ids, [ids[1][1]])
+
+        dup_ids = foui.find_duplicates(
+            dataset, "detections", iou_thresh=0.3, num_workers=2
+        )
+        self.assertListEqual(dup_ids, [ids[1][1], ids[1][2]])
+
+        dup_ids = foui.find_duplicates(
+            dataset, "detections", iou_thresh=0.3, method="greedy"
+        )
+        self.assertListEqual(dup_ids, [ids[1][0], ids[1][1]])
+
+        for method in ("simple", "greedy"):
+            for iou_thresh in (0.0, 0.3, 0.999):
+                dup_ids = foui.find_duplicates(
+                    dataset,
+                    "detections",
+                    iou_thresh=iou_thresh,
+                    method=method,
+                )
+                sparse_dup_ids = foui.find_duplicates(
+                    dataset,
+                    "detections",
+                    iou_thresh=iou_thresh,
+                    method=method,
+                    sparse=True,
+                )
+                self.assertListEqual(sparse_dup_ids, dup_ids)
+
+
 class VideoDetectionsTests(unittest.TestCase):
     def _make_video_detections_dataset(self):
         dataset = fo.Dataset()
@@ -1852,6 +2440,30 @@ class VideoDetectionsTests(unittest.TestCase):
 
         return dataset
 
+    @drop_datasets
+    def test_evaluate_video_detections_frames(self):
+        dataset = self._make_video_detections_dataset()
+
+        with mock.patch.object(
+            fouc.COCOEvaluation,
+            "evaluate",
+            autospec=True,
+            side_effect=fouc.COCOEvaluation.evaluate,
+        ) as evaluate:
+            dataset.evaluate_detections(
+                "frames.predictions",
+                gt_field="frames.ground_truth",
+                eval_key="eval",
+            )
+
+        # Evaluation methods receive frames, not raw label dicts
+        docs = [call.args[1] for call in evaluate.call_args_list]
+        self.assertTrue(all(isinstance(d, fo.Frame) for d in docs))
+        self.assertListEqual(
+            [d.frame_number for d in docs],
+            dataset.values("frames.frame_number", unwind=True),
+        )
+
     def test_evaluate_video_detections_coco(self):
         dataset = self._make_video_detections_dataset()
 
@@ -2640,6 +3252,68 @@ class SegmentationTests(unittest.TestCase):
         self.assertNotIn("eval2_precision", dataset.get_field_schema())
         self.assertNotIn("eval2_recall", dataset.get_field_schema())
 
+    @drop_datasets
+    def test_evaluate_segmentations_num_workers(self):
+        dataset = self._make_segmentation_dataset()
+        view = dataset.exists("ground_truth").exists("predictions")
+
+        results1 = view.evaluate_segmentations(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval1",
+            compute_dice=True,
+        )
+
+        results2 = view.evaluate_segmentations(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval2",
+            compute_dice=True,
+            num_workers=2,
+        )
+
+        self.assertTrue(
+            (
+                results1.pixel_confusion_matrix
+                == results2.pixel_confusion_matrix
+            ).all()
+        )
+
+        for metric in ("accuracy", "precision", "recall", "dice"):
+            self.assertListEqual(
+                view.values("eval1_" + metric),
+                view.values("eval2_" + metric),
+            )
+
+        self.assertListEqual(view.values("eval2_accuracy"), [1.0, 0.0])
+
+    @drop_datasets
+    def test_evaluate_segmentations_missing_masks(self):
+        dataset = self._make_segmentation_dataset()
+        dataset.add_sample_field("eval_accuracy", fo.FloatField)
+        dataset.set_values("eval_accuracy", [-1.0] * len(dataset))
+
+        for num_workers in (None, 2):
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")  # suppress missing masks
+
+                dataset.evaluate_segmentations(
+                    "predictions",
+                    gt_field="ground_truth",
+                    eval_key="eval",
+                    mask_targets={0: "background", 1: "cat", 2: "dog"},
+                    num_workers=num_workers,
+                )
+
+            # Samples with missing masks are skipped
+            self.assertListEqual(
+                dataset.values("eval_accuracy"), [-1.0, -1.0, -1.0, 1.0, 0.0]
+            )
+
+            dataset.delete_evaluation("eval")
+            dataset.add_sample_field("eval_accuracy", fo.FloatField)
+            dataset.set_values("eval_accuracy", [-1.0] * len(dataset))
+
 
 class VideoSegmentationTests(unittest.TestCase):
     def _make_video_segmentation_dataset(self):
@@ -2671,6 +3345,39 @@ class VideoSegmentationTests(unittest.TestCase):
 
         return dataset
 
+    @drop_datasets
+    def test_evaluate_video_segmentations_missing_masks(self):
+        dataset = self._make_video_segmentation_dataset()
+        dataset.add_sample_field("eval_accuracy", fo.FloatField)
+        dataset.add_frame_field("eval_accuracy", fo.FloatField)
+        dataset.set_values("eval_accuracy", [-1.0] * len(dataset))
+        dataset.set_values(
+            "frames.eval_accuracy",
+            [
+                [-1.0] * len(fns)
+                for fns in dataset.values("frames.frame_number")
+            ],
+        )
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # suppress missing masks warning
+
+            dataset.evaluate_segmentations(
+                "frames.predictions",
+                gt_field="frames.ground_truth",
+                eval_key="eval",
+                mask_targets={0: "background", 1: "cat", 2: "dog"},
+            )
+
+        # Samples and frames with missing masks are skipped
+        self.assertListEqual(
+            dataset.values("eval_accuracy"), [-1.0, -1.0, -1.0, 1.0 / 3]
+        )
+        self.assertListEqual(
+            dataset.values("frames.eval_accuracy"),
+            [[], [-1.0], [-1.0, -1.0], [1.0, 0.0]],
+        )
+
     @drop_datasets
     def test_evaluate_video_segmentations_simple(self):
         dataset = self._make_video_segmentation_dataset()
@@ -195,6 +195,11 @@ class GroupTests(unittest.TestCase):
 
         self.assertEqual(num_groups, 2)
 
+        groups = list(dataset.iter_groups(prefetch=1))
+        self.assertEqual(len(groups), 2)
+        for group in groups:
+            self.assertSetEqual(set(group.keys()), {"left", "ego", "right"})
+
         for group in dataset.iter_groups(group_slices="right"):
             self.assertIsInstance(group, dict)
             self.assertNotIn("left", group)
@@ -0,0 +1,144 @@
+"""
+FiftyOne models-related unit tests.
+
+| Copyright 2017-2023, Voxel51, Inc.
+| `voxel51.com <https://voxel51.com/>`_
+|
+"""
+import os
+from types import SimpleNamespace
+import unittest
+
+from bson import ObjectId
+import numpy as np
+
+import eta.core.image as etai
+import eta.core.utils as etau
+
+import fiftyone as fo
+import fiftyone.core.models as fomo
+
+
+class ImageBatchesTests(unittest.TestCase):
+    def _make_batches(self, tmp_dir, num_batches, batch_size, missing=None):
+        batches = []
+        for i in range(num_batches):
+            batch = []
+            for j in range(batch_size):
+                idx = i * batch_size + j
+                filepath = os.path.join(tmp_dir, "%d.png" % idx)
+                if idx != missing:
+                    img = np.full((4, 4, 3), idx, dtype=np.uint8)
+                    etai.write(img, filepath)
+
+                batch.append(SimpleNamespace(filepath=filepath, idx=idx))
+
+            batches.append(batch)
+
+        return batches
+
+    def test_iter_image_batches(self):
+        with etau.TempDir() as tmp_dir:
+            batches = self._make_batches(tmp_dir, 6, 3, missing=7)
+
+            for num_workers in (0, 1, 4, None):
+                results = list(
+                    fomo._iter_image_batches(iter(batches), num_workers)
+                )
+
+                # Batches are emitted in order
+                self.assertEqual(len(results), len(batches))
+                for batch, (sample_batch, imgs) in zip(batches, results):
+                    self.assertIs(sample_batch, batch)
+
+                    # Failures are passed through for the affected batch only
+                    if batch[0].idx == 6:
+                        self.assertIsInstance(imgs, Exception)
+                        continue
+
+                    self.assertListEqual(
+                        [int(img[0, 0, 0]) for img in imgs],
+                        [sample.idx for sample in batch],
+                    )
+
+    def test_iter_image_batches_prefetch(self):
+        with etau.TempDir() as tmp_dir:
+            batches = self._make_batches(tmp_dir, 10, 2)
+
+            num_loaded = []
+
+            def _samples_loader():
+                for batch in batches:
+                    num_loaded.append(batch[0].idx)
+                    yield batch
+
+            images_loader = fomo._iter_image_batches(_samples_loader(), 4)
+
+            # Only a fixed number of batches are loaded ahead, regardless of
+            # the number of workers
+            next(images_loader)
+            self.assertEqual(len(num_loaded), fomo._IMAGE_PREFETCH_BATCHES + 1)
+
+            # Closing the generator early stops loading batches
+            images_loader.close()
+            self.assertEqual(len(num_loaded), fomo._IMAGE_PREFETCH_BATCHES + 1)
+
+
+class EmbeddingsStoreTests(unittest.TestCase):
+    def test_embeddings_store(self):
+        ids = [str(ObjectId()) for _ in range(20)]
+        sample_ids = [str(ObjectId()) for _ in range(20)]
+        embeddings = np.random.rand(20, 8).astype(np.float32)
+
+        with etau.TempDir() as tmp_dir:
+            path = os.path.join(tmp_dir, "store")
+
+            with fomo._EmbeddingsStoreWriter(
+                path, has_sample_ids=True
+            ) as writer:
+                writer.add(ids[0], embeddings[0], sample_id=sample_ids[0])
+                writer.add_all(
+                    ids[1:], embeddings[1:], sample_ids=sample_ids[1:]
+                )
+
+            store = fomo.EmbeddingsStore(path)
+
+            self.assertEqual(len(store), 20)
+            self.assertTupleEqual(store.shape, (20, 8))
+            self.assertListEqual(store.ids.astype(str).tolist(), ids)
+            self.assertListEqual(
+                store.sample_ids.astype(str).tolist(), sample_ids
+            )
+            self.assertTrue(np.array_equal(store.embeddings, embeddings))
+
+            query = [ids[5], ids[0], ids[19], ids[5]]
+            self.assertTrue(
+                np.array_equal(
+                    store.get_embeddings(query), embeddings[[5, 0, 19, 5]]
+                )
+            )
+
+            with self.assertRaises(KeyError):
+                store.get_embeddings([ids[0], str(ObjectId())])
+
+            # Errors while writing delete the store rather than finalizing it
+            with self.assertRaises(ValueError):
+                with fomo._EmbeddingsStoreWriter(path) as writer:
+                    writer.add_all(ids[:2], embeddings[:2])
+                    writer.add_all(ids[2:4], embeddings[2:4, :4])
+
+            self.assertFalse(
+                os.path.exists(os.path.join(path, fomo._EMBEDDINGS_STORE_INFO))
+            )
+
+            with fomo._EmbeddingsStoreWriter(path) as writer:
+                pass
+
+            store = fomo.EmbeddingsStore(path)
+            self.assertEqual(len(store), 0)
+            self.assertTupleEqual(store.get_embeddings([]).shape, (0, 0))
+
+
+if __name__ == "__main__":
+    fo.config.show_progress_bars = False
+    unittest.main(verbosity=2)
@@ -6,12 +6,15 @@ FiftyOne patches-related unit tests.
 |
 """
 from copy import deepcopy
+import os
 
 from bson import ObjectId
 import unittest
+from unittest import mock
 
 import fiftyone as fo
 from fiftyone import ViewField as F
+import fiftyone.core.patches as fop
 
 from decorators import drop_datasets
 
@@ -318,6 +321,113 @@ class PatchesTests(unittest.TestCase):
         self.assertTrue(still_view.is_saved)
         self.assertEqual(still_view, view)
 
+    @drop_datasets
+    def test_to_patches_cache(self):
+        dataset = fo.Dataset()
+
+        sample1 = fo.Sample(
+            filepath="image1.png",
+            ground_truth=fo.Detections(
+                detections=[
+                    fo.Detection(label="cat"),
+                    fo.Detection(label="dog"),
+                ]
+            ),
+        )
+
+        sample2 = fo.Sample(
+            filepath="image2.png",
+            ground_truth=fo.Detections(
+                detections=[fo.Detection(label="rabbit")]
+            ),
+        )
+
+        sample3 = fo.Sample(
+            filepath="image3.png",
+            ground_truth=fo.Detections(
+                detections=[fo.Detection(label="squirrel")]
+            ),
+        )
+
+        dataset.add_samples([sample1, sample2, sample3])
+
+        view1 = dataset.to_patches("ground_truth", cache=True)
+        view2 = dataset.to_patches("ground_truth", cache=True)
+
+        self.assertEqual(view1._dataset.name, view2._dataset.name)
+        self.assertEqual(len(view2), 4)
+
+        sample1.ground_truth.detections[0].label = "CAT"
+        sample1.ground_truth.detections.append(fo.Detection(label="fox"))
+        sample1.save()
+
+        dataset.delete_samples(sample2)
+        dataset.add_sample(
+            fo.Sample(
+                filepath="image4.png",
+                ground_truth=fo.Detections(
+                    detections=[fo.Detection(label="bird")]
+                ),
+            )
+        )
+
+        view3 = dataset.to_patches("ground_truth", cache=True)
+        view4 = dataset.to_patches("ground_truth")
+
+        self.assertEqual(view3._dataset.name, view1._dataset.name)
+        self.assertNotEqual(view4._dataset.name, view1._dataset.name)
+        self.assertEqual(len(view3), 5)
+        self.assertDictEqual(
+            view3.count_values("ground_truth.label"),
+            view4.count_values("ground_truth.label"),
+        )
+        self.assertSetEqual(
+            set(view3.values("ground_truth.id")),
+            set(view4.values("ground_truth.id")),
+        )
+
+        # Patch-only fields invalidate the cached dataset
+        view3.set_values("hello", ["world"] * len(view3))
+        view5 = dataset.to_patches("ground_truth", cache=True)
+
+        self.assertNotEqual(view5._dataset.name, view1._dataset.name)
+        self.assertNotIn("hello", view5.get_field_schema())
+
+        # Unmodified sources are not rescanned
+        with mock.patch.object(
+            fo.DatasetView,
+            "_aggregate",
+            autospec=True,
+            side_effect=fo.DatasetView._aggregate,
+        ) as aggregate:
+            view6 = dataset.to_patches("ground_truth", cache=True)
+
+        self.assertEqual(view6._dataset.name, view5._dataset.name)
+        aggregate.assert_not_called()
+
+        # Named datasets are cached separately rather than renamed
+        name = view5._dataset.name
+        patches1 = fop.make_patches_dataset(
+            dataset, "ground_truth", name="named-patches", cache=True
+        )
+        patches2 = fop.make_patches_dataset(
+            dataset, "ground_truth", name="named-patches", cache=True
+        )
+        view7 = dataset.to_patches("ground_truth", cache=True)
+
+        self.assertEqual(patches1.name, "named-patches")
+        self.assertIs(patches2, patches1)
+        self.assertEqual(view5._dataset.name, name)
+        self.assertEqual(view7._dataset.name, name)
+
+        # The App server never uses cached datasets
+        with mock.patch.dict(os.environ, {"FIFTYONE_SERVER": "1"}):
+            view8 = dataset.to_patches("ground_truth", cache=True)
+            view9 = dataset.to_patches("ground_truth", cache=True)
+
+        self.assertNotEqual(view8._dataset.name, name)
+        self.assertNotEqual(view9._dataset.name, view8._dataset.name)
+
     @drop_datasets
     def test_to_evaluation_patches(self):
         dataset = fo.Dataset()
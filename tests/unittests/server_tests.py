@@ -5,11 +5,23 @@ FiftyOne server-related unit tests.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+import asyncio
+import os
 import unittest
 
+import eta.core.image as etai
+import eta.core.utils as etau
+import numpy as np
+
+import fiftyone as fo
 import fiftyone.core.dataset as fod
+from fiftyone.core.expressions import ViewField as F
 import fiftyone.core.fields as fof
 import fiftyone.core.labels as fol
+import fiftyone.core.sample as fos
+import fiftyone.server.routes.embeddings as fose
+import fiftyone.server.samples as foss
+import fiftyone.server.thumbnails as fost
 import fiftyone.server.view as fosv
 
 from decorators import drop_datasets
@@ -913,3 +925,251 @@ class ServerViewTests(unittest.TestCase):
         ]
 
         self.assertEqual(expected, returned)
+
+
+class ServerSamplesTests(unittest.TestCase):
+    @drop_datasets
+    def test_paginate_samples_keyset(self):
+        dataset = fod.Dataset()
+        dataset.add_samples(
+            [
+                fos.Sample(
+                    filepath="image%d.jpg" % i,
+                    value=(i % 4) if i % 5 else None,
+                    label=["cat", "dog", None][i % 3],
+                )
+                for i in range(50)
+            ]
+        )
+
+        async def paginate(view, first):
+            ids = []
+            cursors = []
+            after = None
+            while True:
+                results = await foss.paginate_samples(
+                    dataset.name, view._serialize(), None, first, after
+                )
+                ids.extend(str(edge.node.id) for edge in results.edges)
+                if not results.page_info.has_next_page:
+                    break
+
+                after = results.page_info.end_cursor
+                cursors.append(after)
+
+            return ids, cursors
+
+        async def run():
+            # Unsorted views are paginated via indexes
+            view = dataset.view()
+            ids, cursors = await paginate(view, 7)
+            self.assertListEqual(ids, view.values("id"))
+            self.assertTrue(all(c.isdigit() for c in cursors))
+
+            # Sorted views are paginated via keysets, with ties broken by ID
+            for view, keys in (
+                (dataset.sort_by("value"), [("value", 1)]),
+                (dataset.sort_by("value", reverse=True), [("value", -1)]),
+                (
+                    dataset.sort_by("label").match(F("value") != 1),
+                    [("label", 1)],
+                ),
+                (
+                    dataset.sort_by([("value", 1), ("label", -1)]),
+                    [("value", 1), ("label", -1)],
+                ),
+                (dataset.sort_by("filepath"), [("filepath", 1)]),
+            ):
+                ids, cursors = await paginate(view, 7)
+                self.assertFalse(any(c.isdigit() for c in cursors))
+
+                id_order = keys[0][1] if len(keys) == 1 else 1
+                expected = view.mongo(
+                    [{"$sort": dict(keys + [("_id", id_order)])}]
+                ).values("id")
+                self.assertListEqual(ids, expected)
+
+            # Order-changing stages after the sort fall back to indexes
+            view = dataset.sort_by("value").limit(30)
+            ids, cursors = await paginate(view, 7)
+            self.assertListEqual(ids, view.values("id"))
+            self.assertTrue(all(c.isdigit() for c in cursors))
+
+        asyncio.new_event_loop().run_until_complete(run())
+
+        # Pagination never creates indexes
+        index_info = dataset.get_index_information()
+        self.assertFalse(
+            any(len(info["key"]) > 2 for info in index_info.values())
+        )
+        self.assertFalse(
+            any(
+                info["key"][-1][0] == "_id" and len(info["key"]) > 1
+                for info in index_info.values()
+            )
+        )
+
+        # Keysets are only used when the sort keys are indexed
+        keys = [("value", 1), ("label", -1), ("_id", 1)]
+        self.assertTrue(foss._has_keyset_index(dataset, keys))
+        self.assertTrue(
+            foss._has_keyset_index(dataset, [(k, -o) for k, o in keys])
+        )
+        self.assertFalse(
+            foss._has_keyset_index(dataset, [("value", 1), ("label", 1)])
+        )
+
+        # Indexes whose prefix matches the sort keys are also usable
+        dataset.drop_index("value")
+        self.assertTrue(
+            foss._has_keyset_index(dataset, [("value", 1), ("_id", 1)])
+        )
+
+        dataset.drop_index("value_1_label_-1")
+        self.assertFalse(
+            foss._has_keyset_index(dataset, [("value", 1), ("_id", 1)])
+        )
+
+
+class ServerEmbeddingsTests(unittest.TestCase):
+    def test_get_bounds(self):
+        self.assertIsNone(fose._get_bounds(np.zeros((0, 2))))
+
+        points = np.array([[0, 5], [-1, 2], [3, 4]], dtype=float)
+        self.assertListEqual(fose._get_bounds(points), [[-1, 2], [3, 5]])
+
+    def test_get_box_inds(self):
+        points = np.array(
+            [[0, 0], [1, 1], [2, 2], [1, 3], [0.5, 1.5]], dtype=float
+        )
+
+        inds = fose._get_box_inds(points, [[0.5, 0.5], [2, 2]])
+        self.assertListEqual(inds.tolist(), [1, 2, 4])
+
+        # Boxes are inclusive and may contain no points
+        inds = fose._get_box_inds(points, [[1, 3], [1, 3]])
+        self.assertListEqual(inds.tolist(), [3])
+
+        inds = fose._get_box_inds(points, [[5, 5], [6, 6]])
+        self.assertListEqual(inds.tolist(), [])
+
+        # 3D points are filtered by the first two dimensions
+        points3d = np.hstack([points, np.full((5, 1), 100.0)])
+        inds = fose._get_box_inds(points3d, [[0.5, 0.5], [2, 2]])
+        self.assertListEqual(inds.tolist(), [1, 2, 4])
+
+    def test_get_lod_inds(self):
+        rng = np.random.default_rng(51)
+        points = rng.random((1000, 2))
+        inds = np.arange(len(points))
+
+        # No downsampling is needed
+        self.assertIs(fose._get_lod_inds(points, inds, None), inds)
+        self.assertIs(fose._get_lod_inds(points, inds, 1000), inds)
+
+        lod_inds = fose._get_lod_inds(points, inds, 100)
+        self.assertLessEqual(len(lod_inds), 100)
+        self.assertGreater(len(lod_inds), 0)
+
+        # Representatives are an ordered subset with one point per cell
+        self.assertListEqual(lod_inds.tolist(), sorted(set(lod_inds)))
+        cells = set(map(tuple, (points[lod_inds] * 10).astype(int)))
+        self.assertEqual(len(cells), len(lod_inds))
+
+        # Subsets of points are downsampled within their own extent
+        box_inds = inds[::2]
+        lod_inds = fose._get_lod_inds(points, box_inds, 10)
+        self.assertLessEqual(len(lod_inds), 10)
+        self.assertTrue(set(lod_inds).issubset(box_inds))
+
+        # Degenerate extents collapse to a single cell
+        points = np.ones((50, 2))
+        lod_inds = fose._get_lod_inds(points, np.arange(50), 10)
+        self.assertListEqual(lod_inds.tolist(), [0])
+
+
+class ServerThumbnailsTests(unittest.TestCase):
+    def test_thumbnail_cache(self):
+        with etau.TempDir() as tmp_dir:
+            image_paths = []
+            for idx in range(3):
+                image_path = os.path.join(tmp_dir, "image%d.jpg" % idx)
+                img = np.random.randint(
+                    255, size=(480, 640, 3), dtype=np.uint8
+                )
+                etai.write(img, image_path)
+                image_paths.append(image_path)
+
+            cache_dir = os.path.join(tmp_dir, "thumbnails")
+            cache = fost.ThumbnailCache(cache_dir, 10**9)
+
+            async def run():
+                path1 = await cache.get(image_paths[0], 64)
+                path2 = await cache.get(image_paths[0], 64)
+                path3 = await cache.get(image_paths[0], 64, fmt="webp")
+                return path1, path2, path3
+
+            loop = asyncio.new_event_loop()
+            path1, path2, path3 = loop.run_until_complete(run())
+
+            self.assertEqual(path1, path2)
+            self.assertNotEqual(path1, path3)
+            self.assertTrue(path3.endswith(".webp"))
+
+            thumbnail = etai.read(path1)
+            self.assertEqual(thumbnail.shape[:2], (48, 64))
+
+            # Modifying the source invalidates its thumbnails
+            img = np.zeros((100, 50, 3), dtype=np.uint8)
+            etai.write(img, image_paths[0])
+            os.utime(image_paths[0], (0, 0))
+
+            path4 = loop.run_until_complete(cache.get(image_paths[0], 64))
+            self.assertNotEqual(path1, path4)
+            self.assertEqual(etai.read(path4).shape[:2], (64, 32))
+
+            # Least recently used thumbnails are evicted
+            cache = fost.ThumbnailCache(cache_dir, os.path.getsize(path4) + 1)
+
+            async def run():
+                paths = []
+                for image_path in image_paths[1:]:
+                    paths.append(await cache.get(image_path, 64))
+
+                return paths
+
+            paths = loop.run_until_complete(run())
+
+            self.assertFalse(os.path.exists(path1))
+            self.assertFalse(os.path.exists(paths[0]))
+            self.assertTrue(os.path.exists(paths[1]))
+
+    def test_parse_thumbnail_params(self):
+        self.assertIsNone(fost.parse_thumbnail_size(None))
+        self.assertEqual(fost.parse_thumbnail_size("128"), 128)
+
+        with self.assertRaises(ValueError):
+            fost.parse_thumbnail_size("0")
+
+        self.assertEqual(
+            fost.parse_thumbnail_format("image/avif,image/webp,*/*"), "webp"
+        )
+        self.assertEqual(fost.parse_thumbnail_format(None), "jpeg")
+
+    def test_get_thumbnail_cache(self):
+        cache_dir = fo.config.thumbnail_cache_dir
+        try:
+            with etau.TempDir() as tmp_dir:
+                fo.config.thumbnail_cache_dir = tmp_dir
+                cache1 = fost.get_thumbnail_cache()
+                self.assertIs(fost.get_thumbnail_cache(), cache1)
+
+                fo.config.thumbnail_cache_dir = os.path.join(tmp_dir, "new")
+                cache2 = fost.get_thumbnail_cache()
+                self.assertIsNot(cache2, cache1)
+
+                # The replaced cache's worker threads are shut down
+                with self.assertRaises(RuntimeError):
+                    cache1._executor.submit(print)
+        finally:
+            fo.config.thumbnail_cache_dir = cache_dir
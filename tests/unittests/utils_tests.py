@@ -5,11 +5,16 @@ FiftyOne utilities unit tests.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+import os
 import time
 import unittest
+from unittest import mock
 
 import numpy as np
 
+import eta.core.image as etai
+import eta.core.utils as etau
+
 import fiftyone as fo
 import fiftyone.constants as foc
 import fiftyone.core.media as fom
@@ -225,6 +230,86 @@ class MediaTypeTests(unittest.TestCase):
             self.vid_sample.filepath = "image.png"
 
 
+class MetadataTests(unittest.TestCase):
+    @drop_datasets
+    def test_compute_metadata(self):
+        with etau.TempDir() as tmp_dir:
+            filepaths = []
+            for idx in range(5):
+                filepath = os.path.join(tmp_dir, "%d.png" % idx)
+                img = np.zeros((16 + idx, 32, 3), dtype=np.uint8)
+                etai.write(img, filepath)
+                filepaths.append(filepath)
+
+            filepaths.append(os.path.join(tmp_dir, "missing.png"))
+
+            dataset = fo.Dataset()
+            dataset.add_samples([fo.Sample(filepath=f) for f in filepaths])
+
+            # In-memory samples should see the batched updates
+            sample = dataset.first()
+
+            for num_workers in (1, 2):
+                dataset.clear_sample_field("metadata")
+
+                dataset.compute_metadata(num_workers=num_workers)
+
+                self.assertEqual(sample.metadata.height, 16)
+                self.assertListEqual(
+                    dataset.values("metadata.height"),
+                    [16, 17, 18, 19, 20, None],
+                )
+                self.assertListEqual(
+                    dataset.values("metadata.num_channels"),
+                    [3, 3, 3, 3, 3, None],
+                )
+                self.assertEqual(len(dataset.exists("metadata", False)), 1)
+
+    @drop_datasets
+    def test_compute_metadata_patches(self):
+        with etau.TempDir() as tmp_dir:
+            samples = []
+            for idx in range(3):
+                filepath = os.path.join(tmp_dir, "%d.png" % idx)
+                img = np.zeros((16 + idx, 32, 3), dtype=np.uint8)
+                etai.write(img, filepath)
+
+                detections = [
+                    fo.Detection(label="cat", bounding_box=[0, 0, 0.5, 0.5]),
+                    fo.Detection(label="dog", bounding_box=[0.5, 0, 0.5, 1]),
+                ]
+                samples.append(
+                    fo.Sample(
+                        filepath=filepath,
+                        ground_truth=fo.Detections(detections=detections),
+                    )
+                )
+
+            dataset = fo.Dataset()
+            dataset.add_samples(samples)
+
+            patches = dataset.to_patches("ground_truth")
+            patches_cls = type(patches)
+
+            # Edits to generated views must go through the source sync path
+            with mock.patch.object(
+                patches_cls,
+                "_sync_source_sample",
+                autospec=True,
+                side_effect=patches_cls._sync_source_sample,
+            ) as sync:
+                patches.compute_metadata(num_workers=1)
+
+            self.assertEqual(sync.call_count, 6)
+            self.assertListEqual(
+                patches.values("metadata.height"), [16, 16, 17, 17, 18, 18]
+            )
+            self.assertListEqual(
+                dataset.values("ground_truth.detections.label", unwind=True),
+                ["cat", "dog"] * 3,
+            )
+
+
 class MigrationTests(unittest.TestCase):
     def test_runner(self):
         def revs(versions):
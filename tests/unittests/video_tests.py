@@ -7,13 +7,16 @@ FiftyOne video-related unit tests.
 """
 from copy import deepcopy
 from datetime import date, datetime
+import os
 
 from bson import ObjectId
 import numpy as np
 import unittest
+from unittest import mock
 
 import fiftyone as fo
 import fiftyone.core.odm as foo
+import fiftyone.core.video as fov
 from fiftyone import ViewField as F
 
 from decorators import drop_datasets
@@ -206,6 +209,44 @@ class VideoTests(unittest.TestCase):
 
         self.assertListEqual(frame_numbers2, [2, 4])
 
+    @drop_datasets
+    def test_sparse_frames_order(self):
+        sample = fo.Sample(filepath="video.mp4")
+        sample.frames[100000] = fo.Frame(hello="world")
+        sample.frames[10] = fo.Frame(hello="world")
+        sample.frames[5000] = fo.Frame(hello="world")
+
+        dataset = fo.Dataset()
+        dataset.add_sample(sample)
+
+        sample.frames.reload()
+
+        # In-memory frames interleaved with database frames
+        sample.frames[7] = fo.Frame(hello="there")
+        sample.frames[60000] = fo.Frame(hello="there")
+        sample.frames[200000] = fo.Frame(hello="there")
+        del sample.frames[5000]
+
+        self.assertListEqual(
+            [fn for fn, _ in sample.frames.items()],
+            [7, 10, 60000, 100000, 200000],
+        )
+        self.assertListEqual(
+            [f.hello for f in sample.frames.values()],
+            ["there", "world", "there", "world", "there"],
+        )
+        self.assertListEqual(
+            [f.frame_number for f in sample.frames.tail(2)],
+            [100000, 200000],
+        )
+
+        sample.save()
+
+        self.assertListEqual(
+            dataset.values("frames.frame_number"),
+            [[7, 10, 60000, 100000, 200000]],
+        )
+
     @drop_datasets
     def test_expand_schema(self):
         # None-valued new frame fields are ignored for schema expansion
@@ -388,6 +429,66 @@ class VideoTests(unittest.TestCase):
         self.assertEqual(first_sample.int, 4)
         self.assertEqual(first_frame.int, 4)
 
+    @drop_datasets
+    def test_iter_samples_batched_frames(self):
+        dataset = fo.Dataset()
+
+        samples = []
+        for i in range(50):
+            sample = fo.Sample(filepath="video%d.mp4" % i)
+            for frame_number in range(1, i % 5 + 1):
+                sample.frames[frame_number] = fo.Frame(
+                    int=i,
+                    gt=fo.Classification(label=str(frame_number % 2)),
+                )
+
+            samples.append(sample)
+
+        dataset.add_samples(samples)
+
+        def _get_frames(sample_collection, **kwargs):
+            return [
+                [
+                    (frame_number, frame.to_dict())
+                    for frame_number, frame in sample.frames.items()
+                ]
+                for sample in sample_collection.iter_samples(**kwargs)
+            ]
+
+        views = [
+            dataset,
+            dataset.skip(5),
+            dataset.match_frames(F("gt.label") == "1"),
+            dataset.to_clips(F("gt.label") == "1"),
+        ]
+
+        for view in views:
+            self.assertListEqual(
+                _get_frames(view, frames="batched"), _get_frames(view)
+            )
+
+        for idx, sample in enumerate(
+            dataset.iter_samples(autosave=True, frames="batched")
+        ):
+            self.assertEqual(len(sample.frames), idx % 5)
+            for frame in sample.frames.values():
+                frame["int"] += 1
+
+            if sample.frames:
+                del sample.frames[1]
+
+        self.assertListEqual(
+            dataset.values("frames.frame_number"),
+            [list(range(2, i % 5 + 1)) for i in range(50)],
+        )
+        self.assertListEqual(
+            dataset.values("frames.int"),
+            [[i + 1] * max(i % 5 - 1, 0) for i in range(50)],
+        )
+
+        with self.assertRaises(ValueError):
+            next(dataset.iter_samples(frames="unsupported"))
+
     @drop_datasets
     def test_modify_video_sample(self):
         dataset = fo.Dataset()
@@ -2100,6 +2201,122 @@ class VideoTests(unittest.TestCase):
         frame = dataset.first().frames.first()
         self.assertEqual(frame["foo"], "bar")
 
+    @drop_datasets
+    def test_to_frames_cache(self):
+        sample1 = fo.Sample(filepath="video1.mp4", tags=["test"])
+        sample1.frames[1] = fo.Frame(filepath="frame11.jpg", hello="world")
+        sample1.frames[2] = fo.Frame(filepath="frame12.jpg")
+
+        sample2 = fo.Sample(filepath="video2.mp4")
+        sample2.frames[1] = fo.Frame(filepath="frame21.jpg")
+
+        sample3 = fo.Sample(filepath="video3.mp4")
+        sample3.frames[1] = fo.Frame(filepath="frame31.jpg")
+
+        dataset = fo.Dataset()
+        dataset.add_samples([sample1, sample2, sample3])
+
+        frames1 = dataset.to_frames(cache=True)
+        frames2 = dataset.to_frames(cache=True)
+
+        self.assertEqual(frames1._dataset.name, frames2._dataset.name)
+        self.assertEqual(len(frames2), 4)
+
+        sample1.frames[2]["hello"] = "there"
+        sample1.frames[3] = fo.Frame(filepath="frame13.jpg")
+        sample1.save()
+
+        dataset.delete_samples(sample2)
+        sample4 = fo.Sample(filepath="video4.mp4")
+        sample4.frames[1] = fo.Frame(filepath="frame41.jpg", hello="world")
+        dataset.add_sample(sample4)
+
+        frames3 = dataset.to_frames(cache=True)
+        frames4 = dataset.to_frames()
+
+        self.assertEqual(frames3._dataset.name, frames1._dataset.name)
+        self.assertNotEqual(frames4._dataset.name, frames1._dataset.name)
+        self.assertEqual(len(frames3), 5)
+        self.assertListEqual(
+            sorted(frames3.values("id")), sorted(frames4.values("id"))
+        )
+        self.assertDictEqual(
+            frames3.count_values("hello"), {"world": 2, "there": 1, None: 2}
+        )
+        self.assertDictEqual(frames3.count_sample_tags(), {"test": 3})
+
+        # Unmodified sources are not rescanned
+        with mock.patch.object(
+            fo.DatasetView,
+            "_aggregate",
+            autospec=True,
+            side_effect=fo.DatasetView._aggregate,
+        ) as aggregate:
+            frames5 = dataset.to_frames(cache=True)
+
+        self.assertEqual(frames5._dataset.name, frames1._dataset.name)
+        aggregate.assert_not_called()
+
+        # Named datasets are cached separately rather than renamed
+        name = frames1._dataset.name
+        frames_dataset1 = fov.make_frames_dataset(
+            dataset, name="named-frames", cache=True
+        )
+        frames_dataset2 = fov.make_frames_dataset(
+            dataset, name="named-frames", cache=True
+        )
+        frames6 = dataset.to_frames(cache=True)
+
+        self.assertEqual(frames_dataset1.name, "named-frames")
+        self.assertIs(frames_dataset2, frames_dataset1)
+        self.assertEqual(frames1._dataset.name, name)
+        self.assertEqual(frames6._dataset.name, name)
+
+        # The App server never uses cached datasets
+        with mock.patch.dict(os.environ, {"FIFTYONE_SERVER": "1"}):
+            frames7 = dataset.to_frames(cache=True)
+            frames8 = dataset.to_frames(cache=True)
+
+        self.assertNotEqual(frames7._dataset.name, name)
+        self.assertNotEqual(frames8._dataset.name, frames7._dataset.name)
+
+    @drop_datasets
+    def test_to_frames_cache_clips(self):
+        sample1 = fo.Sample(filepath="video1.mp4")
+        for frame_number in range(1, 5):
+            sample1.frames[frame_number] = fo.Frame(
+                filepath="frame1%d.jpg" % frame_number, hello="there"
+            )
+
+        sample2 = fo.Sample(filepath="video2.mp4")
+        sample2.frames[1] = fo.Frame(filepath="frame21.jpg", hello="there")
+
+        dataset = fo.Dataset()
+        dataset.add_samples([sample1, sample2])
+
+        clips = dataset.to_clips([[(1, 2), (4, 4)], [(1, 1)]])
+
+        frames1 = clips.to_frames(cache=True)
+
+        self.assertEqual(len(frames1), 4)
+
+        # Modifying a frame of a clip is detected via the source video
+        sample1.frames[4]["hello"] = "world"
+        sample1.save()
+
+        frames2 = clips.to_frames(cache=True)
+        frames3 = clips.to_frames()
+
+        self.assertEqual(frames2._dataset.name, frames1._dataset.name)
+        self.assertNotEqual(frames3._dataset.name, frames1._dataset.name)
+        self.assertEqual(len(frames2), 4)
+        self.assertDictEqual(
+            frames2.count_values("hello"), {"there": 3, "world": 1}
+        )
+        self.assertListEqual(
+            sorted(frames2.values("id")), sorted(frames3.values("id"))
+        )
+
     @drop_datasets
     def test_to_frames_sparse(self):
         dataset = fo.Dataset()